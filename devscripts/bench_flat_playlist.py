@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from yt_dlp import YoutubeDL
+from yt_dlp.extractor.common import InfoExtractor
+
+
+class BenchPlaylistIE(InfoExtractor):
+    """Yields entries shaped like those of a YouTube channel with --flat-playlist"""
+    _VALID_URL = r'bench:(?P<count>\d+)'
+
+    def _entries(self, count):
+        # As in the JSON of a real playlist page, the strings of each entry are separate objects
+        fresh = lambda string: string.encode().decode()
+        for i in range(count):
+            video_id = f'{i:011d}'
+            yield self.url_result(
+                f'https://www.youtube.com/watch?v={video_id}', 'Youtube', video_id, f'Video number {i}',
+                description=None, duration=60 + i % 3600, channel_id=fresh('UCBR8-60-B28hp2BmDPdntcQ'),
+                channel=fresh('YouTube'), channel_url=fresh('https://www.youtube.com/channel/UCBR8-60-B28hp2BmDPdntcQ'),
+                uploader=fresh('YouTube'), uploader_id=fresh('@YouTube'), uploader_url=fresh('https://www.youtube.com/@YouTube'),
+                thumbnails=[{'url': f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg', 'height': 360, 'width': 480}],
+                timestamp=None, release_timestamp=None, availability=None, view_count=i * 7,
+                live_status=None, channel_is_verified=True)
+
+    def _real_extract(self, url):
+        return self.playlist_result(self._entries(int(self._match_valid_url(url)['count'])), 'bench', 'Benchmark')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the memory used by the entries of a flat playlist')
+    parser.add_argument(
+        '-n', '--entries', type=int, default=10_000, help='Number of entries in the playlist (default: 10000)')
+    parser.add_argument(
+        '--lazy', action='store_true', help='Process the playlist with lazy_playlist')
+    return parser.parse_args()
+
+
+def run(count, compact, lazy):
+    ydl = YoutubeDL({
+        'quiet': True, 'noprogress': True, 'extract_flat': 'in_playlist',
+        'compact_flat_entries': compact, 'lazy_playlist': lazy,
+    })
+    ydl.add_info_extractor(BenchPlaylistIE(ydl))
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    info = ydl.extract_info(f'bench:{count}', download=False, ie_key=BenchPlaylistIE.ie_key())
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(info['entries']) == count
+    return retained, peak, elapsed
+
+
+def main():
+    opts = parse_args()
+    scale = 100_000 / opts.entries
+    print(f'{opts.entries} entries; memory is scaled to 100000 entries')
+    print('                retained        peak        time')
+    results = {}
+    for compact in (False, True):
+        retained, peak, elapsed = results[compact] = run(opts.entries, compact, opts.lazy)
+        print(f'{"compact" if compact else "dict":12}' + ''.join(
+            f'{size * scale / 2 ** 20:10.1f}MiB' for size in (retained, peak)) + f'{elapsed:10.2f}s')
+    print(f'Compact entries retain {results[False][0] / results[True][0]:.1f}x less memory')
+
+
+if __name__ == '__main__':
+    main()
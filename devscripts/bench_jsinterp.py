@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import argparse
+import json
+import platform
+import re
+import string
+import time
+
+from test.helper import FakeYDL
+from test.test_youtube_signature import _NSIG_TESTS, _SIG_TESTS
+from yt_dlp.extractor import YoutubeIE
+from yt_dlp.jsinterp import Debugger, JSInterpreter
+from yt_dlp.version import __version__
+
+DEFAULT_PLAYERS_DIR = 'test/testdata/sigs'
+
+# Must match the file names used by test/test_youtube_signature.py
+PLAYER_ID_RE = {
+    'signature': re.compile(r'.*(?:-|/player/)(?P<id>[a-zA-Z0-9_-]+)(?:/.+\.js|(?:/watch_as3|/html5player)?\.[a-z]+)$'),
+    'nsig': re.compile(r'.+/player/(?P<id>[a-zA-Z0-9_-]+)/.+.js$'),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the JavaScript interpreter against cached player files')
+    parser.add_argument(
+        '--players-dir', default=DEFAULT_PLAYERS_DIR, metavar='DIR',
+        help=f'Directory containing the player files downloaded by test_youtube_signature (default: {DEFAULT_PLAYERS_DIR})')
+    parser.add_argument(
+        '-n', '--repeat', type=int, default=20,
+        help='Number of times each function is called (default: 20)')
+    parser.add_argument(
+        '-k', dest='pattern', metavar='REGEX', help='Only benchmark players whose ID matches REGEX')
+    parser.add_argument(
+        '--hotspots', action='store_true', help='Also collect per-statement-type timings (slower)')
+    parser.add_argument(
+        '-o', '--output', metavar='FILE', help='Write the results as JSON to FILE')
+    parser.add_argument(
+        '--baseline', metavar='FILE', help='Compare against the JSON results in FILE')
+    parser.add_argument(
+        '--threshold', type=float, default=1.25, metavar='RATIO',
+        help='With --baseline, exit with an error if any timing is slower by more than RATIO (default: 1.25)')
+    return parser.parse_args()
+
+
+def timed(func, *args, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        ret = func(*args)
+    return ret, (time.perf_counter() - start) / repeat
+
+
+def find_players(players_dir, pattern=None):
+    for kind, tests in (('signature', _SIG_TESTS), ('nsig', _NSIG_TESTS)):
+        seen = set()
+        for url, sig_input, expected in tests:
+            player_id = PLAYER_ID_RE[kind].match(url).group('id')
+            if player_id in seen or (pattern and not re.search(pattern, player_id)):
+                continue
+            filename = os.path.join(players_dir, f'player-{kind}-{player_id}.js')
+            if os.path.exists(filename):
+                seen.add(player_id)
+                yield kind, player_id, filename, sig_input, expected
+
+
+def bench_signature(jscode, sig_input, repeat):
+    ie = YoutubeIE(FakeYDL())
+    if isinstance(sig_input, int):
+        sig_input = string.printable[:sig_input]
+    func, extract_time = timed(ie._parse_sig_js, jscode)
+    result, call_time = timed(func, sig_input, repeat=repeat)
+    _, full_time = timed(lambda: ie._parse_sig_js(jscode)(sig_input))
+    return result, {
+        'extract_function': extract_time,
+        'call_function': call_time,
+        'full': full_time,
+    }
+
+
+def bench_nsig(jscode, sig_input, repeat):
+    ie = YoutubeIE(FakeYDL())
+    funcname, name_time = timed(ie._extract_n_function_name, jscode)
+    func, extract_time = timed(JSInterpreter(jscode).extract_function, funcname)
+    result, call_time = timed(func, [sig_input], repeat=repeat)
+    _, full_time = timed(lambda: JSInterpreter(jscode).call_function(
+        ie._extract_n_function_name(jscode), sig_input))
+    return result, {
+        'extract_function_name': name_time,
+        'extract_function': extract_time,
+        'call_function': call_time,
+        'full': full_time,
+    }
+
+
+def compare(results, baseline, threshold):
+    old = {(r['kind'], r['player']): r['timings'] for r in baseline['results']}
+    regressions = []
+    for result in results:
+        for key, value in result['timings'].items():
+            old_value = old.get((result['kind'], result['player']), {}).get(key)
+            if not old_value:
+                continue
+            ratio = value / old_value
+            if ratio > threshold:
+                regressions.append(f'{result["kind"]} {result["player"]} {key}: {ratio:.2f}x slower')
+    return regressions
+
+
+def main():
+    opts = parse_args()
+    players = list(find_players(opts.players_dir, opts.pattern))
+    if not players:
+        sys.exit(f'No cached player files found in {opts.players_dir}. '
+                 'Run "python -m pytest test/test_youtube_signature.py" once to download them')
+
+    results = []
+    if opts.hotspots:
+        Debugger.PROFILE = {}
+    for kind, player_id, filename, sig_input, expected in players:
+        with open(filename, encoding='utf-8') as f:
+            jscode = f.read()
+        bench = bench_signature if kind == 'signature' else bench_nsig
+        try:
+            result, timings = bench(jscode, sig_input, opts.repeat)
+        except Exception as e:
+            print(f'{kind:9} {player_id:12} ERROR: {e}', file=sys.stderr)
+            continue
+        results.append({
+            'kind': kind,
+            'player': player_id,
+            'correct': result == expected,
+            'timings': timings,
+        })
+        print(f'{kind:9} {player_id:12} ' + '  '.join(
+            f'{key}={value * 1000:.2f}ms' for key, value in timings.items())
+            + ('' if result == expected else '  (WRONG RESULT)'))
+
+    report = {
+        'version': __version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'repeat': opts.repeat,
+        'results': results,
+    }
+    if Debugger.PROFILE is not None:
+        report['hotspots'] = {
+            stmt_type: {'count': count, 'total': total, 'own': own}
+            for stmt_type, (count, total, own) in sorted(
+                Debugger.PROFILE.items(), key=lambda x: x[1][2], reverse=True)}
+        Debugger.PROFILE = None
+        print('\nStatement type   count     own time   total time')
+        for stmt_type, stats in report['hotspots'].items():
+            print(f'{stmt_type:12} {stats["count"]:9} {stats["own"]:11.3f}s {stats["total"]:11.3f}s')
+
+    if opts.output:
+        with open(opts.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if opts.baseline:
+        with open(opts.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), opts.threshold)
+        if regressions:
+            sys.exit('Regressions found:\n' + '\n'.join(regressions))
+        print('No regressions found')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import argparse
+import io
+import time
+
+from yt_dlp import YoutubeDL
+from yt_dlp.downloader.hls import HlsFD
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.m3u8 import M3U8Playlist
+from yt_dlp.networking import Response
+
+MANIFEST_URL = 'https://example.com/hls/1080p/index.m3u8?token=abc'
+
+
+def make_playlist(count, keys):
+    """A VOD playlist with `count` segments, and a new AES-128 key every `keys` segments"""
+    lines = ['#EXTM3U', '#EXT-X-VERSION:3', '#EXT-X-TARGETDURATION:6', '#EXT-X-MEDIA-SEQUENCE:0']
+    for i in range(count):
+        if keys and i % keys == 0:
+            lines.append(f'#EXT-X-KEY:METHOD=AES-128,URI="key{i // keys}.bin",IV=0x{i:032x}')
+        if i and i % 1000 == 0:
+            lines.append('#EXT-X-DISCONTINUITY')
+        lines.extend(('#EXTINF:6.006,', f'segment_{i:05d}.ts'))
+    lines.append('#EXT-X-ENDLIST')
+    return '\n'.join(lines) + '\n'
+
+
+class BenchHlsFD(HlsFD):
+    """Stops once the fragments have been prepared"""
+
+    def _prepare_and_start_frag_download(self, ctx, info_dict):
+        ctx.update(fragment_index=0, extra_state={})
+
+    def download_and_append_fragments(self, ctx, fragments, info_dict, **kwargs):
+        self.fragments = fragments
+        return True
+
+
+def bench(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the parsing of m3u8 playlists')
+    parser.add_argument(
+        '-n', '--segments', type=int, default=10_000, help='Number of segments in the playlist (default: 10000)')
+    parser.add_argument(
+        '--keys', type=int, default=0, metavar='N', help='Use a new AES-128 key every N segments (default: no keys)')
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=10, help='Number of runs; the best time is shown (default: 10)')
+    opts = parser.parse_args()
+
+    doc = make_playlist(opts.segments, opts.keys)
+    params = {'quiet': True, 'noprogress': True, 'no_warnings': True, 'hls_split_discontinuity': True}
+    ydl = YoutubeDL(params)
+    ydl.urlopen = lambda request: Response(
+        io.BytesIO(doc.encode()), MANIFEST_URL, {}, status=200)
+    info_dict = {'url': MANIFEST_URL, 'ext': 'mp4', 'protocol': 'm3u8_native', 'hls_aes': {'key': '00' * 16}}
+    fd = BenchHlsFD(ydl, params)
+    ie = InfoExtractor(ydl)
+
+    print(f'{opts.segments} segments, {len(doc) / 1024:.0f}KiB')
+    elapsed, _ = bench(lambda: fd.real_download('-', info_dict), opts.repeat)
+    print(f'HlsFD fragments:         {elapsed * 1000:8.2f}ms')
+    assert len(fd.fragments) == opts.segments
+    elapsed, (formats, _) = bench(
+        lambda: ie._parse_m3u8_formats_and_subtitles(doc, MANIFEST_URL, 'mp4'), opts.repeat)
+    print(f'Extractor formats:       {elapsed * 1000:8.2f}ms (with --hls-split-discontinuity)')
+    assert len(formats) == 1 + (opts.segments - 1) // 1000
+    elapsed, _ = bench(lambda: ie._parse_m3u8_vod_duration(doc, None), opts.repeat)
+    print(f'Extractor VOD duration:  {elapsed * 1000:8.2f}ms')
+
+    # A live playlist that keeps all of its segments, reloaded with 2 new ones
+    live_doc = doc.replace('#EXT-X-ENDLIST\n', '')
+    previous = M3U8Playlist(live_doc[:live_doc.rindex('#EXTINF:', 0, live_doc.rindex('#EXTINF:'))], MANIFEST_URL)
+    elapsed, _ = bench(lambda: M3U8Playlist(live_doc, MANIFEST_URL), opts.repeat)
+    print(f'Live reload, full parse: {elapsed * 1000:8.2f}ms')
+    elapsed, playlist = bench(lambda: M3U8Playlist(live_doc, MANIFEST_URL, previous=previous), opts.repeat)
+    print(f'Live reload, new tail:   {elapsed * 1000:8.2f}ms')
+    assert len(playlist) == 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import argparse
+import json
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only the generic extractor matches this, so every extractor has to be tried
+DEFAULT_URL = 'https://example.com/video.mp4'
+
+# Runs in a fresh interpreter so that nothing is cached between runs
+BENCH_CODE = '''
+import json, sys, time
+start = time.perf_counter()
+import yt_dlp
+from yt_dlp.extractor import _LAZY_LOADER
+imported = time.perf_counter()
+if not int(sys.argv[2]) and _LAZY_LOADER:
+    from yt_dlp.extractor import lazy_extractors
+    from yt_dlp.extractor._precompiled import PrecompiledRegexes
+    lazy_extractors._PRECOMPILED_REGEXES = PrecompiledRegexes(None, '')
+ydl = yt_dlp.YoutubeDL({'quiet': True})
+initialized = time.perf_counter()
+url = sys.argv[1]
+ie_key = next(ie_key for ie_key, ie in ydl._suitable_ie_candidates(url) if ie.suitable(url))
+matched = time.perf_counter()
+print(json.dumps({
+    'lazy_extractors': _LAZY_LOADER,
+    'extractor': ie_key,
+    'import': imported - start,
+    'init': initialized - imported,
+    'match': matched - initialized,
+}))
+'''
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the time taken to find the extractor for a URL at startup')
+    parser.add_argument(
+        'url', nargs='?', default=DEFAULT_URL, help=f'URL to find the extractor for (default: {DEFAULT_URL})')
+    parser.add_argument(
+        '-n', '--repeat', type=int, default=5, help='Number of runs of each configuration (default: 5)')
+    return parser.parse_args()
+
+
+def run(url, precompiled):
+    output = subprocess.check_output(
+        [sys.executable, '-c', BENCH_CODE, url, str(int(precompiled))],
+        cwd=ROOT_DIR, text=True)
+    return json.loads(output)
+
+
+def main():
+    opts = parse_args()
+    results = {}
+    for precompiled in (False, True):
+        runs = [run(opts.url, precompiled) for _ in range(opts.repeat)]
+        results[precompiled] = {key: statistics.median(r[key] for r in runs) for key in ('import', 'init', 'match')}
+        if not runs[0]['lazy_extractors']:
+            sys.exit('Lazy extractors are not available. Run "python devscripts/make_lazy_extractors.py" first')
+
+    print(f'Extractor: {runs[0]["extractor"]} (median of {opts.repeat} runs)')
+    print('                      import      init     match')
+    for precompiled, timings in results.items():
+        print(f'{"precompiled regexes" if precompiled else "compiled at runtime":20}' + ''.join(
+            f'{timings[key] * 1000:8.1f}ms' for key in ('import', 'init', 'match')))
+    speedup = results[False]['match'] / results[True]['match']
+    print(f'Matching is {speedup:.1f}x faster with precompiled regexes')
+
+
+if __name__ == '__main__':
+    main()
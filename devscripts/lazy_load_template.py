@@ -2,6 +2,7 @@
 import random
 import re
 
+from ._precompiled import PrecompiledRegexes
 from ..utils import (
     age_restricted,
     bug_reports_message,
@@ -37,3 +38,8 @@ def __new__(cls, *args, **kwargs):
         instance = cls.real_class.__new__(cls.real_class)
         instance.__init__(*args, **kwargs)
         return instance
+
+    @classmethod
+    def _compile_valid_url(cls):
+        # _PRECOMPILED_REGEXES is defined at the end of lazy_extractors.py by make_lazy_extractors.py
+        return tuple(map(_PRECOMPILED_REGEXES.compile, variadic(cls._VALID_URL)))  # noqa: F821
@@ -41,7 +41,10 @@ def main():
     _ALL_CLASSES = get_all_ies()  # Must be before import
 
     import yt_dlp.plugins
+    from yt_dlp.extractor._precompiled import serialize_regexes
+    from yt_dlp.extractor._url_index import build_url_index
     from yt_dlp.extractor.common import InfoExtractor, SearchInfoExtractor
+    from yt_dlp.utils import variadic
 
     # Filter out plugins
     _ALL_CLASSES = [cls for cls in _ALL_CLASSES if not cls.__module__.startswith(f'{yt_dlp.plugins.PACKAGE_NAME}.')]
@@ -53,6 +56,9 @@ def main():
         *extra_ie_code(DummyInfoExtractor),
         '\nclass LazyLoadSearchExtractor(LazyLoadExtractor):\n    pass\n',
         *build_ies(_ALL_CLASSES, (InfoExtractor, SearchInfoExtractor), DummyInfoExtractor),
+        build_url_index_code(build_url_index(_ALL_CLASSES)),
+        build_precompiled_regexes_code(serialize_regexes(
+            pattern for ie in _ALL_CLASSES if ie._VALID_URL for pattern in variadic(ie._VALID_URL))),
     ))
 
     write_file(lazy_extractors_filename, f'{module_src}\n')
@@ -95,6 +101,20 @@ def build_ies(ies, bases, attr_base):
     yield f'\n_ALL_CLASSES = [{", ".join(names)}]'
 
 
+def build_url_index_code(url_index):
+    return '\n'.join((
+        '\n# Used by yt_dlp.extractor._url_index',
+        '_URL_INDEX = {',
+        *(f'    {token!r}: {ie_keys!r},' for token, ie_keys in url_index.items()),
+        '}',
+    ))
+
+
+def build_precompiled_regexes_code(args):
+    key, data = args
+    return f"\n_PRECOMPILED_REGEXES = PrecompiledRegexes({key!r}, '''\n{data}''')"
+
+
 def sort_ies(ies, ignored_bases):
     """find the correct sorting and add the required base classes so that subclasses can be correctly created"""
     classes, returned_classes = ies[:-1], set()
@@ -2,10 +2,12 @@
 
 import pytest
 
-from yt_dlp.networking import RequestHandler
+from yt_dlp.networking import RequestHandler, _load_request_handlers
 from yt_dlp.networking.common import _REQUEST_HANDLERS
 from yt_dlp.utils._utils import _YDLLogger as FakeLogger
 
+_load_request_handlers()
+
 
 @pytest.fixture
 def handler(request):
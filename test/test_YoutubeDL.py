@@ -21,6 +21,7 @@
 from yt_dlp.postprocessor.common import PostProcessor
 from yt_dlp.utils import (
     ExtractorError,
+    FlatEntry,
     LazyList,
     OnDemandPagedList,
     int_or_none,
@@ -1244,6 +1245,269 @@ def _real_extract(self, url):
         self.assertEqual(downloaded['extractor'], 'Video')
         self.assertEqual(downloaded['extractor_key'], 'Video')
 
+    def test_concurrent_entries(self):
+        import threading
+
+        class _YDL(YDL):
+            def trouble(self, s, tb=None):
+                self.errors.append(s)
+
+        ydl = _YDL({'concurrent_entries': 3, 'ignoreerrors': True})
+        ydl.errors = []
+        barrier = threading.Barrier(3, timeout=10)
+
+        class VideoIE(InfoExtractor):
+            _VALID_URL = r'video:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                if video_id in ('1', '2', '3'):
+                    # Only passes if these entries are extracted at the same time
+                    barrier.wait()
+                if video_id == '4':
+                    raise ExtractorError('foo', expected=True)
+                self.to_screen(f'extracted {video_id}')
+                return _make_result([{'url': TEST_URL}], id=video_id, title=video_id)
+
+        class PlaylistIE(InfoExtractor):
+            _VALID_URL = r'playlist:'
+
+            def _real_extract(self, url):
+                return self.playlist_result(
+                    self.url_result(f'video:{i}', VideoIE) for i in range(1, 7))
+
+        ydl.add_info_extractor(VideoIE(ydl))
+        ydl.add_info_extractor(PlaylistIE(ydl))
+        ydl.extract_info('playlist:')
+        self.assertEqual([i['id'] for i in ydl.downloaded_info_dicts], ['1', '2', '3', '5', '6'])
+        self.assertEqual([i['playlist_index'] for i in ydl.downloaded_info_dicts], [1, 2, 3, 5, 6])
+        self.assertEqual(len(ydl.errors), 1)
+        self.assertFalse(ydl._prefetched_extractions)
+
+    def test_concurrent_entries_isolation(self):
+        import threading
+
+        class Logger:
+            def __init__(self):
+                self.messages = []
+
+            def debug(self, msg):
+                self.messages.append(msg)
+
+            warning = error = debug
+
+        logger = Logger()
+        ydl = YDL({'concurrent_entries': 3, 'logger': logger})
+        barrier = threading.Barrier(3, timeout=10)
+        instances = {}
+
+        class VideoIE(InfoExtractor):
+            _VALID_URL = r'video:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                instances[video_id] = self
+                barrier.wait()
+                self._downloader.report_warning(f'extracted {video_id}')
+                return _make_result([{'url': TEST_URL}], id=video_id, title=video_id)
+
+        class PlaylistIE(InfoExtractor):
+            _VALID_URL = r'playlist:'
+
+            def _real_extract(self, url):
+                return self.playlist_result(
+                    self.url_result(f'video:{i}', VideoIE) for i in range(1, 4))
+
+        main_ie = VideoIE(ydl)
+        ydl.add_info_extractor(main_ie)
+        ydl.add_info_extractor(PlaylistIE(ydl))
+        ydl.extract_info('playlist:')
+        self.assertEqual(len(set(map(id, instances.values()))), 3)
+        self.assertNotIn(main_ie, instances.values())
+        self.assertEqual(
+            [msg for msg in logger.messages if 'extracted' in msg],
+            ['extracted 1', 'extracted 2', 'extracted 3'])
+
+    def test_extract_info_many(self):
+        import threading
+
+        class _YDL(YDL):
+            def trouble(self, s, tb=None):
+                self.errors.append(s)
+
+        ydl = _YDL({'concurrent_urls': 3, 'ignoreerrors': True})
+        ydl.errors = []
+        barrier = threading.Barrier(3, timeout=10)
+        release = threading.Event()
+
+        class VideoIE(InfoExtractor):
+            _VALID_URL = r'video:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                if video_id in ('1', '2', '3'):
+                    # Only passes if these URLs are extracted at the same time
+                    barrier.wait()
+                if video_id == '4':
+                    raise ExtractorError('foo', expected=True)
+                if video_id == '5':
+                    release.wait(10)
+                return _make_result([{'url': TEST_URL}], id=video_id, title=video_id)
+
+        ydl.add_info_extractor(VideoIE(ydl))
+        urls = [f'video:{i}' for i in range(1, 7)]
+        release.set()
+        results = list(ydl.extract_info_many(urls, download=False))
+        self.assertEqual([url for url, _ in results], urls)
+        self.assertEqual([info and info['id'] for _, info in results], ['1', '2', '3', None, '5', '6'])
+        self.assertEqual(len(ydl.errors), 1)
+        self.assertFalse(ydl._prefetched_extractions)
+
+        release.clear()
+        results = ydl.extract_info_many(['video:5', 'video:6'], ordered=False, download=False)
+        self.assertEqual(next(results)[0], 'video:6')
+        release.set()
+        self.assertEqual(next(results)[0], 'video:5')
+        self.assertFalse(ydl._prefetched_extractions)
+
+        YoutubeDL.download(ydl, urls)
+        self.assertEqual([i['id'] for i in ydl.downloaded_info_dicts], ['1', '2', '3', '5', '6'])
+
+    def test_concurrent_shared_state(self):
+        import threading
+        import time
+
+        from yt_dlp.cookies import YoutubeDLCookieJar
+
+        loads = []
+
+        def load_cookies(*args):
+            loads.append(threading.current_thread())
+            # Give the other workers time to build their own, without the fix
+            time.sleep(0.1)
+            return YoutubeDLCookieJar()
+
+        class VideoIE(InfoExtractor):
+            _VALID_URL = r'video:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                directors.add(id(self._downloader._request_director))
+                jars.add(id(self._downloader.cookiejar))
+                return _make_result([{'url': TEST_URL}], id=video_id, title=video_id)
+
+        class PlaylistIE(InfoExtractor):
+            _VALID_URL = r'playlist:'
+
+            def _real_extract(self, url):
+                return self.playlist_result(
+                    self.url_result(f'video:{i}', VideoIE) for i in range(1, 5))
+
+        with patch.object(sys.modules['yt_dlp.YoutubeDL'], 'load_cookies', load_cookies):
+            for params, url in (({'concurrent_urls': 4}, None), ({'concurrent_entries': 4}, 'playlist:')):
+                loads.clear()
+                directors, jars = set(), set()
+                ydl = YDL(params)
+                ydl.add_info_extractor(VideoIE(ydl))
+                ydl.add_info_extractor(PlaylistIE(ydl))
+                if url:
+                    ydl.extract_info(url)
+                else:
+                    list(ydl.extract_info_many([f'video:{i}' for i in range(1, 5)], download=False))
+                self.assertEqual(loads, [threading.main_thread()])
+                self.assertEqual(len(directors), 1)
+                self.assertEqual(len(jars), 1)
+                ydl.close()
+
+    def test_stream_json(self):
+        class _YDL(YDL):
+            def trouble(self, s, tb=None):
+                pass
+
+            def _write_string(self, message, out=None, only_once=False):
+                if out is self._out_files.out:
+                    self.output.append(message)
+
+        class VideoIE(InfoExtractor):
+            _VALID_URL = r'video:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                if video_id == '2':
+                    raise ExtractorError('foo', expected=True)
+                return _make_result([{'url': TEST_URL}], id=video_id, title=video_id)
+
+        class PlaylistIE(InfoExtractor):
+            _VALID_URL = r'playlist:(?P<count>\d+)'
+
+            def _real_extract(self, url):
+                return self.playlist_result(
+                    (self.url_result(f'video:{i}', VideoIE) for i in range(1, int(self._match_valid_url(url)['count']) + 1)),
+                    'pl', 'playlist')
+
+        def dump(url, **params):
+            ydl = _YDL({'dump_single_json': True, 'ignoreerrors': True, **params})
+            ydl.output = []
+            ydl.add_info_extractor(VideoIE(ydl))
+            ydl.add_info_extractor(PlaylistIE(ydl))
+            YoutubeDL.download(ydl, [url])
+            return ''.join(ydl.output)
+
+        expected = json.loads(dump('playlist:3'))
+        self.assertEqual([e and e['id'] for e in expected['entries']], ['1', None, '3'])
+
+        output = dump('playlist:3', stream_json='json')
+        self.assertTrue(output.startswith('{"entries": [{'))
+        self.assertEqual(json.loads(output), expected)
+        self.assertEqual(
+            json.loads(dump('playlist:3', stream_json='json', lazy_playlist=True)),
+            json.loads(dump('playlist:3', lazy_playlist=True)))
+        self.assertEqual(json.loads(dump('playlist:0', stream_json='json')), json.loads(dump('playlist:0')))
+
+        lines = [json.loads(line) for line in dump('playlist:3', stream_json='jsonl').splitlines()]
+        self.assertEqual(lines[:-1], expected['entries'])
+        self.assertEqual(lines[-1], {k: v for k, v in expected.items() if k != 'entries'})
+
+        # Videos are dumped as with --dump-single-json
+        self.assertEqual(dump('video:1', stream_json='jsonl'), dump('video:1'))
+
+    def test_compact_flat_entries(self):
+        class PlaylistIE(InfoExtractor):
+            _VALID_URL = r'playlist:'
+
+            def _real_extract(self, url):
+                return self.playlist_result(
+                    (self.url_result(f'video:{i}', 'Video', str(i), f'Video {i}', channel='channel', duration=i or None)
+                     for i in range(4)), 'pl', 'playlist')
+
+        def extract(**params):
+            ydl = YDL({'extract_flat': 'in_playlist', 'playlist_items': '2:', **params})
+            ydl.add_info_extractor(PlaylistIE(ydl))
+            return ydl, ydl.extract_info('playlist:', download=False)
+
+        _, expected = extract()
+        ydl, info = extract(compact_flat_entries=True)
+        self.assertTrue(all(isinstance(entry, FlatEntry) for entry in info['entries']))
+        self.assertEqual(info['entries'], expected['entries'])
+        info['epoch'] = expected['epoch'] = 0
+        self.assertEqual(json.dumps(ydl.sanitize_info(info)), json.dumps(ydl.sanitize_info(expected)))
+        self.assertEqual(ydl.evaluate_outtmpl('%(entries.0)j', info), ydl.evaluate_outtmpl('%(entries.0)j', expected))
+        self.assertEqual(ydl.evaluate_outtmpl('%(entries.:.id)j', info), '["1", "2", "3"]')
+        self.assertEqual(ydl.evaluate_outtmpl('%(entries.0)s', info), ydl.evaluate_outtmpl('%(entries.0)s', expected))
+        self.assertEqual(ydl.evaluate_outtmpl('%(entries)s', info), ydl.evaluate_outtmpl('%(entries)s', expected))
+
+        class EditEntriesPP(PostProcessor):
+            def run(self, info):
+                for entry in info['entries']:
+                    entry['title'] = entry['title'].upper()
+                return [], info
+
+        ydl = YDL({'extract_flat': 'in_playlist', 'compact_flat_entries': True})
+        ydl.add_info_extractor(PlaylistIE(ydl))
+        ydl.add_post_processor(EditEntriesPP(), when='playlist')
+        info = ydl.extract_info('playlist:')
+        self.assertEqual([entry['title'] for entry in info['entries']], [f'VIDEO {i}' for i in range(4)])
+
     def test_header_cookies(self):
         from http.cookiejar import Cookie
 
@@ -8,8 +8,11 @@
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+import http.cookiejar
 import re
 import tempfile
+import time
+import urllib.request
 
 from yt_dlp.cookies import YoutubeDLCookieJar
 
@@ -61,6 +64,61 @@ def test_get_cookies_for_url(self):
         cookies = cookiejar.get_cookies_for_url('https://foobar.foobar/')
         self.assertFalse(cookies)
 
+    @staticmethod
+    def _cookie(name, domain, path='/', secure=False, expires=None):
+        return http.cookiejar.Cookie(
+            0, name, 'value', None, False, domain, bool(domain), domain.startswith('.'),
+            path, True, secure, expires, False, None, None, {})
+
+    def test_cookies_for_request(self):
+        cookiejar = YoutubeDLCookieJar()
+        for index, domain in enumerate((
+                'www.example.com', '.example.com', 'example.com', '.com', 'other.com',
+                '.www.example.com', 'localhost', '.local', '127.0.0.1', 'EXAMPLE.com')):
+            cookiejar.set_cookie(self._cookie(f'c{index}', domain))
+            cookiejar.set_cookie(self._cookie(f'p{index}', domain, path='/path'))
+            cookiejar.set_cookie(self._cookie(f's{index}', domain, secure=True))
+
+        for url in (
+                'https://www.example.com/path/x', 'http://sub.www.example.com/', 'https://example.com/',
+                'https://EXAMPLE.COM./path', 'http://other.com:8080/path', 'http://localhost/', 'http://127.0.0.1/'):
+            with self.subTest(url=url):
+                request = urllib.request.Request(url)
+                cookiejar._policy._now = cookiejar._now = int(time.time())
+                self.assertEqual(
+                    [cookie.name for cookie in cookiejar._cookies_for_request(request)],
+                    [cookie.name for cookie in http.cookiejar.CookieJar._cookies_for_request(cookiejar, request)])
+
+    def test_lookup_cache(self):
+        cookiejar = YoutubeDLCookieJar()
+        cookiejar.set_cookie(self._cookie('a', '.example.com'))
+        names = lambda url: [cookie.name for cookie in cookiejar.get_cookies_for_url(url)]
+
+        self.assertEqual(names('https://www.example.com/'), ['a'])
+        cookiejar.set_cookie(self._cookie('b', 'www.example.com', secure=True))
+        self.assertEqual(names('https://www.example.com/'), ['a', 'b'])
+        self.assertEqual(names('http://www.example.com/'), ['a'])
+        self.assertEqual(cookiejar.get_cookie_header('https://www.example.com/'), 'a=value; b=value')
+        cookiejar.clear('.example.com')
+        self.assertEqual(names('https://www.example.com/'), ['b'])
+        cookiejar.set_cookie(self._cookie('a', '.example.com'))
+        self.assertEqual(names('https://www.example.com/'), ['b', 'a'])
+
+        cookiejar.clear()
+        expires = int(time.time()) + 3600
+        cookiejar.set_cookie(self._cookie('c', '.example.com', expires=expires))
+        self.assertEqual(names('https://www.example.com/'), ['c'])
+        cookies, valid_until = cookiejar._lookup_cache[('https', 'www.example.com', '/')]
+        self.assertEqual(valid_until, expires)
+        cookies.append(self._cookie('cached', '.example.com'))
+        self.assertEqual(names('https://www.example.com/'), ['c', 'cached'])
+        # The cached cookies are looked up again once one of them expires
+        cookiejar._lookup_cache[('https', 'www.example.com', '/')] = cookies, 0
+        self.assertEqual(names('https://www.example.com/'), ['c'])
+        cookiejar.clear()
+        self.assertEqual(names('https://www.example.com/'), [])
+        self.assertIsNone(cookiejar.get_cookie_header('https://www.example.com/'))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -9,11 +9,15 @@
 
 
 import base64
+import random
+import time
 
+from yt_dlp import aes
 from yt_dlp.aes import (
     aes_cbc_decrypt,
     aes_cbc_decrypt_bytes,
     aes_cbc_encrypt,
+    aes_cbc_encrypt_bytes,
     aes_ctr_decrypt,
     aes_ctr_encrypt,
     aes_decrypt,
@@ -26,7 +30,7 @@
     key_expansion,
     pad_block,
 )
-from yt_dlp.dependencies import Cryptodome
+from yt_dlp.dependencies import Cryptodome, numpy
 from yt_dlp.utils import bytes_to_intlist, intlist_to_bytes
 
 # the encrypted data can be generate with 'devscripts/generate_aes_testdata.py'
@@ -52,6 +56,39 @@ def test_cbc_decrypt(self):
             decrypted = aes_cbc_decrypt_bytes(data, intlist_to_bytes(self.key), intlist_to_bytes(self.iv))
             self.assertEqual(decrypted.rstrip(b'\x08'), self.secret_msg)
 
+    def test_cbc_decrypt_sizes(self):
+        rng = random.Random(0)
+        for key_size in (16, 24, 32):
+            key = [rng.randrange(256) for _ in range(key_size)]
+            for size in (1, 16, 100, 4096):
+                data = [rng.randrange(256) for _ in range(size)]
+                encrypted = aes_cbc_encrypt(data, key, self.iv, padding_mode='zero')
+                self.assertEqual(aes_cbc_decrypt(encrypted, key, self.iv)[:size], data)
+                self.assertEqual(
+                    aes._aes_cbc_decrypt_bytes(bytes(encrypted), bytes(key), bytes(self.iv))[:size], bytes(data))
+
+    @unittest.skipUnless(numpy, 'numpy is not available')
+    def test_cbc_decrypt_numpy(self):
+        rng = random.Random(0)
+        data = bytes(rng.randrange(256) for _ in range(aes._NUMPY_MIN_SIZE * 2))
+        for key_size in (16, 24, 32):
+            round_keys = aes._decryption_round_keys(data[:key_size])
+            self.assertEqual(
+                aes._aes_decrypt_blocks_numpy(data, round_keys), aes._aes_decrypt_blocks(data, round_keys))
+
+    def test_cbc_decrypt_benchmark(self):
+        data = bytes(range(256)) * 256
+        key, iv = intlist_to_bytes(self.key), intlist_to_bytes(self.iv)
+        implementations = {'T-tables': aes._aes_decrypt_blocks}
+        if numpy:
+            implementations['numpy'] = aes._aes_decrypt_blocks_numpy
+        for name, func in implementations.items():
+            start = time.perf_counter()
+            func(data, aes._decryption_round_keys(key))
+            speed = len(data) / (time.perf_counter() - start) / 1024 ** 2
+            print(f'\nAES-128-CBC decryption ({name}): {speed:.2f} MB/s', file=sys.stderr)
+        self.assertEqual(aes._aes_cbc_decrypt_bytes(aes_cbc_encrypt_bytes(data, key, iv), key, iv)[:len(data)], data)
+
     def test_cbc_encrypt(self):
         data = bytes_to_intlist(self.secret_msg)
         encrypted = intlist_to_bytes(aes_cbc_encrypt(data, self.key, self.iv))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import shutil
+
+from test.helper import FakeYDL
+from yt_dlp.archive import SqliteArchive
+from yt_dlp.dependencies import sqlite3
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'archive_test')
+
+
+@unittest.skipUnless(sqlite3, 'sqlite3 is not available')
+class TestSqliteArchive(unittest.TestCase):
+    def setUp(self):
+        self.tearDown()
+        os.makedirs(TEST_DIR)
+        self.filename = os.path.join(TEST_DIR, 'archive.sqlite')
+
+    def tearDown(self):
+        if os.path.exists(TEST_DIR):
+            shutil.rmtree(TEST_DIR)
+
+    def test_archive(self):
+        archive = SqliteArchive(self.filename)
+        self.assertFalse(archive)
+        self.assertNotIn('youtube abc', archive)
+        archive.add('youtube abc')
+        self.assertTrue(archive)
+        self.assertIn('youtube abc', archive)
+        self.assertEqual(archive.update(['youtube abc', 'vimeo 123', 'vimeo 456']), 2)
+        self.assertEqual(len(archive), 3)
+
+        other = SqliteArchive(self.filename)
+        self.assertIn('vimeo 456', other)
+        other.add('vimeo 789')
+        self.assertIn('vimeo 789', archive)
+        other.close()
+        archive.close()
+
+    def test_import_text(self):
+        text_filename = os.path.join(TEST_DIR, 'archive.txt')
+        with open(text_filename, 'w', encoding='utf-8') as f:
+            f.write('youtube abc\nvimeo 123\n\nyoutube abc\n')
+        archive = SqliteArchive(self.filename)
+        self.assertEqual(archive.import_text(text_filename), 2)
+        self.assertEqual(sorted(archive), ['vimeo 123', 'youtube abc'])
+        archive.close()
+
+    def test_youtubedl(self):
+        ydl = FakeYDL({'download_archive': self.filename})
+        self.assertIsInstance(ydl.archive, SqliteArchive)
+        info = {'id': 'abc', 'extractor_key': 'Youtube'}
+        self.assertFalse(ydl.in_download_archive(info))
+        ydl.record_download_archive(info)
+        self.assertTrue(ydl.in_download_archive(info))
+        self.assertTrue(ydl.in_download_archive({'id': 'xyz', 'extractor_key': 'Youtube', '_old_archive_ids': ['youtube abc']}))
+        ydl.close()
+
+        archive = SqliteArchive(self.filename)
+        self.assertEqual(list(archive), ['youtube abc'])
+        archive.close()
+
+    def test_text_archive_with_sqlite_extension(self):
+        self.assertTrue(SqliteArchive.is_sqlite_archive(self.filename))
+        text_filename = os.path.join(TEST_DIR, 'archive.db')
+        with open(text_filename, 'w', encoding='utf-8') as f:
+            f.write('youtube abc\n')
+        self.assertFalse(SqliteArchive.is_sqlite_archive(text_filename))
+
+        ydl = FakeYDL({'download_archive': text_filename})
+        self.assertEqual(ydl.archive, {'youtube abc'})
+        ydl.record_download_archive({'id': 'xyz', 'extractor_key': 'Youtube'})
+        ydl.close()
+        with open(text_filename, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'youtube abc\nyoutube xyz\n')
+
+        SqliteArchive(self.filename).close()
+        self.assertTrue(SqliteArchive.is_sqlite_archive(self.filename))
+
+
+if __name__ == '__main__':
+    unittest.main()
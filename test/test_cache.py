@@ -52,6 +52,17 @@ def test_cache(self):
         self.assertFalse(os.path.exists(self.test_dir))
         self.assertEqual(c.load('test_cache', 'k.'), None)
 
+    @unittest.skipIf(os.name == 'nt', 'Permissions are not supported on Windows')
+    def test_mode(self):
+        c = Cache(FakeYDL({'cachedir': self.test_dir}))
+        c.store('test_cache', 'private', {'x': 1}, mode=0o600)
+        c.store('test_cache', 'public', {'x': 1})
+        mask = os.umask(0)
+        os.umask(mask)
+        for key, mode in (('private', 0o600), ('public', 0o666 & ~mask)):
+            self.assertEqual(os.stat(os.path.join(self.test_dir, 'test_cache', f'{key}.json')).st_mode & 0o777, mode)
+        self.assertEqual(c.load('test_cache', 'private'), {'x': 1})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,11 @@
+import contextlib
 import datetime as dt
+import os
+import tempfile
 import unittest
 
-from yt_dlp import cookies
+from yt_dlp import YoutubeDL, cookies
+from yt_dlp.cache import Cache
 from yt_dlp.cookies import (
     LenientSimpleCookie,
     LinuxChromeCookieDecryptor,
@@ -9,9 +13,11 @@
     WindowsChromeCookieDecryptor,
     _get_linux_desktop_environment,
     _LinuxDesktopEnvironment,
+    extract_cookies_from_browser,
     parse_safari_cookies,
     pbkdf2_sha1,
 )
+from yt_dlp.dependencies import sqlite3
 
 
 class Logger:
@@ -146,6 +152,37 @@ def test_pbkdf2_sha1(self):
         key = pbkdf2_sha1(b'peanuts', b' ' * 16, 1, 16)
         self.assertEqual(key, b'g\xe1\x8e\x0fQ\x1c\x9b\xf3\xc9`!\xaa\x90\xd9\xd34')
 
+    @unittest.skipUnless(sqlite3, 'sqlite3 is not available')
+    def test_browser_cookies_cache(self):
+        with tempfile.TemporaryDirectory() as profile, tempfile.TemporaryDirectory() as cachedir:
+            database_path = os.path.join(profile, 'cookies.sqlite')
+
+            def add_cookie(name, value):
+                with contextlib.closing(sqlite3.connect(database_path)) as conn, conn:
+                    conn.execute(
+                        'CREATE TABLE IF NOT EXISTS moz_cookies (host TEXT, name TEXT, value TEXT, path TEXT, '
+                        'expiry INTEGER, isSecure INTEGER, originAttributes TEXT)')
+                    conn.execute('INSERT INTO moz_cookies VALUES (?, ?, ?, ?, ?, ?, ?)', (
+                        '.example.com', name, value, '/', 2000000000, 1, ''))
+
+            def extract():
+                jar = extract_cookies_from_browser('firefox', profile, Logger(), cache=cache)
+                return sorted((cookie.domain, cookie.name, cookie.value, cookie.secure, cookie.expires) for cookie in jar)
+
+            cache = Cache(YoutubeDL({'cachedir': cachedir}))
+            add_cookie('a', 'value')
+            expected = [('.example.com', 'a', 'value', 1, 2000000000)]
+            self.assertEqual(extract(), expected)
+            if os.name != 'nt':
+                cache_file, = os.listdir(os.path.join(cachedir, 'cookies'))
+                self.assertEqual(os.stat(os.path.join(cachedir, 'cookies', cache_file)).st_mode & 0o777, 0o600)
+
+            with MonkeyPatch(cookies, {'_open_database_copy': None}):
+                self.assertEqual(extract(), expected)
+
+            add_cookie('b', 'other')
+            self.assertEqual(extract(), [*expected, ('.example.com', 'b', 'other', 1, 2000000000)])
+
 
 class TestLenientSimpleCookie(unittest.TestCase):
     def _run_tests(self, *cases):
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import asyncio
+import http.server
+import re
+import threading
+import time
+
+from test.helper import FakeYDL, http_server_port, try_rm
+from yt_dlp import YoutubeDL
+from yt_dlp.downloader.fragment import AsyncFragmentEngine, FragmentMemoryPool
+from yt_dlp.downloader.hls import HlsFD
+from yt_dlp.utils import encodeFilename
+from yt_dlp.utils._utils import _YDLLogger as FakeLogger
+
+FRAGMENT_COUNT = 8
+FRAGMENT_SIZE = 1000
+
+
+def fragment_content(index):
+    return bytes([index]) * FRAGMENT_SIZE
+
+
+MISSING_FRAGMENT = 5
+
+
+class HTTPTestRequestHandler(http.server.BaseHTTPRequestHandler):
+    failed = set()
+    live_requests = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_playlist(self, segments):
+        self.send_body('\n'.join((
+            '#EXTM3U',
+            '#EXT-X-TARGETDURATION:1',
+            *segments,
+            '#EXT-X-ENDLIST',
+        )).encode(), 'application/vnd.apple.mpegurl')
+
+    def send_live_playlist(self, skip, query, split=False):
+        # Every reload of the playlist has 2 more fragments, and at most 6 of them
+        self.live_requests.append(query)
+        end = min(4 + 2 * (len(self.live_requests) - 1), FRAGMENT_COUNT)
+        start = max(0, end - 6)
+        skipped = end - start - 2 if skip and '_HLS_skip=YES' in query else 0
+        self.send_body('\n'.join((
+            '#EXTM3U',
+            '#EXT-X-TARGETDURATION:0.05',
+            f'#EXT-X-MEDIA-SEQUENCE:{start}',
+            *(['#EXT-X-SERVER-CONTROL:CAN-SKIP-UNTIL=10'] if skip else []),
+            *([f'#EXT-X-SKIP:SKIPPED-SEGMENTS={skipped}'] if skipped else []),
+            *(('#EXT-X-DISCONTINUITY\n' if split and i in (3, 6) else '') + f'#EXTINF:0.05,\nfrag{i}.ts'
+              for i in range(start + skipped, end)),
+            *(['#EXT-X-ENDLIST'] if end == FRAGMENT_COUNT else []),
+        )).encode(), 'application/vnd.apple.mpegurl')
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        if path in ('/live.m3u8', '/live-delta.m3u8'):
+            self.send_live_playlist(path == '/live-delta.m3u8', query)
+        elif path == '/live-split.m3u8':
+            self.send_live_playlist(False, query, split=True)
+        elif self.path == '/index.m3u8':
+            self.send_playlist(f'#EXTINF:1,\nfrag{i}.ts' for i in range(FRAGMENT_COUNT))
+        elif self.path == '/flaky.m3u8':
+            self.send_playlist(f'#EXTINF:1,\nflaky{i}.ts' for i in range(FRAGMENT_COUNT))
+        elif mobj := re.fullmatch(r'/flaky(\d+)\.ts', self.path):
+            # Every fragment fails once
+            if self.path not in self.failed:
+                self.failed.add(self.path)
+                self.send_error(503)
+            else:
+                self.send_body(fragment_content(int(mobj.group(1))), 'video/mp2t')
+        elif self.path in ('/byterange.m3u8', '/byterange-missing.m3u8'):
+            missing = self.path == '/byterange-missing.m3u8'
+            self.send_playlist(
+                f'#EXTINF:1,\n#EXT-X-BYTERANGE:{FRAGMENT_SIZE}@{i * FRAGMENT_SIZE}\n'
+                + ('missing.ts' if missing and i == MISSING_FRAGMENT else 'media.ts')
+                for i in range(FRAGMENT_COUNT))
+        elif mobj := re.fullmatch(r'/frag(\d+)\.ts', self.path):
+            self.send_body(fragment_content(int(mobj.group(1))), 'video/mp2t')
+        elif self.path == '/media.ts':
+            start, end = map(int, re.fullmatch(r'bytes=(\d+)-(\d+)', self.headers['Range']).groups())
+            index = start // FRAGMENT_SIZE
+            # Make earlier fragments finish later
+            time.sleep((FRAGMENT_COUNT - index) * 0.02)
+            self.send_response(206)
+            self.send_header('Content-Type', 'video/mp2t')
+            self.send_header('Content-Length', str(end - start + 1))
+            self.send_header('Content-Range', f'bytes {start}-{end}/{FRAGMENT_SIZE * FRAGMENT_COUNT}')
+            self.end_headers()
+            self.wfile.write(fragment_content(index)[:end - start + 1])
+        else:
+            self.send_error(404)
+
+
+class TestFragmentMemoryPool(unittest.TestCase):
+    def test_limit(self):
+        filename = 'test_fragment_pool.Frag1'
+        try_rm(encodeFilename(filename))
+
+        def opener(filename, open_mode):
+            return open(filename, open_mode), filename
+
+        pool = FragmentMemoryPool(10)
+        buffer = pool.open('a', 'wb', opener)
+        buffer.write(b'12345')
+        self.assertEqual(pool.used, 5)
+        self.assertEqual(pool.pop('a'), b'12345')
+        self.assertEqual(pool.used, 0)
+        self.assertIsNone(pool.pop('a'))
+
+        buffer = pool.open(filename, 'wb', opener)
+        buffer.write(b'123456')
+        buffer.write(b'789012')
+        buffer.close()
+        self.assertEqual(pool.used, 0)
+        self.assertIsNone(pool.pop(filename))
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read(), b'123456789012')
+        try_rm(encodeFilename(filename))
+
+        pool.open('b', 'wb', opener).write(b'12345')
+        pool.discard('b')
+        self.assertEqual(pool.used, 0)
+
+
+class TestAsyncFragmentEngine(unittest.TestCase):
+    def test_shutdown(self):
+        engine = AsyncFragmentEngine(HlsFD(FakeYDL(), {}), 2)
+        started = []
+
+        async def job(i, delay):
+            started.append(i)
+            await asyncio.sleep(delay)
+            return i
+
+        self.assertEqual(engine.submit(job, 0, 0).result(), 0)
+        futures = [engine.submit(job, i, 60) for i in range(1, 4)]
+        time.sleep(0.1)
+        # Only max_concurrency jobs may run at once
+        self.assertEqual(started, [0, 1, 2])
+        engine.shutdown(wait=False)
+        self.assertTrue(all(future.cancelled() for future in futures))
+        self.assertTrue(engine._loop.is_closed())
+        with self.assertRaises(RuntimeError):
+            engine.submit(job, 4, 0)
+
+    def test_prepare_request(self):
+        engine = AsyncFragmentEngine(HlsFD(FakeYDL({'proxy': 'http://127.0.0.1:1'}), {}), 1)
+        self.assertIsNone(engine.prepare_request('http://example.com/a.ts', {}))
+        self.assertIsNone(engine.prepare_request('ftp://example.com/a.ts', {}))
+        url, headers = engine.prepare_request(
+            'http://example.com/a.ts', {'Ytdl-Request-Proxy': '__noproxy__', 'Range': 'bytes=0-9'})
+        self.assertEqual(url, 'http://example.com/a.ts')
+        self.assertEqual(headers['Range'], 'bytes=0-9')
+        self.assertNotIn('Ytdl-Request-Proxy', headers)
+        engine.shutdown()
+
+
+class TestFragmentFD(unittest.TestCase):
+    def setUp(self):
+        self.httpd = http.server.HTTPServer(
+            ('127.0.0.1', 0), HTTPTestRequestHandler)
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def download(self, params, path='index.m3u8', expected=range(FRAGMENT_COUNT), progress_hook=None, **info):
+        params['logger'] = FakeLogger()
+        ydl = YoutubeDL(params)
+        downloader = HlsFD(ydl, params)
+        if progress_hook:
+            downloader.add_progress_hook(progress_hook)
+        filename = 'testfile.ts'
+        try_rm(encodeFilename(filename))
+        self.assertTrue(downloader.real_download(filename, {
+            'url': f'http://127.0.0.1:{self.port}/{path}',
+            'ext': 'ts',
+            **info,
+        }))
+        with open(encodeFilename(filename), 'rb') as f:
+            self.assertEqual(f.read(), b''.join(map(fragment_content, expected)))
+        try_rm(encodeFilename(filename))
+        self.assertFalse([f for f in os.listdir('.') if f.startswith(f'{filename}.part-Frag')])
+        return downloader
+
+    def test_asyncio(self):
+        missing = [i for i in range(FRAGMENT_COUNT) if i != MISSING_FRAGMENT]
+        for workers in (1, 4):
+            params = {'fragment_engine': 'asyncio', 'concurrent_fragment_downloads': workers}
+            self.download(dict(params))
+            self.download(dict(params), 'byterange.m3u8')
+            self.download(dict(params), 'byterange-missing.m3u8', missing)
+
+    def test_asyncio_retry(self):
+        HTTPTestRequestHandler.failed.clear()
+        statuses = []
+        self.download({
+            'fragment_engine': 'asyncio',
+            'concurrent_fragment_downloads': 4,
+            'fragment_retries': 1,
+            'retry_sleep_functions': {'fragment': lambda n: 0.01},
+        }, 'flaky.m3u8', progress_hook=lambda s: statuses.append(s.copy()))
+        self.assertEqual(len(HTTPTestRequestHandler.failed), FRAGMENT_COUNT)
+
+        self.assertEqual(statuses[-1]['status'], 'finished')
+        self.assertEqual(statuses[-1]['downloaded_bytes'], FRAGMENT_SIZE * FRAGMENT_COUNT)
+        downloading = [s for s in statuses if s['status'] == 'downloading']
+        self.assertEqual(downloading[-1]['fragment_index'], FRAGMENT_COUNT)
+        self.assertEqual(downloading[-1]['downloaded_bytes'], FRAGMENT_SIZE * FRAGMENT_COUNT)
+
+    def test_regular(self):
+        self.download({})
+
+    def test_concurrent(self):
+        self.download({'concurrent_fragment_downloads': 4})
+
+    def test_memory(self):
+        for limit in (FRAGMENT_SIZE * FRAGMENT_COUNT, FRAGMENT_SIZE * 2, 1):
+            for workers in (1, 4):
+                downloader = self.download({
+                    'fragment_memory_limit': limit,
+                    'concurrent_fragment_downloads': workers,
+                })
+                self.assertEqual(downloader._fragment_memory_pool.used, 0)
+
+    def test_positional(self):
+        for workers in (1, 4):
+            self.download({'concurrent_fragment_downloads': workers}, 'byterange.m3u8')
+        self.download({
+            'concurrent_fragment_downloads': 4,
+            'fragment_reorder_window': 1,
+        }, 'byterange.m3u8')
+
+    def test_positional_missing_fragment(self):
+        for workers in (1, 4):
+            self.download(
+                {'concurrent_fragment_downloads': workers}, 'byterange-missing.m3u8',
+                [i for i in range(FRAGMENT_COUNT) if i != MISSING_FRAGMENT])
+
+    def test_live(self):
+        # The download starts 3 fragments from the end of the first playlist
+        live_fragments = range(1, FRAGMENT_COUNT)
+        for workers in (1, 4):
+            HTTPTestRequestHandler.live_requests.clear()
+            self.download({'concurrent_fragment_downloads': workers}, 'live.m3u8', live_fragments, is_live=True)
+            self.assertEqual(HTTPTestRequestHandler.live_requests, ['', '', ''])
+
+            HTTPTestRequestHandler.live_requests.clear()
+            self.download(
+                {'concurrent_fragment_downloads': workers}, 'live-delta.m3u8', live_fragments, is_live=True)
+            self.assertEqual(HTTPTestRequestHandler.live_requests, ['', '_HLS_skip=YES', '_HLS_skip=YES'])
+
+        # Only the fragments between the first and second discontinuities
+        HTTPTestRequestHandler.live_requests.clear()
+        self.download({}, 'live-split.m3u8', range(3, 6), is_live=True, format_index=1)
+        self.assertEqual(len(HTTPTestRequestHandler.live_requests), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from test.helper import FakeYDL
+
+from yt_dlp.extractor._embed_index import EmbedFilter, embed_literals
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.utils import unsmuggle_url
+
+
+class TestEmbedIndex(unittest.TestCase):
+    def test_embed_literals(self):
+        def literals(*regexes):
+            return embed_literals(type('TestIE', (InfoExtractor,), {'_EMBED_REGEX': list(regexes)}))
+
+        self.assertEqual(
+            literals(r'<iframe[^>]+src="(?P<url>https?://(?:www\.)?example\.com/embed/\d+)"'),
+            {'example.com/embed/'})
+        self.assertEqual(
+            literals(r'(?i)<IFRAME[^>]+src="(?P<url>[^"]+)"', r'data-(?:video|audio)-url="(?P<url>[^"]+)"'),
+            {'<iframe', '-url="'})
+        self.assertEqual(
+            literals(r'(?x)<script\s+src="(?P<url>//(?:player\.example|embed\.test)\.com/[^"]+)"'),
+            {'player.example', 'embed.test'})
+        self.assertEqual(literals(r'(?P<url>https?://example\.com/(?=v/)[^"]+)'), {'://example.com/'})
+        self.assertEqual(literals(), frozenset())
+        # No literal is required
+        self.assertIsNone(literals(r'(?P<url>https?://example\.com/\d+)', r'(?:src)?=(?P<url>\w+)'))
+        self.assertIsNone(literals(r'(?P<url>[^"]+)"'))
+        self.assertIsNone(literals(r'(?P<url>é\w+)'))
+
+        class OverriddenIE(InfoExtractor):
+            _EMBED_REGEX = [r'(?P<url>https?://example\.com/\d+)']
+
+            @classmethod
+            def _extract_embed_urls(cls, url, webpage):
+                yield from super()._extract_embed_urls(url, webpage)
+
+        self.assertIsNone(embed_literals(OverriddenIE))
+
+    def test_embed_filter(self):
+        class TestIE(InfoExtractor):
+            _EMBED_REGEX = [r'<iframe[^>]+src="(?P<url>https://example\.com/\d+)"']
+
+        class OtherIE(InfoExtractor):
+            _EMBED_REGEX = [r'(?i)<video[^>]+src="(?P<url>https://other\.com/\d+)"']
+
+        class NoEmbedsIE(InfoExtractor):
+            pass
+
+        embed_filter = EmbedFilter('<IFRAME src="https://example.com/1"><video src="https://OTHER.COM/2">')
+        self.assertTrue(embed_filter.may_have_embeds(TestIE))
+        self.assertTrue(embed_filter.may_have_embeds(OtherIE(FakeYDL())))
+        self.assertFalse(embed_filter.may_have_embeds(NoEmbedsIE))
+        self.assertFalse(EmbedFilter('<iframe src="https://other.com/1">').may_have_embeds(TestIE))
+        # Characters that match ASCII letters with re.IGNORECASE
+        webpage = '<VIDEO src="httpſ://other.com/1">'
+        self.assertRegex(webpage, OtherIE._EMBED_REGEX[0])
+        self.assertTrue(EmbedFilter(webpage).may_have_embeds(OtherIE))
+
+    def test_extract_embeds(self):
+        ydl = FakeYDL()
+        ydl.add_default_info_extractors()
+        webpage = '''
+            <iframe src="https://player.vimeo.com/video/56015672"></iframe>
+            <iframe width="640" height="360" src="https://www.youtube.com/embed/BaW_jenozKc"></iframe>
+            <iframe src="https://open.spotify.com/embed/episode/4Z7GAJ50bgctf6uclHlWKo"></iframe>
+        '''
+        embeds = ydl.get_info_extractor('Generic')._extract_embeds('https://example.com/', webpage)
+        self.assertEqual([(embed['ie_key'], unsmuggle_url(embed['url'])[0]) for embed in embeds], [
+            ('Youtube', 'https://www.youtube.com/embed/BaW_jenozKc'),
+            ('Spotify', 'https://open.spotify.com/embed/episode/4Z7GAJ50bgctf6uclHlWKo'),
+            ('Vimeo', 'https://player.vimeo.com/video/56015672'),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,13 +9,18 @@
 
 
 import contextlib
+import json
 import subprocess
+import tempfile
 
 from yt_dlp.utils import Popen
 
 rootDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 LAZY_EXTRACTORS = 'yt_dlp/extractor/lazy_extractors.py'
 
+# Limit for the modules of yt-dlp that are imported by `yt-dlp --version`
+IMPORT_BUDGET_MODULES = 65
+
 
 class TestExecution(unittest.TestCase):
     def run_yt_dlp(self, exe=(sys.executable, 'yt_dlp/__main__.py'), opts=('--version', )):
@@ -38,6 +43,34 @@ def test_cmdline_umlauts(self):
         _, stderr = self.run_yt_dlp(opts=('ä', '--version'))
         self.assertFalse(stderr)
 
+    def test_profile_startup(self):
+        _, stderr = self.run_yt_dlp(opts=('--profile-startup', '--version'))
+        self.assertIn('parse_options', stderr)
+        self.assertIn('yt_dlp.YoutubeDL', stderr)
+        _, stderr = self.run_yt_dlp(exe=(sys.executable, '-m', 'yt_dlp'), opts=('--profile-startup', '--version'))
+        self.assertIn('yt_dlp.YoutubeDL', stderr)
+        # The arguments of another program are not read
+        _, stderr = self.run_yt_dlp(exe=(sys.executable, '-c', 'import yt_dlp'), opts=('--profile-startup', ))
+        self.assertFalse(stderr)
+
+    def test_import_budget(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'profile.json')
+            self.run_yt_dlp(opts=('--profile-startup-json', filename, '--version'))
+            with open(filename, encoding='utf-8') as f:
+                report = json.load(f)
+
+        modules = [entry['module'] for entry in report['imports'] if entry['module'].startswith('yt_dlp.')]
+        self.assertLessEqual(len(modules), IMPORT_BUDGET_MODULES, f'Too many modules are imported: {modules}')
+
+    def test_deferred_imports(self):
+        stdout, _ = self.run_yt_dlp(exe=(sys.executable, '-c', 'import sys, yt_dlp; yt_dlp.YoutubeDL(); print(*sys.modules)'), opts=())
+        modules = stdout.split()
+        for module in ('yt_dlp.networking._requests', 'yt_dlp.networking._websockets', 'yt_dlp.networking._curlcffi',
+                       'yt_dlp.postprocessor.embedthumbnail', 'yt_dlp.postprocessor.exec', 'yt_dlp.postprocessor.xattrpp',
+                       'requests', 'websockets', 'curl_cffi', 'secretstorage', 'mutagen', 'numpy'):
+            self.assertNotIn(module, modules)
+
     def test_lazy_extractors(self):
         try:
             subprocess.check_call([sys.executable, 'devscripts/make_lazy_extractors.py', LAZY_EXTRACTORS],
@@ -4,12 +4,13 @@
 import os
 import sys
 import unittest
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import math
 
-from yt_dlp.jsinterp import JS_Undefined, JSInterpreter
+from yt_dlp.jsinterp import Debugger, JS_Undefined, JSInterpreter
 
 
 class NaN:
@@ -431,6 +432,29 @@ def test_slice(self):
         self._test('function f(){return "012345678".slice(-1, 1)}', '')
         self._test('function f(){return "012345678".slice(-3, -1)}', '67')
 
+    def test_repeated_calls(self):
+        jsi = JSInterpreter('''
+            function f(a){var b=a.split(""),c=[function(d){d.reverse()},function(d,e){d.splice(e,1)}];
+            for(var i=0;i<3;i++){c[0](b);c[1](b,i)}return b.join("")}''')
+        func = jsi.extract_function('f')
+        self.assertEqual(func(['abcdef']), 'eda')
+        # The code is only parsed by the first call
+        with patch.object(JSInterpreter, '_separate', side_effect=AssertionError('The code is parsed again')):
+            self.assertEqual(func(['abcdef']), 'eda')
+            self.assertEqual(func(['012345']), '430')
+
+    def test_profile(self):
+        Debugger.PROFILE = {}
+        try:
+            self._test('function f(a){var b=[a, 1];if(a){b.reverse()}return b[0]}', 1, args=[2])
+            profile = Debugger.PROFILE
+        finally:
+            Debugger.PROFILE = None
+        self.assertEqual(profile['var'][0], 1)
+        self.assertEqual(profile['statements'][0], 1)
+        for _, total, own in profile.values():
+            self.assertGreaterEqual(total, own)
+
 
 if __name__ == '__main__':
     unittest.main()
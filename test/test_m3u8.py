@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import random
+
+from yt_dlp.m3u8 import M3U8Playlist, Segment
+from yt_dlp.utils import urljoin
+
+MEDIA_PLAYLIST = '''#EXTM3U
+#EXT-X-VERSION:7
+#EXT-X-TARGETDURATION:6
+#EXT-X-MEDIA-SEQUENCE:100
+#EXT-X-MAP:URI="init.mp4",BYTERANGE="720@0"
+#EXTINF:6.0,
+#EXT-X-BYTERANGE:1000@720
+media.mp4
+#EXTINF:5.5,
+#EXT-X-BYTERANGE:1200
+media.mp4
+#EXT-X-KEY:METHOD=AES-128,URI="https://example.com/key",IV=0x10
+#EXT-X-DISCONTINUITY
+#EXTINF:4,title
+  https://cdn.example.com/segment.ts
+
+#UPLYNK-SEGMENT:abc,00000000,ad
+#EXTINF:2,
+ad.ts
+#UPLYNK-SEGMENT:abc,00000000,segment
+#EXT-X-KEY:METHOD=NONE
+last.ts
+#EXT-X-ENDLIST
+'''
+
+MASTER_PLAYLIST = '''#EXTM3U
+#EXT-X-STREAM-INF:BANDWIDTH=1280000,RESOLUTION=1280x720,AUDIO="aac"
+720p.m3u8
+#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aac",NAME="English",LANGUAGE="en",URI="audio/en.m3u8"
+#EXT-X-STREAM-INF:BANDWIDTH=640000,CODECS="avc1.4d401e,mp4a.40.2"
+https://example.com/360p.m3u8
+'''
+
+
+class TestM3U8Playlist(unittest.TestCase):
+    def test_media_playlist(self):
+        playlist = M3U8Playlist(MEDIA_PLAYLIST, 'https://example.com/hls/index.m3u8?token=1')
+        self.assertTrue(playlist.is_media)
+        self.assertTrue(playlist.endlist)
+        self.assertEqual(playlist.target_duration, 6)
+        self.assertEqual(playlist.media_sequence, 100)
+        self.assertEqual(playlist.discontinuity_count, 1)
+        self.assertEqual((playlist.segment_count, playlist.ad_segment_count), (5, 1))
+        self.assertEqual(len(playlist), 6)
+        self.assertEqual(playlist.duration, 17.5)
+        self.assertEqual(playlist.media, [])
+        self.assertEqual(playlist.variants, [])
+
+        key = {'METHOD': 'AES-128', 'URI': 'https://example.com/key', 'IV': '0x10'}
+        self.assertEqual(list(playlist), [
+            Segment('init.mp4', True, 100, 0, None, None, (0, 720), False),
+            Segment('media.mp4', False, 100, 0, 6.0, None, (720, 1720), False),
+            Segment('media.mp4', False, 101, 0, 5.5, None, (1720, 2920), False),
+            Segment('https://cdn.example.com/segment.ts', False, 102, 1, 4.0, key, None, False),
+            Segment('ad.ts', False, 103, 1, 2.0, key, None, True),
+            Segment('last.ts', False, 104, 1, None, {'METHOD': 'NONE'}, None, False),
+        ])
+        self.assertEqual(playlist[-1].uri, 'last.ts')
+        self.assertEqual(
+            [playlist.resolve_url(segment.uri) for segment in playlist][2:5],
+            ['https://example.com/hls/media.mp4', 'https://cdn.example.com/segment.ts',
+             'https://example.com/hls/ad.ts'])
+
+    def test_master_playlist(self):
+        playlist = M3U8Playlist(MASTER_PLAYLIST, 'https://example.com/master.m3u8')
+        self.assertFalse(playlist.is_media)
+        self.assertEqual(playlist.media, [{
+            'TYPE': 'AUDIO', 'GROUP-ID': 'aac', 'NAME': 'English', 'LANGUAGE': 'en', 'URI': 'audio/en.m3u8'}])
+        self.assertEqual(playlist.variants, [
+            ({'BANDWIDTH': '1280000', 'RESOLUTION': '1280x720', 'AUDIO': 'aac'}, '720p.m3u8'),
+            ({'BANDWIDTH': '640000', 'CODECS': 'avc1.4d401e,mp4a.40.2'}, 'https://example.com/360p.m3u8'),
+        ])
+
+    def test_reload(self):
+        def playlist(sequence, *lines, skipped=0, previous=None):
+            return M3U8Playlist('\n'.join((
+                '#EXTM3U', '#EXT-X-TARGETDURATION:6', f'#EXT-X-MEDIA-SEQUENCE:{sequence}',
+                *([f'#EXT-X-SKIP:SKIPPED-SEGMENTS={skipped}'] if skipped else []), *lines)), previous=previous)
+
+        def segments(playlist):
+            return [(s.uri, s.media_sequence, s.discontinuity, s.key and s.key['URI']) for s in playlist]
+
+        first = playlist(
+            10, '#EXT-X-KEY:METHOD=AES-128,URI="k1"', '#EXTINF:6,', 'a.ts', '#EXTINF:6,', 'b.ts',
+            '#EXT-X-DISCONTINUITY', '#EXTINF:6,', 'c.ts')
+        self.assertEqual(first.next_sequence, 13)
+        # Only the new segments are parsed, and the key and discontinuities carry over
+        second = playlist(
+            11, '#EXT-X-KEY:METHOD=AES-128,URI="k1"', '#EXTINF:6,', 'b.ts', '#EXT-X-DISCONTINUITY', '#EXTINF:6,',
+            'c.ts', '#EXTINF:6,', 'd.ts', '#EXT-X-KEY:METHOD=AES-128,URI="k2"', '#EXTINF:6,', 'e.ts', previous=first)
+        self.assertEqual(segments(second), [('d.ts', 13, 1, 'k1'), ('e.ts', 14, 1, 'k2')])
+        self.assertEqual(second.next_sequence, 15)
+        # Playlist delta update
+        third = playlist(12, '#EXTINF:6,', 'e.ts', '#EXTINF:6,', 'f.ts', skipped=2, previous=second)
+        self.assertEqual(segments(third), [('f.ts', 15, 1, 'k2')])
+        self.assertFalse(third.endlist)
+        unchanged = playlist(
+            12, '#EXTINF:6,', 'e.ts', '#EXTINF:6,', 'f.ts', '#EXT-X-ENDLIST', skipped=2, previous=third)
+        self.assertEqual(len(unchanged), 0)
+        self.assertEqual(unchanged.next_sequence, 16)
+        self.assertTrue(unchanged.endlist)
+        # The segments before the playlist were never seen
+        behind = playlist(20, '#EXTINF:6,', 'u.ts', '#EXT-X-MAP:URI="init.mp4"', '#EXTINF:6,', 'v.ts', previous=third)
+        self.assertEqual(segments(behind), [('u.ts', 20, 1, 'k2'), ('init.mp4', 21, 1, 'k2'), ('v.ts', 21, 1, 'k2')])
+        # Without EXTINF tags, the whole playlist is parsed
+        self.assertEqual(
+            segments(playlist(13, 'd.ts', 'e.ts', previous=second)), [('d.ts', 13, 1, 'k2'), ('e.ts', 14, 1, 'k2')])
+
+    def test_resolve_url(self):
+        bases = (
+            'https://example.com/a/b/index.m3u8', 'https://example.com/a/b/', 'https://example.com',
+            'https://example.com/a/../b/c.m3u8?x=/y#z', '//example.com/a/b;p?q', 'https://example.com/a/..',
+            'http://user@example.com:8080/a/b/c', 'ftp://example.com/a', 'data:application/x-mpegurl,', None)
+        paths = (
+            'seg.ts', 'a/b.ts', 'seg.ts?x=1', '/seg.ts', '//cdn.example.com/seg.ts', 'https://cdn.example.com/s.ts',
+            '../seg.ts', './seg.ts', 'a/./b.ts', 'a/../b.ts', 'a/..', '?x=1', '#frag', 'seg.ts#t=1', 'a//b.ts',
+            'a:b.ts', 'a b.ts', 'a\tb.ts', '.hidden.ts', 'a/.b.ts', '%2e%2e/seg.ts', '', None)
+        chars = 'ab/.?#:;=%@ \t'
+        rng = random.Random(0)
+        paths += tuple(''.join(rng.choices(chars, k=rng.randint(1, 8))) for _ in range(2000))
+        for base in bases:
+            playlist = M3U8Playlist('', base)
+            for path in paths:
+                self.assertEqual(playlist.resolve_url(path), urljoin(base, path), f'{base!r} + {path!r}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,14 +10,18 @@
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import asyncio
+import contextlib
 import gzip
 import http.client
 import http.cookiejar
 import http.server
 import io
+import itertools
 import logging
 import pathlib
 import random
+import socket
 import ssl
 import tempfile
 import threading
@@ -45,7 +49,10 @@
     RequestHandler,
     Response,
 )
-from yt_dlp.networking._urllib import UrllibRH
+from yt_dlp.networking._asyncio import AsyncHTTPClient
+from yt_dlp.networking._cache import HTTPCache
+from yt_dlp.networking._helper import RequestScheduler
+from yt_dlp.networking._urllib import HTTPConnectionPool, UrllibRH
 from yt_dlp.networking.exceptions import (
     CertificateVerifyError,
     HTTPError,
@@ -265,6 +272,13 @@ def do_GET(self):
             self.end_headers()
             self.wfile.write(payload)
             self.finish()
+        elif self.path == '/client_port':
+            payload = str(self.client_address[1]).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
         elif self.path == '/get_cookie':
             self.send_response(200)
             self.send_header('Set-Cookie', 'test=ytdlp; path=/')
@@ -389,6 +403,19 @@ def test_legacy_ssl_support(self, handler):
             assert res.status == 200
             res.close()
 
+    @pytest.mark.skip_handler('CurlCFFI', 'curl-cffi does not use our SSL contexts')
+    def test_tls_session_resumption(self, handler):
+        url = f'https://127.0.0.1:{self.https_port}/headers'
+        director = RequestDirector(logger=FakeLogger())
+        for _ in range(2):
+            # A new handler has no connections to reuse, but can resume the session
+            with handler(verify=False, tls_session_cache=director.tls_session_cache) as rh:
+                validate_and_send(rh, Request(url)).read()
+        stats = director.tls_stats()
+        assert stats['handshakes'] == 2
+        assert stats['resumed_handshakes'] == 1
+        assert stats['handshake_time'] > 0
+
     def test_percent_encode(self, handler):
         with handler() as rh:
             # Unicode characters should be encoded with uppercase percent-encoding
@@ -846,6 +873,52 @@ def test_file_urls(self, handler):
 
         os.unlink(tf.name)
 
+    def test_keep_alive(self, handler):
+        def client_ports(rh, url, count=3):
+            return {validate_and_send(rh, Request(url)).read() for _ in range(count)}
+
+        for url in (f'http://127.0.0.1:{self.http_port}/client_port',
+                    f'https://127.0.0.1:{self.https_port}/client_port'):
+            with handler(verify=False) as rh:
+                assert len(client_ports(rh, url)) == 1
+                # The connection is not reused if the response was not fully read
+                res = validate_and_send(rh, Request(url))
+                res.close()
+                assert res.read() not in client_ports(rh, url)
+
+            with handler(verify=False, keep_alive=False) as rh:
+                assert len(client_ports(rh, url)) == 3
+
+            with handler(verify=False, keep_alive_timeout=0) as rh:
+                assert len(client_ports(rh, url)) == 3
+
+    def test_keep_alive_max_connections(self, handler):
+        url = f'http://127.0.0.1:{self.http_port}/client_port'
+        with handler(max_connections_per_host=1) as rh:
+            first, second = validate_and_send(rh, Request(url)), validate_and_send(rh, Request(url))
+            ports = {first.read(), second.read()}
+            assert len(ports) == 2
+            assert validate_and_send(rh, Request(url)).read() in ports
+
+    def test_keep_alive_stale_connection(self, handler, monkeypatch):
+        url = f'http://127.0.0.1:{self.http_port}/client_port'
+        # Simulate the server closing the idle connection just as it is taken from the pool
+        monkeypatch.setattr(HTTPConnectionPool, '_is_dropped', staticmethod(lambda conn: False))
+        with handler() as rh:
+            port = validate_and_send(rh, Request(url)).read()
+            opener = rh._get_instance(proxies={}, cookiejar=rh.cookiejar, legacy_ssl_support=None)
+            pool = next(h._pool for h in opener.handlers if getattr(h, '_pool', None))
+            (conn, _), = itertools.chain.from_iterable(pool._idle.values())
+            conn.sock.shutdown(socket.SHUT_RDWR)
+            assert validate_and_send(rh, Request(url)).read() != port
+
+            # A request that is not idempotent may have been acted on, so it is not retried
+            (conn, _), = itertools.chain.from_iterable(pool._idle.values())
+            conn.sock.shutdown(socket.SHUT_RDWR)
+            with pytest.raises(TransportError):
+                validate_and_send(rh, Request(f'http://127.0.0.1:{self.http_port}/method', data=b'test'))
+            assert validate_and_send(rh, Request(url)).read()
+
     def test_http_error_returns_content(self, handler):
         # urllib HTTPError will try close the underlying response if reference to the HTTPError object is lost
         def get_response():
@@ -1144,6 +1217,59 @@ def close(self):
         assert res4._buffer == b''
 
 
+class TestAsyncHTTPClient(TestRequestHandlerBase):
+    @staticmethod
+    def get(client, url, headers=None):
+        async def get():
+            try:
+                return await client.get(url, headers)
+            finally:
+                client.close()
+        return asyncio.run(get())
+
+    def test_redirect_headers(self):
+        headers = {'Authorization': 'Basic dGVzdDp0ZXN0', 'Cookie': 'test=cookie', 'Ytdl-Test': 'test'}
+        # Same host: the credentials are kept
+        url, _, body = self.get(AsyncHTTPClient(), f'http://127.0.0.1:{self.http_port}/redirect_302', headers)
+        assert url.endswith('/method')
+        assert b'Authorization: Basic dGVzdDp0ZXN0' in body
+        assert b'Cookie:' not in body
+        assert b'Ytdl-Test: test' in body
+        # Another host: neither credentials nor cookies are sent
+        url, _, body = self.get(AsyncHTTPClient(), f'http://127.0.0.1:{self.http_port}/308-to-headers', headers)
+        assert url.startswith('http://localhost:')
+        assert b'Authorization:' not in body
+        assert b'Cookie:' not in body
+        assert b'Ytdl-Test: test' in body
+
+    def test_cookies(self):
+        cookiejar = YoutubeDLCookieJar()
+        self.get(AsyncHTTPClient(cookiejar=cookiejar), f'http://127.0.0.1:{self.http_port}/get_cookie')
+        assert cookiejar.get_cookie_header(f'http://127.0.0.1:{self.http_port}/') == 'test=ytdlp'
+        _, _, body = self.get(AsyncHTTPClient(cookiejar=cookiejar), f'http://127.0.0.1:{self.http_port}/headers')
+        assert b'Cookie: test=ytdlp' in body
+
+    @pytest.mark.parametrize('headers', [
+        {'Ytdl-Test': 'test\r\nInjected: header'},
+        {'Ytdl-Test': 'test\nInjected: header'},
+        {'Ytdl-Test\r\nInjected': 'header'},
+        {'Ytdl:Test': 'test'},
+    ])
+    def test_invalid_headers(self, headers):
+        with pytest.raises(RequestError, match='Invalid header'):
+            self.get(AsyncHTTPClient(), f'http://127.0.0.1:{self.http_port}/headers', headers)
+
+    def test_tls_session_resumption(self):
+        director = RequestDirector(logger=FakeLogger())
+        ssl_context = director.tls_session_cache.make_ssl_context(verify=False)
+        for _ in range(2):
+            self.get(AsyncHTTPClient(ssl_context=ssl_context), f'https://127.0.0.1:{self.https_port}/headers')
+        stats = director.tls_stats()
+        assert stats['handshakes'] == 2
+        assert stats['resumed_handshakes'] == 1
+        assert stats['handshake_time'] > 0
+
+
 def run_validation(handler, error, req, **handler_kwargs):
     with handler(**handler_kwargs) as rh:
         if error:
@@ -1524,6 +1650,147 @@ def some_preference(rh, request):
         assert director.send(Request('http://')).read() == b''
         assert director.send(Request('http://', headers={'prefer': '1'})).read() == b'supported'
 
+    def test_rate_limit(self, monkeypatch):
+        now = 1000.0
+        sleeps = []
+
+        def sleep(seconds):
+            nonlocal now
+            sleeps.append(round(seconds, 3))
+            now += seconds
+
+        monkeypatch.setattr('yt_dlp.networking._helper.time.monotonic', lambda: now)
+        monkeypatch.setattr('yt_dlp.networking.common.time.sleep', sleep)
+
+        class StatusRH(FakeRH):
+            def _send(self, request: Request):
+                status = int(request.headers.get('status', 200))
+                response = Response(
+                    fp=io.BytesIO(b''), url=request.url, status=status,
+                    headers={'Retry-After': request.headers['retry-after']} if 'retry-after' in request.headers else {})
+                if status >= 400:
+                    raise HTTPError(response)
+                return response
+
+        director = RequestDirector(logger=FakeLogger())
+        director.add_handler(StatusRH(logger=FakeLogger()))
+
+        def send(url, rate=None, burst=None, key='Test', headers=None):
+            with contextlib.suppress(HTTPError):
+                director.send(Request(url, headers=headers, extensions={
+                    'rate_limit': {'key': key, 'rate': rate, 'burst': burst}}))
+
+        for _ in range(4):
+            send('http://a.example/', rate=2, burst=2)
+        assert sleeps == [0.5, 0.5]
+        # Buckets are per key and host
+        send('http://b.example/', rate=2)
+        send('http://a.example/', rate=2, key='Other')
+        director.send(Request('http://a.example/'))
+        assert sleeps == [0.5, 0.5]
+
+        sleeps.clear()
+        now += 100
+        send('http://c.example/', headers={'status': '429'})
+        send('http://c.example/', headers={'status': '503'})
+        send('http://c.example/')
+        send('http://c.example/', headers={'status': '429', 'retry-after': '5'})
+        send('http://c.example/', headers={'status': '429', 'retry-after': '3600'})
+        send('http://c.example/')
+        send('http://d.example/')
+        assert sleeps == [1, 2, 5, 60]
+
+    def test_rate_limit_eviction(self, monkeypatch):
+        monkeypatch.setattr(RequestScheduler, 'MAX_BUCKETS', 4)
+        scheduler = RequestScheduler()
+
+        def request(host, rate=None):
+            return Request(f'http://{host}/', extensions={'rate_limit': {'key': 'Test', 'rate': rate}})
+
+        scheduler.report(request('blocked.example'), 429)
+        # Idle buckets are dropped first
+        for i in range(10):
+            scheduler.reserve(request(f'{i}.example'))
+            assert len(scheduler._buckets) <= 4
+        assert scheduler.reserve(request('blocked.example')) > 0
+        # and then the least recently used ones
+        for i in range(10):
+            scheduler.reserve(request(f'{i}.example', rate=0.001))
+            assert len(scheduler._buckets) <= 4
+        assert list(scheduler._buckets) == [('Test', f'{i}.example') for i in range(6, 10)]
+
+    def test_http_cache(self, tmp_path):
+        sent = []
+
+        class ETagRH(FakeRH):
+            def _send(self, request: Request):
+                sent.append(request)
+                body = request.url.encode().ljust(100)
+                headers = {'Content-Length': str(len(body))}
+                if not request.url.endswith('/novalidator'):
+                    headers['ETag'] = '"1"'
+                if request.url.endswith('/cookie'):
+                    headers['Set-Cookie'] = 'a=b'
+                elif request.url.endswith('/nostore'):
+                    headers['Cache-Control'] = 'no-store'
+                if request.headers.get('If-None-Match') == '"1"':
+                    raise HTTPError(Response(fp=io.BytesIO(b''), url=request.url, headers=headers, status=304))
+                return Response(fp=io.BytesIO(body), url=request.url, headers=headers)
+
+        director = RequestDirector(logger=FakeLogger())
+        director.add_handler(ETagRH(logger=FakeLogger()))
+        director.http_cache = HTTPCache(str(tmp_path), max_size=4 * 100)
+
+        def send(url, ttl=None, **kwargs):
+            response = director.send(Request(url, extensions={'http_cache': {'ttl': ttl}}, **kwargs))
+            return response.read().rstrip()
+
+        assert send('http://a.example/') == b'http://a.example/'
+        assert send('http://a.example/') == b'http://a.example/'
+        assert sent[-1].headers.get('If-None-Match') == '"1"'
+        assert send('http://a.example/', ttl=60) == b'http://a.example/'
+        assert director.http_cache.stats() == {'hits': 1, 'revalidated': 1, 'misses': 1}
+        assert len(sent) == 2
+        if os.name != 'nt':
+            assert {path.stat().st_mode & 0o777 for path in tmp_path.iterdir()} == {0o600}
+
+        # Different request data is a different response
+        assert send('http://a.example/', data=b'x') == b'http://a.example/'
+        assert 'If-None-Match' not in sent[-1].headers
+        # Not stored
+        for url in ('http://a.example/cookie', 'http://a.example/nostore'):
+            send(url)
+            send(url)
+            assert 'If-None-Match' not in sent[-1].headers
+        director.send(Request('http://b.example/'))
+        director.send(Request('http://b.example/', extensions={'http_cache': {'ttl': 60}}))
+        assert 'If-None-Match' not in sent[-1].headers
+        assert director.http_cache.stats() == {'hits': 1, 'revalidated': 1, 'misses': 7}
+
+        # Least recently used responses are removed first
+        send('http://a.example/', ttl=60)
+        for url in ('http://c.example/', 'http://d.example/', 'http://e.example/'):
+            send(url)
+        assert len(list(tmp_path.glob('*.data'))) <= 4
+        count = len(sent)
+        send('http://a.example/', ttl=60)
+        assert len(sent) == count
+        send('http://b.example/', ttl=60)
+        assert len(sent) == count + 1
+
+        # Responses that can be neither reused nor revalidated are not stored
+        count = len(sent)
+        for kwargs in ({'url': 'http://f.example/novalidator'}, {'url': 'http://f.example/', 'data': b'x'}):
+            send(**kwargs)
+            send(**kwargs)
+            assert len(sent) == count + 2
+            assert 'If-None-Match' not in sent[-1].headers
+            count = len(sent)
+            send(**kwargs, ttl=60)
+            send(**kwargs, ttl=60)
+            assert len(sent) == count + 1
+            count = len(sent)
+
     def test_close(self, monkeypatch):
         director = RequestDirector(logger=FakeLogger())
         director.add_handler(FakeRH(logger=FakeLogger()))
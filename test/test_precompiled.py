@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import base64
+import marshal
+import re
+import zlib
+
+from yt_dlp.extractor._precompiled import PrecompiledRegexes, serialize_regexes
+
+
+class TestPrecompiledRegexes(unittest.TestCase):
+    PATTERNS = (
+        r'https?://(?:www\.)?example\.com/(?P<id>\d+)',
+        r'(?x)https?://example\.(?P<tld>com|net)/ (?P<id>[^/?\#]+)',
+        r'(?i)https?://[^/]+/(?P<x>a)(?(x)b|c)\1(?P=x)',
+        r'https?://\u00e9xample\.com/(?:[\w\s]+|\W)*$',
+    )
+
+    def test_compile(self):
+        regexes = PrecompiledRegexes(*serialize_regexes(self.PATTERNS))
+        for pattern in self.PATTERNS:
+            self.assertEqual(regexes.compile(pattern), re.compile(pattern))
+        regex = regexes.compile(self.PATTERNS[1])
+        self.assertEqual(regex.match('https://example.net/abc').group('tld', 'id'), ('net', 'abc'))
+        self.assertEqual(regex.groupindex, {'tld': 1, 'id': 2})
+        self.assertEqual(regexes.compile(r'https?://other\.com'), re.compile(r'https?://other\.com'))
+
+    def test_other_version(self):
+        key, data = serialize_regexes(self.PATTERNS)
+        for regexes in (PrecompiledRegexes(None, data), PrecompiledRegexes(key, 'invalid')):
+            self.assertEqual(regexes.compile(self.PATTERNS[0]), re.compile(self.PATTERNS[0]))
+
+    def test_invalid_code(self):
+        pattern = self.PATTERNS[0]
+        key, _ = serialize_regexes(self.PATTERNS)
+        flags, groups, groupindex, indexgroup, code = marshal.loads(
+            zlib.decompress(base64.b64decode(serialize_regexes([pattern])[1])))[pattern]
+        for compiled in (
+            (flags, groups, groupindex, indexgroup),
+            (flags, groups, groupindex, indexgroup, None),
+            (flags, groups, groupindex, indexgroup, code[:-4]),
+            (flags, groups, groupindex, indexgroup, b'\xff' * 3),
+        ):
+            data = base64.encodebytes(zlib.compress(marshal.dumps({pattern: compiled}))).decode()
+            self.assertEqual(PrecompiledRegexes(key, data).compile(pattern), re.compile(pattern))
+
+
+if __name__ == '__main__':
+    unittest.main()
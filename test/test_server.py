@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import io
+import json
+import socket
+import tempfile
+
+from test.helper import FakeYDL
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.server import JobServer
+from yt_dlp.utils import ExtractorError
+
+
+class ServerTestIE(InfoExtractor):
+    _VALID_URL = r'server:(?P<id>\w+)'
+
+    def _real_extract(self, url):
+        video_id = self._match_id(url)
+        if video_id == 'broken':
+            raise ExtractorError('This video is broken', expected=True)
+        return {
+            'id': video_id,
+            'title': self._downloader.params.get('server_test_title', video_id),
+            'formats': [{'format_id': fmt, 'url': f'https://example.com/{fmt}.mp4', 'ext': 'mp4'}
+                        for fmt in ('low', 'high')],
+        }
+
+
+class TestJobServer(unittest.TestCase):
+    def setUp(self):
+        self.ydl = FakeYDL({'format': 'high'})
+        self.ydl.add_info_extractor(ServerTestIE())
+        self.server = JobServer(self.ydl)
+
+    def run_jobs(self, *jobs):
+        output = io.StringIO()
+        self.server.handle(io.StringIO(''.join(
+            f'{job}\n' if isinstance(job, str) else json.dumps(job) + '\n' for job in jobs)), output.write)
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_job(self):
+        responses = self.run_jobs({'id': 1, 'urls': ['server:a', 'server:b']}, {'id': 2, 'url': 'server:c'})
+        self.assertEqual([(r['id'], r['type'], r.get('url')) for r in responses], [
+            (1, 'info', 'server:a'), (1, 'info', 'server:b'), (1, 'done', None),
+            (2, 'info', 'server:c'), (2, 'done', None)])
+        self.assertEqual(responses[0]['info']['id'], 'a')
+        self.assertEqual(responses[0]['info']['format_id'], 'high')
+        self.assertEqual(responses[2]['retcode'], 0)
+
+    def test_errors(self):
+        responses = self.run_jobs({'id': 1, 'urls': ['server:broken', 'server:a']}, 'not json', {'id': 3}, [])
+        self.assertEqual([(r['id'], r['type']) for r in responses], [
+            (1, 'error'), (1, 'info'), (1, 'done'),
+            (None, 'error'), (None, 'done'),
+            (3, 'error'), (3, 'done'),
+            (None, 'error'), (None, 'done')])
+        self.assertIn('This video is broken', responses[0]['error'])
+        self.assertEqual(responses[2]['retcode'], 1)
+        self.assertEqual(responses[4]['retcode'], 2)
+
+    def test_params(self):
+        responses = self.run_jobs(
+            {'id': 1, 'url': 'server:a', 'params': {'format': 'low', 'server_test_title': 'changed'}},
+            {'id': 2, 'url': 'server:a'},
+            {'id': 3, 'url': 'server:a', 'params': {'proxy': 'http://127.0.0.1:3128'}})
+        self.assertEqual(responses[0]['info']['format_id'], 'low')
+        self.assertEqual(responses[0]['info']['title'], 'changed')
+        self.assertEqual(responses[2]['info']['format_id'], 'high')
+        self.assertEqual(responses[2]['info']['title'], 'a')
+        self.assertNotIn('server_test_title', self.ydl.params)
+        self.assertEqual(responses[4]['type'], 'error')
+        self.assertIn('proxy', responses[4]['error'])
+
+    def test_max_downloads(self):
+        job = {'urls': ['server:a', 'server:b', 'server:c'], 'download': True,
+               'params': {'simulate': True, 'max_downloads': 2}}
+        responses = self.run_jobs({'id': 1, **job}, {'id': 2, **job})
+        self.assertEqual([(r['id'], r['type'], r.get('url')) for r in responses], [
+            (1, 'info', 'server:a'), (1, 'error', 'server:b'), (1, 'done', None),
+            (2, 'info', 'server:a'), (2, 'error', 'server:b'), (2, 'done', None)])
+        self.assertEqual(responses[2]['retcode'], 101)
+        self.assertEqual(responses[5]['retcode'], 101)
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets are not supported')
+    def test_unix_socket_path_exists(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'archive.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('youtube abc\n')
+            with self.assertRaisesRegex(OSError, 'not a socket'):
+                self.server.serve_unix_socket(path)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), 'youtube abc\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from test.helper import FakeYDL
+from yt_dlp.extractor import gen_extractor_classes
+from yt_dlp.extractor._url_index import (
+    ExtractorIndex,
+    build_url_index,
+    url_host_tokens,
+    valid_url_tokens,
+)
+from yt_dlp.extractor.common import InfoExtractor
+
+
+class TestURLIndex(unittest.TestCase):
+    def test_url_host_tokens(self):
+        self.assertEqual(url_host_tokens('https://www.YouTube.com/watch?v=x'), {'www', 'youtube', 'com'})
+        self.assertEqual(url_host_tokens('//user@m.example-site.co.uk:8080'), {'user', 'm', 'example-site', 'co', 'uk', '8080'})
+        self.assertEqual(url_host_tokens('http://example.com?x=a.b'), {'example', 'com', 'x', 'a', 'b'})
+        self.assertIsNone(url_host_tokens('ytsearch:example'))
+        self.assertIsNone(url_host_tokens('example.com/video'))
+
+    def test_valid_url_tokens(self):
+        def tokens(valid_url):
+            result = valid_url_tokens(valid_url)
+            return result and sorted({tuple(sorted(tokens)) for tokens in result})
+
+        self.assertEqual(tokens(r'https?://(?:www\.)?example\.com/(?P<id>\d+)'), [
+            ('com', 'example'), ('com', 'example', 'www')])
+        self.assertEqual(tokens(r'https?://(?:[^/]+\.)?example\.(?:com|net)(?:[/?#]|$)'), [
+            ('com', 'example'), ('example', 'net')])
+        self.assertEqual(tokens((r'https://a\.example\.com/', r'https://b\.example\.org/')), [
+            ('a', 'com', 'example'), ('b', 'example', 'org')])
+        # Only complete words
+        self.assertEqual(tokens(r'https?://\w+video\.example\.com/'), [('com', 'example')])
+        self.assertEqual(tokens(r'https?://example\.(?:\w+)'), [('example',)])
+        self.assertEqual(tokens(r'https?://example\.com'), [('example',)])
+        # Not in the host
+        self.assertEqual(tokens(r'https?://[^/]+/example\.com'), None)
+        self.assertEqual(tokens(r'https?://.*example\.com'), None)
+        self.assertEqual(tokens(r'(?:https?://)?example\.com'), None)
+        self.assertEqual(tokens(r'ytsearch:example'), None)
+        self.assertEqual(tokens(False), [])
+
+    def test_build_url_index(self):
+        class TestIE(InfoExtractor):
+            _VALID_URL = r'https?://(?:www\.)?(?:example|test)\.com/'
+
+        class OverriddenIE(InfoExtractor):
+            _VALID_URL = r'https?://overridden\.com/'
+
+            @classmethod
+            def suitable(cls, url):
+                return super().suitable(url)
+
+        class NeverIE(InfoExtractor):
+            _VALID_URL = False
+
+        class AlwaysIE(InfoExtractor):
+            _VALID_URL = r'.*'
+
+        self.assertEqual(build_url_index([TestIE, OverriddenIE, NeverIE, AlwaysIE]), {
+            '': ('Never',),
+            'example': ('Test',),
+            'test': ('Test',),
+        })
+
+    def test_candidates(self):
+        ies = {ie.ie_key(): ie for ie in gen_extractor_classes()}
+        index = ExtractorIndex(ies, build_url_index(ies.values()))
+        urls = [tc['url'] for ie in ies.values() for tc in ie.get_testcases(include_onlymatching=True)]
+        for url in urls[::40]:
+            with self.subTest(url=url):
+                expected = next((ie_key for ie_key, ie in ies.items() if ie.suitable(url)), None)
+                self.assertEqual(next((ie_key for ie_key, ie in index.candidates(url) if ie.suitable(url)), None), expected)
+
+    def test_youtubedl(self):
+        ydl = FakeYDL()
+        ydl.add_default_info_extractors()
+        keys = list(ydl._ies)
+        for url in ('https://www.youtube.com/watch?v=BaW_jenozKc', 'https://vimeo.com/56015672', 'ytsearch:test'):
+            candidates = [ie_key for ie_key, _ in ydl._suitable_ie_candidates(url)]
+            self.assertEqual(candidates, sorted(candidates, key=keys.index))
+            self.assertEqual(
+                next(ie_key for ie_key in candidates if ydl._ies[ie_key].suitable(url)),
+                next(ie_key for ie_key, ie in ydl._ies.items() if ie.suitable(url)))
+        self.assertEqual(list(ydl._suitable_ie_candidates('https://vimeo.com/1', 'Generic')), [('Generic', ydl._ies['Generic'])])
+        self.assertEqual(list(ydl._suitable_ie_candidates('https://vimeo.com/1', 'Unknown')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
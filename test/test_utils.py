@@ -26,6 +26,7 @@
     Config,
     DateRange,
     ExtractorError,
+    FlatEntry,
     InAdvancePagedList,
     LazyList,
     NO_DEFAULT,
@@ -1933,6 +1934,31 @@ def test(ll, idx, val, cache):
         ll = reversed(ll)
         test(ll, -15, 14, range(15))
 
+    def test_FlatEntry(self):
+        layouts = {}
+        entries = [
+            {'_type': 'url', 'ie_key': 'Test', 'id': str(i), 'url': f'test:{i}', 'channel': ''.join(('chan', 'nel')),
+             'duration': None, 'tags': ['a', str(i)]}
+            for i in range(3)]
+        compact = [FlatEntry.compact(entry, layouts) for entry in entries]
+        self.assertEqual(compact, entries)
+        self.assertEqual([list(entry) for entry in compact], [list(entry) for entry in entries])
+        self.assertEqual(compact[1]['url'], 'test:1')
+        self.assertIsNone(compact[1].get('duration'))
+        self.assertNotIn('title', compact[1])
+        self.assertEqual(len(layouts), 1)
+        self.assertIs(compact[1]['channel'], compact[0]['channel'])
+        self.assertEqual(compact[2].copy(), entries[2])
+        self.assertIsInstance(compact[2].copy(), dict)
+        with self.assertRaises(TypeError):
+            compact[0]['id'] = '1'
+
+        self.assertIsInstance(FlatEntry.compact({**entries[0], 'duration': 1}, layouts), FlatEntry)
+        self.assertEqual(len(layouts), 2)
+        # Not flat, or cannot be compacted
+        for entry in ({'id': '1', 'formats': []}, {'_type': 'url', 'url': 'test:1', 'ie_key': ['Test']}):
+            self.assertIs(FlatEntry.compact(entry, layouts), entry)
+
     def test_format_bytes(self):
         self.assertEqual(format_bytes(0), '0.00B')
         self.assertEqual(format_bytes(1000), '1000.00B')
@@ -1,4 +1,5 @@
 import collections
+import concurrent.futures
 import contextlib
 import copy
 import datetime as dt
@@ -19,11 +20,14 @@
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import tokenize
 import traceback
 import unicodedata
 
+from ._startup_profile import startup_phase
+from .archive import SqliteArchive
 from .cache import Cache
 from .compat import urllib  # isort: split
 from .compat import compat_os_name, urllib_req_to_req
@@ -31,10 +35,12 @@
 from .downloader import FFmpegFD, get_suitable_downloader, shorten_protocol_name
 from .downloader.rtmp import rtmpdump_version
 from .extractor import gen_extractor_classes, get_info_extractor
+from .extractor._url_index import ExtractorIndex, get_url_index
 from .extractor.common import UnsupportedURLIE
 from .extractor.openload import PhantomJSwrapper
 from .minicurses import format_text
-from .networking import HEADRequest, Request, RequestDirector
+from .networking import HEADRequest, Request, RequestDirector, _load_request_handlers
+from .networking._cache import HTTPCache
 from .networking.common import _REQUEST_HANDLERS, _RH_PREFERENCES
 from .networking.exceptions import (
     HTTPError,
@@ -47,7 +53,6 @@
 from .plugins import directories as plugin_directories
 from .postprocessor import _PLUGIN_CLASSES as plugin_pps
 from .postprocessor import (
-    EmbedThumbnailPP,
     FFmpegFixupDuplicateMoovPP,
     FFmpegFixupDurationPP,
     FFmpegFixupM3u8PP,
@@ -57,7 +62,6 @@
     FFmpegMergerPP,
     FFmpegPostProcessor,
     FFmpegVideoConvertorPP,
-    MoveFilesAfterDownloadPP,
     get_postprocessor,
 )
 from .postprocessor.ffmpeg import resolve_mapping as resolve_recode_mapping
@@ -86,6 +90,7 @@
     EntryNotInPlaylist,
     ExistingVideoReached,
     ExtractorError,
+    FlatEntry,
     FormatSorter,
     GeoRestrictedError,
     ISO3166Utils,
@@ -234,6 +239,11 @@ class YoutubeDL:
     forcejson:         Force printing info_dict as JSON.
     dump_single_json:  Force printing the info_dict of the whole playlist
                        (or video) as a single JSON line.
+    stream_json:       With dump_single_json, write the entries of the playlist
+                       as soon as they are processed instead of keeping them in memory.
+                       "json" writes a single JSON object with the "entries" first, and
+                       "jsonl" writes each entry on its own line, followed by a line
+                       with the playlist without its entries
     force_write_download_archive: Force writing download archive regardless
                        of 'skip_download' or 'simulate'.
     simulate:          Do not download the video files. If unset (or None),
@@ -281,6 +291,16 @@ class YoutubeDL:
     playlist_items:    Specific indices of playlist to download.
     playlistrandom:    Download playlist items in random order.
     lazy_playlist:     Process playlist entries as they are received.
+    compact_flat_entries: Keep the flat entries of playlists (see extract_flat)
+                       as read-only FlatEntry mappings, which use less memory.
+                       They are converted to dicts before the "playlist"
+                       postprocessors are run
+    concurrent_entries: Number of playlist entries to extract concurrently.
+                       Entries are still processed and downloaded in order.
+                       Each worker thread has its own extractor instances
+    concurrent_urls:   Number of URLs to extract concurrently in download()
+                       and extract_info_many(). The URLs are still processed
+                       and downloaded in order
     matchtitle:        Download only matching titles.
     rejecttitle:       Reject downloads for matching titles.
     logger:            Log messages to a logging.Logger instance.
@@ -314,6 +334,9 @@ class YoutubeDL:
     skip_download:     Skip the actual download of the video file
     cachedir:          Location of the cache files in the filesystem.
                        False to disable filesystem cache.
+    http_cache:        Store the responses to the requests made by the extractors
+                       in the cache directory, and revalidate them when they are reused
+    http_cache_size:   Maximum size of the HTTP cache in bytes (default: 100MiB)
     noplaylist:        Download single video instead of a playlist if in doubt.
     age_limit:         An integer representing the user's age in years.
                        Unsuitable videos for the given age are skipped.
@@ -328,6 +351,10 @@ class YoutubeDL:
                        downloaded. None for no limit.
     download_archive:  A set, or the name of a file where all downloads are recorded.
                        Videos already present in the file are not downloaded again.
+                       Files ending in .sqlite, .sqlite3 or .db are used as an
+                       SQLite database instead of a text file
+    download_archive_import: Name of a text archive file whose entries are
+                       added to the SQLite download_archive before use
     break_on_existing: Stop the download process after attempting to download a
                        file that is in the archive.
     break_per_url:     Whether break_on_reject and break_on_existing
@@ -337,6 +364,8 @@ class YoutubeDL:
                        name/path from where cookies are loaded, the name of the keyring,
                        and the container name, e.g. ('chrome', ) or
                        ('vivaldi', 'default', 'BASICTEXT') or ('firefox', 'default', None, 'Meta')
+    cache_browser_cookies: Store the decrypted cookies from cookiesfrombrowser in the
+                       cache directory, and reuse them until the browser's cookie database changes
     legacyserverconnect: Explicitly allow HTTPS connection to servers that do not
                        support RFC 5746 secure renegotiation
     nocheckcertificate:  Do not verify SSL certificates
@@ -497,7 +526,8 @@ class YoutubeDL:
     nopart, updatetime, buffersize, ratelimit, throttledratelimit, min_filesize,
     max_filesize, test, noresizebuffer, retries, file_access_retries, fragment_retries,
     continuedl, xattr_set_filesize, hls_use_mpegts, http_chunk_size,
-    external_downloader_args, concurrent_fragment_downloads, progress_delta.
+    external_downloader_args, concurrent_fragment_downloads, progress_delta,
+    fragment_memory_limit, fragment_reorder_window, fragment_engine.
 
     The following options are used by the post processors:
     ffmpeg_location:   Location of the ffmpeg/avconv binary; either the path
@@ -625,9 +655,15 @@ def __init__(self, params=None, auto_init=True):
         self.params = params
         self._ies = {}
         self._ies_instances = {}
+        self._ie_index = None
         self._pps = {k: [] for k in POSTPROCESS_WHEN}
         self._printed_messages = set()
+        self._thread_output = threading.local()
+        self._prefetched_extractions = {}
+        self._json_stream = None
         self._first_webpage_request = True
+        # Concurrent extractions (see --concurrent-urls) take turns to sleep between requests
+        self._request_sleep_lock = threading.Lock()
         self._post_hooks = []
         self._progress_hooks = []
         self._postprocessor_hooks = []
@@ -638,6 +674,7 @@ def __init__(self, params=None, auto_init=True):
         self._playlist_urls = set()
         self.cache = Cache(self)
         self.__header_cookies = []
+        self.__serialized_cookies = ((), None)
 
         stdout = sys.stderr if self.params.get('logtostderr') else sys.stdout
         self._out_files = Namespace(
@@ -817,6 +854,15 @@ def preload_download_archive(fn):
             elif not is_path_like(fn):
                 return fn
 
+            if SqliteArchive.is_sqlite_archive(fn):
+                self.write_debug(f'Opening SQLite archive {fn!r}')
+                archive = SqliteArchive(fn)
+                import_fn = self.params.get('download_archive_import')
+                if import_fn:
+                    self.to_screen(f'Importing archive file {import_fn!r}')
+                    self.to_screen(f'Added {archive.import_text(import_fn)} entries to {fn!r}')
+                return archive
+
             self.write_debug(f'Loading archive file {fn!r}')
             try:
                 with locked_file(fn, 'r', encoding='utf-8') as archive_file:
@@ -847,6 +893,8 @@ def warn_if_short_id(self, argv):
     def add_info_extractor(self, ie):
         """Add an InfoExtractor object to the end of the list."""
         ie_key = ie.ie_key()
+        if ie_key not in self._ies:
+            self._ie_index = None
         self._ies[ie_key] = ie
         if not isinstance(ie, type):
             self._ies_instances[ie_key] = ie
@@ -864,6 +912,17 @@ def get_info_extractor(self, ie_key):
             self.add_info_extractor(ie)
         return ie
 
+    def _suitable_ie_candidates(self, url, ie_key=None):
+        """Yield the (ie_key, ie) pairs that may be suitable for the URL, in order"""
+        if ie_key:
+            if ie_key in self._ies:
+                yield ie_key, self._ies[ie_key]
+            return
+        if self._ie_index is None:
+            self._ie_index = ExtractorIndex(self._ies, get_url_index())
+        yield from self._ie_index.candidates(url)
+
+    @startup_phase
     def add_default_info_extractors(self):
         """
         Add the InfoExtractors returned by gen_extractors to the end of the list
@@ -917,12 +976,23 @@ def _bidi_workaround(self, message):
         return res[:-len('\n')]
 
     def _write_string(self, message, out=None, only_once=False):
+        buffered = getattr(self._thread_output, 'messages', None)
+        if buffered is not None:
+            buffered.append((self._write_string, (message, out, only_once)))
+            return
         if only_once:
             if message in self._printed_messages:
                 return
             self._printed_messages.add(message)
         write_string(message, out=out, encoding=self.params.get('encoding'))
 
+    def _to_logger(self, level, message):
+        buffered = getattr(self._thread_output, 'messages', None)
+        if buffered is not None:
+            buffered.append((self._to_logger, (level, message)))
+            return
+        getattr(self.params['logger'], level)(message)
+
     def to_stdout(self, message, skip_eol=False, quiet=None):
         """Print message to stdout"""
         if quiet is not None:
@@ -936,7 +1006,7 @@ def to_stdout(self, message, skip_eol=False, quiet=None):
     def to_screen(self, message, skip_eol=False, quiet=None, only_once=False):
         """Print message to screen if not in quiet mode"""
         if self.params.get('logger'):
-            self.params['logger'].debug(message)
+            self._to_logger('debug', message)
             return
         if (self.params.get('quiet') if quiet is None else quiet) and not self.params.get('verbose'):
             return
@@ -948,7 +1018,7 @@ def to_stderr(self, message, only_once=False):
         """Print message to stderr"""
         assert isinstance(message, str)
         if self.params.get('logger'):
-            self.params['logger'].error(message)
+            self._to_logger('error', message)
         else:
             self._write_string(f'{self._bidi_workaround(message)}\n', self._out_files.error, only_once=only_once)
 
@@ -993,7 +1063,17 @@ def __exit__(self, *args):
 
     def close(self):
         self.save_cookies()
+        if isinstance(self.archive, SqliteArchive):
+            self.archive.close()
         if '_request_director' in self.__dict__:
+            tls_stats = self._request_director.tls_stats()
+            if tls_stats['handshakes']:
+                self.write_debug(
+                    'TLS handshakes: {handshakes} ({resumed_handshakes} resumed) in {handshake_time:.2f}s'.format(**tls_stats))
+            if self._request_director.http_cache:
+                self.write_debug(
+                    'HTTP cache: {hits} hits, {revalidated} revalidated, {misses} misses'.format(
+                        **self._request_director.http_cache.stats()))
             self._request_director.close()
             del self._request_director
 
@@ -1069,7 +1149,7 @@ def report_warning(self, message, only_once=False):
         If stderr is a tty file the 'WARNING:' will be colored
         """
         if self.params.get('logger') is not None:
-            self.params['logger'].warning(message)
+            self._to_logger('warning', message)
         else:
             if self.params.get('no_warnings'):
                 return
@@ -1081,7 +1161,7 @@ def deprecation_warning(self, message, *, stacklevel=0):
 
     def deprecated_feature(self, message):
         if self.params.get('logger') is not None:
-            self.params['logger'].warning(f'Deprecated Feature: {message}')
+            self._to_logger('warning', f'Deprecated Feature: {message}')
         self.to_stderr(f'{self._format_err("Deprecated Feature:", self.Styles.ERROR)} {message}', True)
 
     def report_error(self, message, *args, **kwargs):
@@ -1097,7 +1177,7 @@ def write_debug(self, message, only_once=False):
             return
         message = f'[debug] {message}'
         if self.params.get('logger'):
-            self.params['logger'].debug(message)
+            self._to_logger('debug', message)
         else:
             self.to_stderr(message, only_once)
 
@@ -1323,6 +1403,8 @@ def filename_sanitizer(key, value, restricted=self.params.get('restrictfilenames
         def _dumpjson_default(obj):
             if isinstance(obj, (set, LazyList)):
                 return list(obj)
+            elif isinstance(obj, FlatEntry):
+                return dict(obj)
             return repr(obj)
 
         class _ReplacementFormatter(string.Formatter):
@@ -1592,12 +1674,7 @@ def extract_info(self, url, download=True, ie_key=None, extra_info=None,
         if not ie_key and force_generic_extractor:
             ie_key = 'Generic'
 
-        if ie_key:
-            ies = {ie_key: self._ies[ie_key]} if ie_key in self._ies else {}
-        else:
-            ies = self._ies
-
-        for key, ie in ies.items():
+        for key, ie in self._suitable_ie_candidates(url, ie_key):
             if not ie.suitable(url):
                 continue
 
@@ -1618,6 +1695,27 @@ def extract_info(self, url, download=True, ie_key=None, extra_info=None,
             self.report_error(f'No suitable extractor{format_field(ie_key, None, " (%s)")} found for URL {url}',
                               tb=False if extractors_restricted else None)
 
+    def extract_info_many(self, urls, workers=None, ordered=True, download=True, ie_key=None, **kwargs):
+        """
+        Extract the information dictionaries of many URLs, running up to `workers` extractors at once
+
+        Only the extractors run concurrently. The results are processed (and downloaded)
+        one at a time by extract_info, so the errors are handled in the same way.
+        Yields (url, info_dict) tuples; info_dict is None if the error was ignored
+
+        @param urls         URLs to extract
+        @param workers      Number of concurrent extractions. Defaults to the "concurrent_urls" param
+        @param ordered      Whether to yield the results in the order of the URLs, rather than
+                            in the order that the extractions finish
+        Other arguments are the same as for extract_info
+        """
+        workers = workers or self.params.get('concurrent_urls') or 1
+        if workers > 1:
+            urls = self.__prefetch(
+                urls, workers, lambda pool, url: self.__start_prefetch_url(pool, url, ie_key), ordered=ordered)
+        for url in urls:
+            yield url, self.extract_info(url, download=download, ie_key=ie_key, **kwargs)
+
     def _handle_extraction_exceptions(func):
         @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
@@ -1758,7 +1856,7 @@ def __extract_info(self, url, ie, download, extra_info, process):
         self._apply_header_cookies(url)
 
         try:
-            ie_result = ie.extract(url)
+            ie_result = self.__extract_or_use_prefetched(url, ie)
         except UserNotLive as e:
             if process:
                 if self.params.get('wait_for_video'):
@@ -2024,17 +2122,26 @@ def __process_playlist(self, ie_result, download):
         keep_resolved_entries = self.params.get('extract_flat') != 'discard'
         if self.params.get('extract_flat') == 'discard_in_playlist':
             keep_resolved_entries = ie_result['_type'] != 'playlist'
+        streaming = self.__start_json_stream(ie_result)
+        if streaming:
+            keep_resolved_entries = False
         if keep_resolved_entries:
             self.write_debug('The information of all playlist entries will be held in memory')
 
+        concurrent_entries = self.params.get('concurrent_entries') or 1
+        if concurrent_entries > 1 and self.params.get('extract_flat') not in ('in_playlist', True):
+            entries = self.__prefetch_entries(entries, concurrent_entries)
+
         failures = 0
         max_failures = self.params.get('skip_playlist_after_errors') or float('inf')
         for i, (playlist_index, entry) in enumerate(entries):
             if lazy:
-                resolved_entries.append((playlist_index, entry))
+                resolved_entries.append((playlist_index, None if streaming else entry))
             if not entry:
                 continue
 
+            if isinstance(entry, FlatEntry):
+                entry = dict(entry)
             entry['__x_forwarded_for_ip'] = ie_result.get('__x_forwarded_for_ip')
             if not lazy and 'playlist-index' in self.params['compat_opts']:
                 playlist_index = ie_result['requested_entries'][i]
@@ -2065,8 +2172,10 @@ def __process_playlist(self, ie_result, download):
                 self.report_error(
                     f'Skipping the remaining entries in playlist "{title}" since {failures} items failed extraction')
                 break
+            if streaming:
+                self.__write_json_stream_entry(entry_result)
             if keep_resolved_entries:
-                resolved_entries[i] = (playlist_index, entry_result)
+                resolved_entries[i] = (playlist_index, all_entries.compact(entry_result))
 
         # Update with processed data
         ie_result['entries'] = [e for _, e in resolved_entries if e is not NO_DEFAULT]
@@ -2081,6 +2190,9 @@ def __process_playlist(self, ie_result, download):
                 self.prepare_filename(ie_copy, 'pl_infojson'), overwrite=True) is None:
             return
 
+        if all_entries.is_compact and self._pps['playlist']:
+            # The postprocessors may modify the entries
+            ie_result['entries'] = [dict(e) if isinstance(e, FlatEntry) else e for e in ie_result['entries']]
         ie_result = self.run_all_pps('playlist', ie_result)
         self.to_screen(f'[download] Finished downloading playlist: {title}')
         return ie_result
@@ -2090,6 +2202,97 @@ def __process_iterable_entry(self, entry, download, extra_info):
         return self.process_ie_result(
             entry, download=download, extra_info=extra_info)
 
+    def __prefetch(self, items, workers, start_prefetch, ordered=True):
+        """
+        Extract upcoming items in the background while the current item is processed
+
+        start_prefetch(pool, item) starts the extraction of an item and returns its key,
+        or None if it is not prefetched. Unless ordered is set, the items are yielded
+        as soon as their extraction is finished
+        """
+        pending, prefetched = collections.deque(), []
+        items = iter(items)
+        # cached_property has no lock since Python 3.12, so these must not be built in the workers
+        self.cookiejar, self._request_director  # noqa: B018
+        pool = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='yt-dlp-entry')
+        try:
+            while True:
+                for item in itertools.islice(items, max(2 * workers - len(pending), 0)):
+                    key = start_prefetch(pool, item)
+                    pending.append((item, key))
+                    prefetched.append(key)
+                if not pending:
+                    return
+                index = 0 if ordered else self.__first_prefetched(pending)
+                item, _ = pending[index]
+                del pending[index]
+                yield item
+        finally:
+            for key in filter(None, prefetched):
+                future = self._prefetched_extractions.pop(key, None)
+                if future:
+                    future.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def __first_prefetched(self, pending):
+        """Index of the first pending item that is ready to be processed, waiting for one if needed"""
+        futures = [self._prefetched_extractions.get(key) if key else None for _, key in pending]
+        if None in futures:
+            return futures.index(None)
+        concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+        return next(index for index, future in enumerate(futures) if future.done())
+
+    def __prefetch_entries(self, entries, workers):
+        return self.__prefetch(entries, workers, lambda pool, item: self.__start_prefetch(pool, item[1]))
+
+    def __start_prefetch(self, pool, entry):
+        if not isinstance(entry, dict) or entry.get('_type') not in ('url', 'url_transparent'):
+            return
+        url = sanitize_url(entry['url'], scheme='http' if self.params.get('prefer_insecure') else 'https')
+        return self.__start_prefetch_url(pool, url, entry.get('ie_key'))
+
+    def __start_prefetch_url(self, pool, url, ie_key=None):
+        key, ie = next((
+            (key, ie) for key, ie in self._suitable_ie_candidates(url, ie_key if ie_key in self._ies else None)
+            if ie.suitable(url)), (None, None))
+        if ie is None:
+            return
+        temp_id = ie.get_temp_id(url)
+        if (url, key) in self._prefetched_extractions or (
+                temp_id is not None and self.in_download_archive({'id': temp_id, 'ie_key': key})):
+            return
+        self._apply_header_cookies(url)
+        self._prefetched_extractions[(url, key)] = pool.submit(
+            self.__extract_buffering_output, type(self.get_info_extractor(key)), url)
+        return url, key
+
+    def __extract_buffering_output(self, ie_class, url):
+        # Extractors keep state between calls, so each worker thread has its own instances
+        ies = getattr(self._thread_output, 'ies', None)
+        if ies is None:
+            ies = self._thread_output.ies = {}
+        ie = ies.get(ie_class)
+        if ie is None:
+            ie = ies[ie_class] = ie_class(self)
+        self._thread_output.messages = messages = []
+        try:
+            return messages, ie.extract(url), None
+        except Exception as e:
+            return messages, None, e
+        finally:
+            del self._thread_output.messages
+
+    def __extract_or_use_prefetched(self, url, ie):
+        future = self._prefetched_extractions.pop((url, ie.ie_key()), None)
+        if future is None:
+            return ie.extract(url)
+        messages, ie_result, error = future.result()
+        for func, args in messages:
+            func(*args)
+        if error:
+            raise error
+        return ie_result
+
     def _build_format_filter(self, filter_spec):
         " Returns a function to filter the formats according to the filter_spec "
 
@@ -2564,6 +2767,31 @@ def restore_last_token(self):
         parsed_selector = _parse_format_selection(iter(TokenIterator(tokens)))
         return _build_selector_function(parsed_selector)
 
+    def _serialize_cookies(self, cookies):
+        # All the formats of a video usually have the same cookies
+        last_cookies, serialized = self.__serialized_cookies
+        if cookies == last_cookies:
+            return serialized
+
+        encoder = LenientSimpleCookie()
+        values = []
+        for cookie in cookies:
+            _, value = encoder.value_encode(cookie.value)
+            values.append(f'{cookie.name}={value}')
+            if cookie.domain:
+                values.append(f'Domain={cookie.domain}')
+            if cookie.path:
+                values.append(f'Path={cookie.path}')
+            if cookie.secure:
+                values.append('Secure')
+            if cookie.expires:
+                values.append(f'Expires={cookie.expires}')
+            if cookie.version:
+                values.append(f'Version={cookie.version}')
+        serialized = '; '.join(values)
+        self.__serialized_cookies = cookies, serialized
+        return serialized
+
     def _calc_headers(self, info_dict, load_cookies=False):
         res = HTTPHeaderDict(self.params['http_headers'], info_dict.get('http_headers'))
         clean_headers(res)
@@ -2574,24 +2802,9 @@ def _calc_headers(self, info_dict, load_cookies=False):
         # The `Cookie` header is removed to prevent leaks and unscoped cookies.
         # See: https://github.com/yt-dlp/yt-dlp/security/advisories/GHSA-v8mc-9377-rwjj
         res.pop('Cookie', None)
-        cookies = self.cookiejar.get_cookies_for_url(info_dict['url'])
+        cookies = tuple(self.cookiejar.get_cookies_for_url(info_dict['url']))
         if cookies:
-            encoder = LenientSimpleCookie()
-            values = []
-            for cookie in cookies:
-                _, value = encoder.value_encode(cookie.value)
-                values.append(f'{cookie.name}={value}')
-                if cookie.domain:
-                    values.append(f'Domain={cookie.domain}')
-                if cookie.path:
-                    values.append(f'Path={cookie.path}')
-                if cookie.secure:
-                    values.append('Secure')
-                if cookie.expires:
-                    values.append(f'Expires={cookie.expires}')
-                if cookie.version:
-                    values.append(f'Version={cookie.version}')
-            info_dict['cookies'] = '; '.join(values)
+            info_dict['cookies'] = self._serialize_cookies(cookies)
 
         if 'X-Forwarded-For' not in res:
             x_forwarded_for_ip = info_dict.get('__x_forwarded_for_ip')
@@ -3358,7 +3571,7 @@ def _write_link_file(link_type):
             info_dict['filepath'] = temp_filename
             info_dict['__finaldir'] = os.path.dirname(os.path.abspath(encodeFilename(full_filename)))
             info_dict['__files_to_move'] = files_to_move
-            replace_info_dict(self.run_pp(MoveFilesAfterDownloadPP(self, False), info_dict))
+            replace_info_dict(self.run_pp(get_postprocessor('MoveFilesAfterDownload')(self, False), info_dict))
             info_dict['__write_download_archive'] = self.params.get('force_write_download_archive')
         else:
             # Download
@@ -3391,7 +3604,7 @@ def existing_video_file(*filepaths):
                                 and info_dict.get('thumbnails')
                                 # check with type instead of pp_key, __name__, or isinstance
                                 # since we dont want any custom PPs to trigger this
-                                and any(type(pp) == EmbedThumbnailPP for pp in self._pps['post_process'])):  # noqa: E721
+                                and any(type(pp) == get_postprocessor('EmbedThumbnail') for pp in self._pps['post_process'])):  # noqa: E721
                             info_dict['ext'] = 'mkv'
                             self.report_warning(
                                 'webm doesn\'t support embedding a thumbnail, mkv will be used')
@@ -3578,6 +3791,8 @@ def ffmpeg_fixup(cndn, msg, cls):
     def __download_wrapper(self, func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            if self.params.get('dump_single_json') and self.params.get('stream_json'):
+                self._json_stream = {'format': self.params['stream_json'], 'playlist': None, 'count': 0}
             try:
                 res = func(*args, **kwargs)
             except UnavailableVideoError as e:
@@ -3590,9 +3805,54 @@ def wrapper(*args, **kwargs):
             else:
                 if self.params.get('dump_single_json', False):
                     self.post_extract(res)
-                    self.to_stdout(json.dumps(self.sanitize_info(res)))
+                    if not self.__finish_json_stream(res):
+                        self.to_stdout(json.dumps(self.sanitize_info(res)))
+            finally:
+                self.__finish_json_stream()
         return wrapper
 
+    def __start_json_stream(self, ie_result):
+        """Start streaming the entries of the playlist if it is the one being dumped; see stream_json"""
+        stream = self._json_stream
+        if not stream or stream['playlist'] is not None:
+            return False
+        stream['playlist'] = ie_result
+        if stream['format'] == 'json':
+            self._write_string('{"entries": [', self._out_files.out)
+        return True
+
+    def __write_json_stream_entry(self, entry):
+        stream = self._json_stream
+        self.post_extract(entry)
+        if entry is not None:
+            # As in the dump of the whole playlist, only the playlist itself gets these defaults
+            missing = {'epoch', '_type', '_version'} - entry.keys()
+            entry = {k: v for k, v in self.sanitize_info(entry.copy()).items() if k not in missing}
+        entry = json.dumps(entry)
+        if stream['format'] == 'jsonl':
+            self.to_stdout(entry)
+        else:
+            self._write_string(f'{", " if stream["count"] else ""}{entry}', self._out_files.out)
+        stream['count'] += 1
+
+    def __finish_json_stream(self, result=None):
+        """
+        Write the playlist whose entries were streamed, without its entries
+
+        @returns    Whether the entries of a playlist were being streamed
+        """
+        stream, self._json_stream = self._json_stream, None
+        if not stream or stream['playlist'] is None:
+            return False
+        # If the playlist was not finished, the information from its start is written
+        playlist = {k: v for k, v in (result or stream['playlist']).items() if k != 'entries'}
+        playlist = json.dumps(self.sanitize_info(playlist))
+        if stream['format'] == 'jsonl':
+            self.to_stdout(playlist)
+        else:
+            self.to_stdout(f'], {playlist[1:]}' if playlist != '{}' else ']}')
+        return True
+
     def download(self, url_list):
         """Download a given list of URLs."""
         url_list = variadic(url_list)  # Passing a single URL is a common mistake
@@ -3603,6 +3863,11 @@ def download(self, url_list):
                 and self.params.get('max_downloads') != 1):
             raise SameFileError(outtmpl)
 
+        workers = self.params.get('concurrent_urls') or 1
+        if workers > 1:
+            ie_key = 'Generic' if self.params.get('force_generic_extractor') else None
+            url_list = self.__prefetch(
+                url_list, workers, lambda pool, url: self.__start_prefetch_url(pool, url, ie_key))
         for url in url_list:
             self.__download_wrapper(self.extract_info)(
                 url, force_generic_extractor=self.params.get('force_generic_extractor', False))
@@ -3655,7 +3920,7 @@ def sanitize_info(info_dict, remove_private_keys=False):
             reject = lambda k, v: False
 
         def filter_fn(obj):
-            if isinstance(obj, dict):
+            if isinstance(obj, (dict, FlatEntry)):
                 return {k: filter_fn(v) for k, v in obj.items() if not reject(k, v)}
             elif isinstance(obj, (list, tuple, set, LazyList)):
                 return list(map(filter_fn, obj))
@@ -3690,6 +3955,8 @@ def actual_post_extract(info_dict):
                     actual_post_extract(video_dict or {})
                 return
 
+            if isinstance(info_dict, FlatEntry):
+                return
             post_extractor = info_dict.pop('__post_extractor', None) or dict
             info_dict.update(post_extractor())
 
@@ -3741,7 +4008,7 @@ def post_process(self, filename, info, files_to_move=None):
         info['filepath'] = filename
         info['__files_to_move'] = files_to_move or {}
         info = self.run_all_pps('post_process', info, additional_pps=info.get('__postprocessors'))
-        info = self.run_pp(MoveFilesAfterDownloadPP(self), info)
+        info = self.run_pp(get_postprocessor('MoveFilesAfterDownload')(self), info)
         del info['__files_to_move']
         return self.run_all_pps('after_move', info)
 
@@ -3757,7 +4024,7 @@ def _make_archive_id(self, info_dict):
             if not url:
                 return
             # Try to find matching extractor for the URL and take its ie_key
-            for ie_key, ie in self._ies.items():
+            for ie_key, ie in self._suitable_ie_candidates(url):
                 if ie.suitable(url):
                     extractor = ie_key
                     break
@@ -3781,7 +4048,7 @@ def record_download_archive(self, info_dict):
         assert vid_id
 
         self.write_debug(f'Adding to archive: {vid_id}')
-        if is_path_like(fn):
+        if is_path_like(fn) and not isinstance(self.archive, SqliteArchive):
             with locked_file(fn, 'a', encoding='utf-8') as archive_file:
                 archive_file.write(vid_id + '\n')
         self.archive.add(vid_id)
@@ -4205,6 +4472,7 @@ def urlopen(self, req):
                     'Try using --legacy-server-connect', cause=e) from e
             raise
 
+    @startup_phase
     def build_request_director(self, handlers, preferences=None):
         logger = _YDLLogger(self)
         headers = self.params['http_headers'].copy()
@@ -4221,6 +4489,7 @@ def build_request_director(self, handlers, preferences=None):
                 proxies=proxies,
                 prefer_system_certs='no-certifi' in self.params['compat_opts'],
                 verify=not self.params.get('nocheckcertificate'),
+                tls_session_cache=director.tls_session_cache,
                 **traverse_obj(self.params, {
                     'verbose': 'debug_printtraffic',
                     'source_address': 'source_address',
@@ -4235,6 +4504,9 @@ def build_request_director(self, handlers, preferences=None):
                     },
                 }),
             ))
+        if self.params.get('http_cache') and self.cache.enabled:
+            director.http_cache = HTTPCache(
+                os.path.join(self.cache._get_root_dir(), 'http'), self.params.get('http_cache_size'), self.cookiejar)
         director.preferences.update(preferences or [])
         if 'prefer-legacy-http-handler' in self.params['compat_opts']:
             director.preferences.add(lambda rh, _: 500 if rh.RH_KEY == 'Urllib' else 0)
@@ -4242,6 +4514,7 @@ def build_request_director(self, handlers, preferences=None):
 
     @functools.cached_property
     def _request_director(self):
+        _load_request_handlers()
         return self.build_request_director(_REQUEST_HANDLERS.values(), _RH_PREFERENCES)
 
     def encode(self, s):
@@ -6,6 +6,9 @@
 
 __license__ = 'The Unlicense'
 
+# NB: Must be before other imports so that they can be profiled
+from ._startup_profile import enable_startup_profile, startup_phase  # isort: split
+
 import collections
 import getpass
 import itertools
@@ -14,6 +17,7 @@
 import re
 import traceback
 
+from .archive import SqliteArchive
 from .compat import compat_os_name
 from .cookies import SUPPORTED_BROWSERS, SUPPORTED_KEYRINGS
 from .downloader.external import get_external_downloader
@@ -205,6 +209,8 @@ def validate_minmax(min_val, max_val, min_name, max_name=None):
     validate_positive('autonumber start', opts.autonumber_start)
     validate_positive('autonumber size', opts.autonumber_size, True)
     validate_positive('concurrent fragments', opts.concurrent_fragment_downloads, True)
+    validate_positive('concurrent entries', opts.concurrent_entries, True)
+    validate_positive('concurrent URLs', opts.concurrent_urls, True)
     validate_positive('playlist start', opts.playliststart, True)
     if opts.playlistend != -1:
         validate_minmax(opts.playliststart, opts.playlistend, 'playlist start', 'playlist end')
@@ -299,6 +305,8 @@ def validate_bytes(name, value):
     opts.max_filesize = validate_bytes('max filesize', opts.max_filesize)
     opts.buffersize = validate_bytes('buffer size', opts.buffersize)
     opts.http_chunk_size = validate_bytes('http chunk size', opts.http_chunk_size)
+    opts.http_cache_size = validate_bytes('HTTP cache size', opts.http_cache_size)
+    opts.fragment_memory_limit = validate_bytes('fragment memory limit', opts.fragment_memory_limit)
 
     # Output templates
     def validate_outtmpl(tmpl, msg):
@@ -444,6 +452,10 @@ def metadataparser_actions(f):
 
     if opts.download_archive is not None:
         opts.download_archive = expand_path(opts.download_archive)
+    if opts.download_archive_import is not None:
+        validate(opts.download_archive and SqliteArchive.is_sqlite_archive(opts.download_archive),
+                 'download archive', msg='--import-download-archive requires an SQLite --download-archive')
+        opts.download_archive_import = expand_path(opts.download_archive_import)
 
     if opts.ffmpeg_location is not None:
         opts.ffmpeg_location = expand_path(opts.ffmpeg_location)
@@ -575,6 +587,9 @@ def report_deprecation(val, old, new=None):
         # Do not unnecessarily download audio
         opts.format = 'bestaudio/best'
 
+    if opts.stream_json:
+        opts.dump_single_json = True
+
     if opts.getcomments and opts.writeinfojson is None and not opts.embed_infojson:
         # If JSON is not printed anywhere, but comments are requested, save it to file
         if not opts.dumpjson or opts.print_json or opts.dump_single_json:
@@ -734,6 +749,7 @@ def get_postprocessors(opts):
 ParsedOptions = collections.namedtuple('ParsedOptions', ('parser', 'options', 'urls', 'ydl_opts'))
 
 
+@startup_phase
 def parse_options(argv=None):
     """@returns ParsedOptions(parser, opts, urls, ydl_opts)"""
     parser, opts, urls = parseOpts(argv)
@@ -804,6 +820,7 @@ def parse_options(argv=None):
         'print_to_file': opts.print_to_file,
         'forcejson': opts.dumpjson or opts.print_json,
         'dump_single_json': opts.dump_single_json,
+        'stream_json': opts.stream_json,
         'force_write_download_archive': opts.force_write_download_archive,
         'simulate': (print_only or any_getting or None) if opts.simulate is None else opts.simulate,
         'skip_download': opts.skip_download,
@@ -837,7 +854,9 @@ def parse_options(argv=None):
         'retry_sleep_functions': opts.retry_sleep,
         'skip_unavailable_fragments': opts.skip_unavailable_fragments,
         'keep_fragments': opts.keep_fragments,
+        'fragment_memory_limit': opts.fragment_memory_limit,
         'concurrent_fragment_downloads': opts.concurrent_fragment_downloads,
+        'fragment_engine': opts.fragment_engine,
         'buffersize': opts.buffersize,
         'noresizebuffer': opts.noresizebuffer,
         'http_chunk_size': opts.http_chunk_size,
@@ -851,8 +870,11 @@ def parse_options(argv=None):
         'playlistreverse': opts.playlist_reverse,
         'playlistrandom': opts.playlist_random,
         'lazy_playlist': opts.lazy_playlist,
+        'compact_flat_entries': True,  # The entries are converted back to dicts for the playlist postprocessors
+        'concurrent_entries': opts.concurrent_entries,
+        'concurrent_urls': opts.concurrent_urls,
         'noplaylist': opts.noplaylist,
-        'logtostderr': opts.outtmpl.get('default') == '-',
+        'logtostderr': opts.outtmpl.get('default') == '-' or opts.serve == '-',
         'consoletitle': opts.consoletitle,
         'nopart': opts.nopart,
         'updatetime': opts.updatetime,
@@ -891,15 +913,19 @@ def parse_options(argv=None):
         'max_views': opts.max_views,
         'daterange': opts.date,
         'cachedir': opts.cachedir,
+        'http_cache': opts.http_cache,
+        'http_cache_size': opts.http_cache_size,
         'youtube_print_sig_code': opts.youtube_print_sig_code,
         'age_limit': opts.age_limit,
         'download_archive': opts.download_archive,
+        'download_archive_import': opts.download_archive_import,
         'break_on_existing': opts.break_on_existing,
         'break_on_reject': opts.break_on_reject,
         'break_per_url': opts.break_per_url,
         'skip_playlist_after_errors': opts.skip_playlist_after_errors,
         'cookiefile': opts.cookiefile,
         'cookiesfrombrowser': opts.cookiesfrombrowser,
+        'cache_browser_cookies': opts.cache_browser_cookies,
         'legacyserverconnect': opts.legacy_server_connect,
         'nocheckcertificate': opts.no_check_certificate,
         'prefer_insecure': opts.prefer_insecure,
@@ -962,6 +988,9 @@ def _real_main(argv=None):
 
     parser, opts, all_urls, ydl_opts = parse_options(argv)
 
+    if opts.profile_startup or opts.profile_startup_json:
+        enable_startup_profile(opts.profile_startup_json)
+
     # Dump user agent
     if opts.dump_user_agent:
         ua = traverse_obj(opts.headers, 'User-Agent', casesense=False, default=std_headers['User-Agent'])
@@ -978,7 +1007,7 @@ def _real_main(argv=None):
 
     with YoutubeDL(ydl_opts) as ydl:
         pre_process = opts.update_self or opts.rm_cachedir
-        actual_use = all_urls or opts.load_info_filename
+        actual_use = all_urls or opts.load_info_filename or opts.serve is not None
 
         if opts.rm_cachedir:
             ydl.cache.remove()
@@ -1063,7 +1092,13 @@ def make_row(target, handler):
 
         parser.destroy()
         try:
-            if opts.load_info_filename is not None:
+            if opts.serve is not None:
+                if all_urls:
+                    ydl.report_warning('URLs are ignored due to --serve')
+                from .server import JobServer
+
+                return JobServer(ydl).serve(opts.serve)
+            elif opts.load_info_filename is not None:
                 if all_urls:
                     ydl.report_warning('URLs are ignored due to --load-info-json')
                 return ydl.download_with_info_file(expand_path(opts.load_info_filename))
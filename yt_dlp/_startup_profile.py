@@ -0,0 +1,206 @@
+"""
+Startup profiler, enabled with --profile-startup
+
+Most modules are imported before the options are parsed, so the imports
+are only timed when the option is given on the command line of
+`python -m yt_dlp`, yt_dlp/__main__.py or a yt-dlp executable
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+_profiler = None
+
+
+class _TimedLoader:
+    """Loader that times the module created by another loader"""
+
+    def __init__(self, loader, profiler):
+        self._loader, self._profiler = loader, profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        create_module = getattr(self._loader, 'create_module', None)
+        if create_module is None:
+            return None
+        with self._profiler.time_import(spec.name):
+            return create_module(spec)
+
+    def exec_module(self, module):
+        module.__loader__ = self._loader
+        if getattr(module, '__spec__', None) is not None:
+            module.__spec__.loader = self._loader
+        with self._profiler.time_import(module.__name__):
+            self._loader.exec_module(module)
+
+
+class _ImportTimer:
+    """Meta path finder that wraps the loaders of the modules found by the other finders"""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if hasattr(spec.loader, 'exec_module'):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    def __init__(self, json_file=None):
+        self.json_file = json_file
+        self.start = time.perf_counter()
+        self.imports = {}
+        self.phases = {}
+        self._local = threading.local()
+        self._finder = None
+
+    def install_import_timer(self):
+        if self._finder is None:
+            self._finder = _ImportTimer(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall_import_timer(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    @contextlib.contextmanager
+    def time_import(self, name):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = [0]  # Time spent importing other modules
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+            record = self.imports.setdefault(name, [0, 0])
+            record[0] += elapsed - frame[0]
+            record[1] += elapsed
+
+    @contextlib.contextmanager
+    def time_phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = self.phases.setdefault(name, [0, 0])
+            record[0] += 1
+            record[1] += time.perf_counter() - start
+
+    def report(self):
+        return {
+            'total': time.perf_counter() - self.start,
+            'imports_timed': self._finder is not None,
+            'phases': [
+                {'name': name, 'count': count, 'time': total}
+                for name, (count, total) in sorted(self.phases.items(), key=lambda x: -x[1][1])],
+            'imports': [
+                {'module': name, 'self': own, 'cumulative': cumulative}
+                for name, (own, cumulative) in sorted(self.imports.items(), key=lambda x: -x[1][0])],
+        }
+
+    def format_report(self, report, limit=30):
+        lines = [f'[startup] Profiled {report["total"] * 1000:.1f}ms since profiling started']
+        if report['phases']:
+            lines.append('[startup]      time  calls  phase')
+            lines.extend(
+                f'[startup] {phase["time"] * 1000:7.1f}ms {phase["count"]:6}  {phase["name"]}'
+                for phase in report['phases'])
+        if not report['imports_timed']:
+            lines.append('[startup] Imports were not timed; pass --profile-startup on the command line to time them')
+        elif report['imports']:
+            lines.append(f'[startup] Slowest {min(limit, len(report["imports"]))} of {len(report["imports"])} imports')
+            lines.append('[startup]      self  cumulative  module')
+            lines.extend(
+                f'[startup] {entry["self"] * 1000:7.1f}ms {entry["cumulative"] * 1000:9.1f}ms  {entry["module"]}'
+                for entry in report['imports'][:limit])
+        return '\n'.join(lines)
+
+    def finish(self):
+        self.uninstall_import_timer()
+        report = self.report()
+        if self.json_file:
+            with open(self.json_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        else:
+            sys.stderr.write(self.format_report(report) + '\n')
+
+
+def enable_startup_profile(json_file=None, time_imports=False):
+    """Start profiling if it is not already running, and report the results at exit"""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+        atexit.register(_profiler.finish)
+    if time_imports:
+        _profiler.install_import_timer()
+    if json_file:
+        _profiler.json_file = json_file
+    return _profiler
+
+
+def startup_phase(func):
+    """Decorator that times the function while the startup is being profiled"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _profiler is None:
+            return func(*args, **kwargs)
+        with _profiler.time_phase(func.__qualname__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _enable_from_argv(argv):
+    enabled, json_file = False, None
+    for index, arg in enumerate(argv):
+        if arg == '--':
+            break
+        elif arg == '--profile-startup':
+            enabled = True
+        elif arg == '--profile-startup-json':
+            enabled, json_file = True, argv[index + 1] if index + 1 < len(argv) else None
+        elif arg.startswith('--profile-startup-json='):
+            enabled, json_file = True, arg.partition('=')[2]
+    if enabled:
+        enable_startup_profile(json_file, time_imports=True)
+
+
+def _started_as_cli():
+    """Whether yt-dlp is run as a program, rather than imported by another one"""
+    if getattr(sys, 'frozen', False):
+        return True
+    if sys.argv[:1] == ['-m']:
+        # python -m yt_dlp; runpy imports the package before it sets sys.argv[0]
+        orig_argv = getattr(sys, 'orig_argv', None)  # Python 3.10+
+        if not orig_argv or '-m' not in orig_argv[:-1]:
+            return True
+        return orig_argv[orig_argv.index('-m') + 1] == 'yt_dlp'
+    path = os.path.abspath(getattr(sys.modules.get('__main__'), '__file__', None) or '')
+    return os.path.basename(path) == '__main__.py' and os.path.basename(os.path.dirname(path)) == 'yt_dlp'
+
+
+# Another program's arguments are not ours to read. The `yt-dlp` entry point script
+# cannot be told apart from it here; main() enables the profiler for it, without the imports
+if _started_as_cli():
+    _enable_from_argv(sys.argv[1:])
@@ -1,4 +1,6 @@
 import base64
+import functools
+import struct
 from math import ceil
 
 from .compat import compat_ord
@@ -17,7 +19,7 @@ def aes_gcm_decrypt_and_verify_bytes(data, key, tag, nonce):
 else:
     def aes_cbc_decrypt_bytes(data, key, iv):
         """ Decrypt bytes with AES-CBC using native implementation since pycryptodome is unavailable """
-        return intlist_to_bytes(aes_cbc_decrypt(*map(bytes_to_intlist, (data, key, iv))))
+        return _aes_cbc_decrypt_bytes(data, key, iv)
 
     def aes_gcm_decrypt_and_verify_bytes(data, key, tag, nonce):
         """ Decrypt bytes with AES-GCM using native implementation since pycryptodome is unavailable """
@@ -158,19 +160,116 @@ def aes_cbc_decrypt(data, key, iv):
     @param {int[]} iv          16-Byte IV
     @returns {int[]}           decrypted data
     """
-    expanded_key = key_expansion(key)
-    block_count = int(ceil(float(len(data)) / BLOCK_SIZE_BYTES))
+    return bytes_to_intlist(_aes_cbc_decrypt_bytes(*map(intlist_to_bytes, (data, key, iv))))
 
-    decrypted_data = []
-    previous_cipher_block = iv
-    for i in range(block_count):
-        block = data[i * BLOCK_SIZE_BYTES: (i + 1) * BLOCK_SIZE_BYTES]
-        block += [0] * (BLOCK_SIZE_BYTES - len(block))
 
-        decrypted_block = aes_decrypt(block, expanded_key)
-        decrypted_data += xor(decrypted_block, previous_cipher_block)
-        previous_cipher_block = block
-    return decrypted_data[:len(data)]
+def _aes_cbc_decrypt_bytes(data, key, iv):
+    # Unlike encryption, CBC decryption of every block is independent of the others,
+    # so all the blocks are decrypted at once and then XORed with the previous ones
+    size = len(data)
+    data = bytes(data) + bytes(-size % BLOCK_SIZE_BYTES)
+    round_keys = _decryption_round_keys(bytes(key))
+    if len(data) >= _NUMPY_MIN_SIZE and _numpy_available():
+        decrypted = _aes_decrypt_blocks_numpy(data, round_keys)
+    else:
+        decrypted = _aes_decrypt_blocks(data, round_keys)
+    decrypted = int.from_bytes(decrypted, 'big') ^ int.from_bytes(bytes(iv) + data[:-BLOCK_SIZE_BYTES], 'big')
+    return decrypted.to_bytes(len(data), 'big')[:size]
+
+
+# Below 256 blocks the overhead of creating the arrays outweighs the gain
+_NUMPY_MIN_SIZE = 256 * BLOCK_SIZE_BYTES
+
+
+def _gf_mul(a, b):
+    if a == 0 or b == 0:
+        return 0
+    return RIJNDAEL_EXP_TABLE[(RIJNDAEL_LOG_TABLE[a] + RIJNDAEL_LOG_TABLE[b]) % 0xFF]
+
+
+@functools.lru_cache(maxsize=None)
+def _decryption_tables():
+    """
+    T-tables that combine InvSubBytes and InvMixColumns for a whole column.
+    The last one contains the inverse S-box shifted into each byte of a word
+    """
+    td0 = [(_gf_mul(x, 0xE) << 24) | (_gf_mul(x, 0x9) << 16) | (_gf_mul(x, 0xD) << 8) | _gf_mul(x, 0xB)
+           for x in SBOX_INV]
+    td1 = [(w >> 8) | ((w & 0xFF) << 24) for w in td0]
+    td2 = [(w >> 16) | ((w & 0xFFFF) << 16) for w in td0]
+    td3 = [(w >> 24) | ((w & 0xFFFFFF) << 8) for w in td0]
+    sbox_inv = tuple([x << shift for x in SBOX_INV] for shift in (24, 16, 8, 0))
+    return td0, td1, td2, td3, sbox_inv
+
+
+@functools.lru_cache(maxsize=16)
+def _decryption_round_keys(key):
+    """Round keys of the equivalent inverse cipher, as tuples of 4 words in the order they are used"""
+    expanded_key = bytes(key_expansion(list(key)))
+    words = struct.unpack(f'>{len(expanded_key) // 4}I', expanded_key)
+    round_keys = [words[i:i + 4] for i in range(0, len(words), 4)]
+    td0, td1, td2, td3, _ = _decryption_tables()
+    return (
+        round_keys[-1],
+        *(tuple(td0[SBOX[w >> 24]] ^ td1[SBOX[(w >> 16) & 0xFF]] ^ td2[SBOX[(w >> 8) & 0xFF]] ^ td3[SBOX[w & 0xFF]]
+                for w in round_key) for round_key in reversed(round_keys[1:-1])),
+        round_keys[0])
+
+
+def _aes_decrypt_blocks(data, round_keys):
+    """Decrypt every 16-byte block of data with the T-tables"""
+    td0, td1, td2, td3, (si0, si1, si2, si3) = _decryption_tables()
+    (k0, k1, k2, k3), *inner_keys, (f0, f1, f2, f3) = round_keys
+    words = struct.unpack(f'>{len(data) // 4}I', data)
+    decrypted = []
+    for i in range(0, len(words), 4):
+        s0, s1, s2, s3 = words[i] ^ k0, words[i + 1] ^ k1, words[i + 2] ^ k2, words[i + 3] ^ k3
+        for r0, r1, r2, r3 in inner_keys:
+            s0, s1, s2, s3 = (
+                td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xFF] ^ td2[(s2 >> 8) & 0xFF] ^ td3[s1 & 0xFF] ^ r0,
+                td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xFF] ^ td2[(s3 >> 8) & 0xFF] ^ td3[s2 & 0xFF] ^ r1,
+                td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xFF] ^ td2[(s0 >> 8) & 0xFF] ^ td3[s3 & 0xFF] ^ r2,
+                td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xFF] ^ td2[(s1 >> 8) & 0xFF] ^ td3[s0 & 0xFF] ^ r3)
+        decrypted += (
+            si0[s0 >> 24] ^ si1[(s3 >> 16) & 0xFF] ^ si2[(s2 >> 8) & 0xFF] ^ si3[s1 & 0xFF] ^ f0,
+            si0[s1 >> 24] ^ si1[(s0 >> 16) & 0xFF] ^ si2[(s3 >> 8) & 0xFF] ^ si3[s2 & 0xFF] ^ f1,
+            si0[s2 >> 24] ^ si1[(s1 >> 16) & 0xFF] ^ si2[(s0 >> 8) & 0xFF] ^ si3[s3 & 0xFF] ^ f2,
+            si0[s3 >> 24] ^ si1[(s2 >> 16) & 0xFF] ^ si2[(s1 >> 8) & 0xFF] ^ si3[s0 & 0xFF] ^ f3)
+    return struct.pack(f'>{len(decrypted)}I', *decrypted)
+
+
+def _numpy_available():
+    from .dependencies import numpy
+
+    return bool(numpy)
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy_decryption_tables():
+    from .dependencies import numpy
+
+    return tuple(numpy.array(table, dtype=numpy.uint32) for table in (*_decryption_tables()[:4], SBOX_INV))
+
+
+def _aes_decrypt_blocks_numpy(data, round_keys):
+    """Same as _aes_decrypt_blocks, but each step is done for all the blocks at once"""
+    from .dependencies import numpy
+
+    td0, td1, td2, td3, si = _numpy_decryption_tables()
+    round_keys = numpy.array(round_keys, dtype=numpy.uint32)
+    state = numpy.frombuffer(data, dtype='>u4').astype(numpy.uint32).reshape(-1, 4) ^ round_keys[0]
+    s0, s1, s2, s3 = state.T
+    for r0, r1, r2, r3 in round_keys[1:-1]:
+        s0, s1, s2, s3 = (
+            td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xFF] ^ td2[(s2 >> 8) & 0xFF] ^ td3[s1 & 0xFF] ^ r0,
+            td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xFF] ^ td2[(s3 >> 8) & 0xFF] ^ td3[s2 & 0xFF] ^ r1,
+            td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xFF] ^ td2[(s0 >> 8) & 0xFF] ^ td3[s3 & 0xFF] ^ r2,
+            td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xFF] ^ td2[(s1 >> 8) & 0xFF] ^ td3[s0 & 0xFF] ^ r3)
+    state = numpy.empty((len(s0), 4), dtype='>u4')
+    for column, (a, b, c, d) in enumerate(((s0, s3, s2, s1), (s1, s0, s3, s2), (s2, s1, s0, s3), (s3, s2, s1, s0))):
+        state[:, column] = ((si[a >> 24] << 24) | (si[(b >> 16) & 0xFF] << 16)
+                            | (si[(c >> 8) & 0xFF] << 8) | si[d & 0xFF]) ^ round_keys[-1][column]
+    return state.tobytes()
 
 
 def aes_cbc_encrypt(data, key, iv, *, padding_mode='pkcs7'):
@@ -0,0 +1,91 @@
+import contextlib
+import os
+import threading
+
+from .dependencies import sqlite3
+from .utils import locked_file
+
+
+class SqliteArchive:
+    """
+    A download archive kept in an indexed SQLite table
+
+    It implements the part of the set interface that YoutubeDL uses,
+    so membership checks do not require loading the whole archive.
+    Any number of processes may read from and add to the same archive
+    """
+
+    EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+    _HEADER = b'SQLite format 3\0'
+    _BUSY_TIMEOUT = 60
+    _BATCH_SIZE = 10000
+
+    def __init__(self, filename):
+        if not sqlite3:
+            raise ImportError('Python was compiled without sqlite3 support')
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            filename, timeout=self._BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        with contextlib.suppress(sqlite3.OperationalError):
+            # WAL lets readers proceed while another process is writing
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS archive (id TEXT PRIMARY KEY) WITHOUT ROWID')
+
+    @classmethod
+    def is_sqlite_archive(cls, filename):
+        """Whether the archive should be opened as a SQLite database rather than a text file
+
+        The extension decides for new and empty files. Existing files must
+        also have the SQLite header, so a text archive named *.db still works
+        """
+        if not os.fspath(filename).lower().endswith(cls.EXTENSIONS):
+            return False
+        try:
+            with open(filename, 'rb') as f:
+                header = f.read(len(cls._HEADER))
+        except FileNotFoundError:
+            return True
+        return not header or header == cls._HEADER
+
+    def __contains__(self, vid_id):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM archive WHERE id = ?', (vid_id,)).fetchone() is not None
+
+    def __bool__(self):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM archive LIMIT 1').fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM archive').fetchone()[0]
+
+    def __iter__(self):
+        with self._lock:
+            rows = self._conn.execute('SELECT id FROM archive').fetchall()
+        return (vid_id for vid_id, in rows)
+
+    def add(self, vid_id):
+        self.update((vid_id,))
+
+    def update(self, vid_ids):
+        """Add the given IDs in as few transactions as possible. Returns the number of new IDs"""
+        added = 0
+        vid_ids = iter(vid_ids)
+        with self._lock:
+            while True:
+                batch = [(vid_id,) for vid_id, _ in zip(vid_ids, range(self._BATCH_SIZE))]
+                if not batch:
+                    return added
+                with self._conn:
+                    self._conn.execute('BEGIN IMMEDIATE')
+                    added += self._conn.executemany('INSERT OR IGNORE INTO archive (id) VALUES (?)', batch).rowcount
+
+    def import_text(self, filename):
+        """Add all the IDs in a text download archive. Returns the number of new IDs"""
+        with locked_file(filename, 'r', encoding='utf-8') as archive_file:
+            return self.update(filter(None, map(str.strip, archive_file)))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -30,7 +30,8 @@ def _get_cache_fn(self, section, key, dtype):
     def enabled(self):
         return self._ydl.params.get('cachedir') is not False
 
-    def store(self, section, key, data, dtype='json'):
+    def store(self, section, key, data, dtype='json', *, mode=None):
+        """Store the data. mode is the permissions of the file, by default those under the umask"""
         assert dtype in ('json',)
 
         if not self.enabled:
@@ -40,7 +41,7 @@ def store(self, section, key, data, dtype='json'):
         try:
             os.makedirs(os.path.dirname(fn), exist_ok=True)
             self._ydl.write_debug(f'Saving {section}.{key} to cache')
-            write_json_file({'yt-dlp_version': __version__, 'data': data}, fn)
+            write_json_file({'yt-dlp_version': __version__, 'data': data}, fn, mode=mode)
         except Exception:
             tb = traceback.format_exc()
             self._ydl.report_warning(f'Writing cache to {fn!r} failed: {tb}')
@@ -26,11 +26,7 @@
     unpad_pkcs7,
 )
 from .compat import compat_os_name
-from .dependencies import (
-    _SECRETSTORAGE_UNAVAILABLE_REASON,
-    secretstorage,
-    sqlite3,
-)
+from .dependencies import sqlite3
 from .minicurses import MultilinePrinter, QuietMultilinePrinter
 from .utils import (
     DownloadError,
@@ -90,8 +86,9 @@ def load_cookies(cookie_file, browser_specification, ydl):
     cookie_jars = []
     if browser_specification is not None:
         browser_name, profile, keyring, container = _parse_browser_specification(*browser_specification)
-        cookie_jars.append(
-            extract_cookies_from_browser(browser_name, profile, YDLLogger(ydl), keyring=keyring, container=container))
+        cookie_jars.append(extract_cookies_from_browser(
+            browser_name, profile, YDLLogger(ydl), keyring=keyring, container=container,
+            cache=ydl.cache if ydl.params.get('cache_browser_cookies') else None))
 
     if cookie_file is not None:
         is_filename = is_path_like(cookie_file)
@@ -106,18 +103,61 @@ def load_cookies(cookie_file, browser_specification, ydl):
     return _merge_cookie_jars(cookie_jars)
 
 
-def extract_cookies_from_browser(browser_name, profile=None, logger=YDLLogger(), *, keyring=None, container=None):
+def extract_cookies_from_browser(browser_name, profile=None, logger=YDLLogger(), *, keyring=None, container=None, cache=None):
+    """
+    @param cache    A yt_dlp.cache.Cache to store the decrypted cookies of firefox and
+                    chromium based browsers in, until their database changes
+    """
     if browser_name == 'firefox':
-        return _extract_firefox_cookies(profile, container, logger)
+        return _extract_firefox_cookies(profile, container, logger, cache)
     elif browser_name == 'safari':
         return _extract_safari_cookies(profile, logger)
     elif browser_name in CHROMIUM_BASED_BROWSERS:
-        return _extract_chrome_cookies(browser_name, profile, keyring, logger)
+        return _extract_chrome_cookies(browser_name, profile, keyring, logger, cache)
     else:
         raise ValueError(f'unknown browser: {browser_name}')
 
 
-def _extract_firefox_cookies(profile, container, logger):
+def _database_stamp(database_path):
+    stat = os.stat(database_path)
+    return [os.path.abspath(database_path), stat.st_mtime_ns, stat.st_size]
+
+
+def _cookie_cache_key(browser_name, database_path, container=None):
+    return f'{browser_name}-' + hashlib.sha256(
+        json.dumps([os.path.abspath(database_path), container]).encode()).hexdigest()[:16]
+
+
+def _load_cached_cookies(cache, key, stamp, logger):
+    """The cookies stored by _store_cached_cookies, if the database is unchanged since"""
+    if cache is None:
+        return None
+    data = cache.load('cookies', key)
+    if not isinstance(data, dict) or data.get('database') != stamp:
+        return None
+    jar = YoutubeDLCookieJar()
+    for domain, name, value, path, expires, secure in data['cookies']:
+        jar.set_cookie(http.cookiejar.Cookie(
+            version=0, name=name, value=value, port=None, port_specified=False,
+            domain=domain, domain_specified=bool(domain), domain_initial_dot=domain.startswith('.'),
+            path=path, path_specified=bool(path), secure=secure, expires=expires, discard=False,
+            comment=None, comment_url=None, rest={}))
+    logger.info(f'Loaded {len(jar)} cookies from cache')
+    return jar
+
+
+def _store_cached_cookies(cache, key, stamp, jar):
+    if cache is None:
+        return
+    # The cookies are not encrypted anymore, so only the user may read them
+    cache.store('cookies', key, {
+        'database': stamp,
+        'cookies': [[cookie.domain, cookie.name, cookie.value, cookie.path, cookie.expires, cookie.secure]
+                    for cookie in jar],
+    }, mode=0o600)
+
+
+def _extract_firefox_cookies(profile, container, logger, cache=None):
     logger.info('Extracting cookies from firefox')
     if not sqlite3:
         logger.warning('Cannot extract cookies from firefox without sqlite3 support. '
@@ -151,6 +191,12 @@ def _extract_firefox_cookies(profile, container, logger):
         if not isinstance(container_id, int):
             raise ValueError(f'could not find firefox container "{container}" in containers.json')
 
+    cache_key = _cookie_cache_key('firefox', cookie_database_path, container)
+    stamp = _database_stamp(cookie_database_path)
+    jar = _load_cached_cookies(cache, cache_key, stamp, logger)
+    if jar is not None:
+        return jar
+
     with tempfile.TemporaryDirectory(prefix='yt_dlp') as tmpdir:
         cursor = None
         try:
@@ -180,6 +226,7 @@ def _extract_firefox_cookies(profile, container, logger):
                         comment=None, comment_url=None, rest={})
                     jar.set_cookie(cookie)
             logger.info(f'Extracted {len(jar)} cookies from firefox')
+            _store_cached_cookies(cache, cache_key, stamp, jar)
             return jar
         finally:
             if cursor is not None:
@@ -267,7 +314,7 @@ def _get_chromium_based_browser_settings(browser_name):
     }
 
 
-def _extract_chrome_cookies(browser_name, profile, keyring, logger):
+def _extract_chrome_cookies(browser_name, profile, keyring, logger, cache=None):
     logger.info(f'Extracting cookies from {browser_name}')
 
     if not sqlite3:
@@ -294,6 +341,13 @@ def _extract_chrome_cookies(browser_name, profile, keyring, logger):
         raise FileNotFoundError(f'could not find {browser_name} cookies database in "{search_root}"')
     logger.debug(f'Extracting cookies from: "{cookie_database_path}"')
 
+    # Getting the key from the keyring and decrypting every cookie is most of the time taken
+    cache_key = _cookie_cache_key(browser_name, cookie_database_path)
+    stamp = _database_stamp(cookie_database_path)
+    jar = _load_cached_cookies(cache, cache_key, stamp, logger)
+    if jar is not None:
+        return jar
+
     decryptor = get_cookie_decryptor(config['browser_dir'], config['keyring_name'], logger, keyring=keyring)
 
     with tempfile.TemporaryDirectory(prefix='yt_dlp') as tmpdir:
@@ -327,6 +381,8 @@ def _extract_chrome_cookies(browser_name, profile, keyring, logger):
             counts = decryptor._cookie_counts.copy()
             counts['unencrypted'] = unencrypted_cookies
             logger.debug(f'cookie version breakdown: {counts}')
+            if not failed_cookies:
+                _store_cached_cookies(cache, cache_key, stamp, jar)
             return jar
         except PermissionError as error:
             if compat_os_name == 'nt' and error.errno == 13:
@@ -917,6 +973,8 @@ def _get_kwallet_password(browser_keyring_name, keyring, logger):
 
 
 def _get_gnome_keyring_password(browser_keyring_name, logger):
+    from .dependencies import _SECRETSTORAGE_UNAVAILABLE_REASON, secretstorage
+
     if not secretstorage:
         logger.error(f'secretstorage not available {_SECRETSTORAGE_UNAVAILABLE_REASON}')
         return b''
@@ -1224,12 +1282,57 @@ class YoutubeDLCookieJar(http.cookiejar.MozillaCookieJar):
     _CookieFileEntry = collections.namedtuple(
         'CookieFileEntry',
         ('domain_name', 'include_subdomains', 'path', 'https_only', 'expires_at', 'name', 'value'))
+    _LOOKUP_CACHE_SIZE = 1024
 
     def __init__(self, filename=None, *args, **kwargs):
         super().__init__(None, *args, **kwargs)
         if is_path_like(filename):
             filename = os.fspath(filename)
         self.filename = filename
+        self._domain_order = None  # {domain: position in self._cookies}
+        self._lookup_cache = {}  # {(scheme, host, path): (cookies, time they are valid until)}
+
+    def _invalidate(self, domains_changed=False):
+        with self._cookies_lock:
+            self._lookup_cache.clear()
+            if domains_changed:
+                self._domain_order = None
+
+    def set_cookie(self, cookie):
+        with self._cookies_lock:
+            if cookie.domain not in self._cookies and self._domain_order is not None:
+                self._domain_order[cookie.domain] = len(self._domain_order)
+            self._invalidate()
+            super().set_cookie(cookie)
+
+    def set_policy(self, policy):
+        self._invalidate()
+        super().set_policy(policy)
+
+    @staticmethod
+    def _request_domains(request):
+        """The cookie domains that DefaultCookiePolicy.domain_return_ok can accept for the request"""
+        domains = {''}
+        for host in http.cookiejar.eff_request_host(request):
+            host = host if host.startswith('.') else f'.{host}'
+            for index, char in enumerate(host):
+                if char == '.':
+                    domains.update((host[index:], host[index + 1:]))
+        return domains
+
+    def _cookies_for_request(self, request):
+        """Return a list of cookies to be returned to server"""
+        if type(self._policy).domain_return_ok is not http.cookiejar.DefaultCookiePolicy.domain_return_ok:
+            return super()._cookies_for_request(request)
+        # Only look at the domains that the host is in, instead of every domain in the jar.
+        # They are checked in the order of the jar, which decides the order of the cookies
+        with self._cookies_lock:
+            if self._domain_order is None:
+                self._domain_order = {domain: position for position, domain in enumerate(self._cookies)}
+            domains = sorted(
+                (domain for domain in self._request_domains(request) if domain in self._cookies),
+                key=self._domain_order.__getitem__)
+            return [cookie for domain in domains for cookie in self._cookies_for_domain(domain, request)]
 
     @staticmethod
     def _true_or_false(cndn):
@@ -1282,6 +1385,7 @@ def save(self, filename=None, ignore_discard=True, ignore_expires=True):
         for cookie in self:
             if cookie.expires is None:
                 cookie.expires = 0
+        self._invalidate()
 
         with self.open(filename, write=True) as f:
             f.write(self._HEADER)
@@ -1340,17 +1444,28 @@ def prepare_line(line):
 
     def get_cookie_header(self, url):
         """Generate a Cookie HTTP header for a given url"""
-        cookie_req = urllib.request.Request(normalize_url(sanitize_url(url)))
-        self.add_cookie_header(cookie_req)
-        return cookie_req.get_header('Cookie')
+        attrs = self._cookie_attrs(self.get_cookies_for_url(url))
+        return '; '.join(attrs) if attrs else None
 
     def get_cookies_for_url(self, url):
         """Generate a list of Cookie objects for a given url"""
-        # Policy `_now` attribute must be set before calling `_cookies_for_request`
-        # Ref: https://github.com/python/cpython/blob/3.7/Lib/http/cookiejar.py#L1360
-        self._policy._now = self._now = int(time.time())
-        return self._cookies_for_request(urllib.request.Request(normalize_url(sanitize_url(url))))
+        request = urllib.request.Request(normalize_url(sanitize_url(url)))
+        # The cookies of a URL only depend on its scheme, host and path, and on the time
+        key = (request.type, (request.host or '').lower(), http.cookiejar.request_path(request))
+        with self._cookies_lock:
+            # Policy `_now` attribute must be set before calling `_cookies_for_request`
+            # Ref: https://github.com/python/cpython/blob/3.7/Lib/http/cookiejar.py#L1360
+            self._policy._now = self._now = int(time.time())
+            cookies, valid_until = self._lookup_cache.get(key, (None, None))
+            if cookies is None or self._now >= valid_until:
+                cookies = self._cookies_for_request(request)
+                if len(self._lookup_cache) >= self._LOOKUP_CACHE_SIZE:
+                    self._lookup_cache.clear()
+                self._lookup_cache[key] = cookies, min(
+                    (cookie.expires for cookie in cookies if cookie.expires is not None), default=float('inf'))
+            return list(cookies)
 
     def clear(self, *args, **kwargs):
+        self._invalidate(domains_changed=True)
         with contextlib.suppress(KeyError):
             return super().clear(*args, **kwargs)
@@ -1,5 +1,6 @@
 # flake8: noqa: F401
 """Imports all optional dependencies for the project.
+Some of them are only imported when they are first accessed.
 An attribute "_yt_dlp__identifier" may be inserted into the module if it uses an ambiguous namespace"""
 
 try:
@@ -23,24 +24,6 @@
         certifi = None
 
 
-try:
-    import mutagen
-except ImportError:
-    mutagen = None
-
-
-secretstorage = None
-try:
-    import secretstorage
-    _SECRETSTORAGE_UNAVAILABLE_REASON = None
-except ImportError:
-    _SECRETSTORAGE_UNAVAILABLE_REASON = (
-        'as the `secretstorage` module is not installed. '
-        'Please install by running `python3 -m pip install secretstorage`')
-except Exception as _err:
-    _SECRETSTORAGE_UNAVAILABLE_REASON = f'as the `secretstorage` module could not be initialized. {_err}'
-
-
 try:
     import sqlite3
     # We need to get the underlying `sqlite` version, see https://github.com/yt-dlp/yt-dlp/issues/8152
@@ -51,21 +34,6 @@
     sqlite3 = None
 
 
-try:
-    import websockets
-except ImportError:
-    websockets = None
-
-try:
-    import urllib3
-except ImportError:
-    urllib3 = None
-
-try:
-    import requests
-except ImportError:
-    requests = None
-
 try:
     import xattr  # xattr or pyxattr
 except ImportError:
@@ -74,15 +42,104 @@
     if hasattr(xattr, 'set'):  # pyxattr
         xattr._yt_dlp__identifier = 'pyxattr'
 
-try:
-    import curl_cffi
-except ImportError:
-    curl_cffi = None
-
 from . import Cryptodome
 
-all_dependencies = {k: v for k, v in globals().items() if not k.startswith('_')}
-available_dependencies = {k: v for k, v in all_dependencies.items() if v}
+
+# The dependencies below are slow to import and only needed by some features,
+# so they are imported when they are first accessed. See __getattr__
+_LAZY_IMPORTERS = {}
+
+
+def _lazy_import(*names):
+    def wrapper(func):
+        _LAZY_IMPORTERS.update(dict.fromkeys(names, func))
+        return func
+    return wrapper
+
+
+@_lazy_import('mutagen')
+def _import_mutagen():
+    try:
+        import mutagen
+    except ImportError:
+        mutagen = None
+    return {'mutagen': mutagen}
+
+
+@_lazy_import('secretstorage', '_SECRETSTORAGE_UNAVAILABLE_REASON')
+def _import_secretstorage():
+    secretstorage = None
+    try:
+        import secretstorage
+        reason = None
+    except ImportError:
+        reason = (
+            'as the `secretstorage` module is not installed. '
+            'Please install by running `python3 -m pip install secretstorage`')
+    except Exception as err:
+        reason = f'as the `secretstorage` module could not be initialized. {err}'
+    return {'secretstorage': secretstorage, '_SECRETSTORAGE_UNAVAILABLE_REASON': reason}
+
+
+@_lazy_import('websockets')
+def _import_websockets():
+    try:
+        import websockets
+    except ImportError:
+        websockets = None
+    return {'websockets': websockets}
+
+
+@_lazy_import('urllib3')
+def _import_urllib3():
+    try:
+        import urllib3
+    except ImportError:
+        urllib3 = None
+    return {'urllib3': urllib3}
+
+
+@_lazy_import('requests')
+def _import_requests():
+    try:
+        import requests
+    except ImportError:
+        requests = None
+    return {'requests': requests}
+
+
+@_lazy_import('curl_cffi')
+def _import_curl_cffi():
+    try:
+        import curl_cffi
+    except ImportError:
+        curl_cffi = None
+    return {'curl_cffi': curl_cffi}
+
+
+@_lazy_import('numpy')
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    return {'numpy': numpy}
+
+
+_DEPENDENCY_NAMES = (
+    'brotli', 'certifi', 'mutagen', 'secretstorage', 'sqlite3', 'websockets',
+    'urllib3', 'requests', 'xattr', 'curl_cffi', 'numpy', 'Cryptodome')
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTERS:
+        globals().update(_LAZY_IMPORTERS[name]())
+        return globals()[name]
+    elif name == 'all_dependencies':
+        return {dep: __getattr__(dep) if dep in _LAZY_IMPORTERS else globals()[dep] for dep in _DEPENDENCY_NAMES}
+    elif name == 'available_dependencies':
+        return {k: v for k, v in __getattr__('all_dependencies').items() if v}
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 # Deprecated
@@ -92,5 +149,5 @@
 __all__ = [
     'all_dependencies',
     'available_dependencies',
-    *all_dependencies.keys(),
+    *_DEPENDENCY_NAMES,
 ]
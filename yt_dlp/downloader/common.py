@@ -406,7 +406,7 @@ def report_resuming_byte(self, resume_len):
         """Report attempt to resume at given byte."""
         self.to_screen(f'[download] Resuming download at byte {resume_len}')
 
-    def report_retry(self, err, count, retries, frag_index=NO_DEFAULT, fatal=True):
+    def report_retry(self, err, count, retries, frag_index=NO_DEFAULT, fatal=True, sleep=time.sleep):
         """Report retry"""
         is_frag = False if frag_index is NO_DEFAULT else 'fragment'
         RetryManager.report_retry(
@@ -414,7 +414,8 @@ def report_retry(self, err, count, retries, frag_index=NO_DEFAULT, fatal=True):
             warn=lambda msg: self.__to_screen(f'[download] Got error: {msg}'),
             error=IDENTITY if not fatal else lambda e: self.report_error(f'\r[download] Got error: {e}'),
             sleep_func=self.params.get('retry_sleep_functions', {}).get(is_frag or 'http'),
-            suffix=f'fragment{"s" if frag_index is None else f" {frag_index}"}' if is_frag else None)
+            suffix=f'fragment{"s" if frag_index is None else f" {frag_index}"}' if is_frag else None,
+            sleep=sleep)
 
     def report_unable_to_resume(self):
         """Report it was impossible to resume download."""
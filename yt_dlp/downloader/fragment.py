@@ -1,19 +1,33 @@
+import asyncio
+import collections
 import concurrent.futures
 import contextlib
 import json
 import math
 import os
 import struct
+import threading
 import time
+import urllib.parse
 
 from .common import FileDownloader
 from .http import HttpFD
 from ..aes import aes_cbc_decrypt_bytes, unpad_pkcs7
 from ..compat import compat_os_name
 from ..networking import Request
-from ..networking.exceptions import HTTPError, IncompleteRead
-from ..utils import DownloadError, RetryManager, encodeFilename, traverse_obj
-from ..utils.networking import HTTPHeaderDict
+from ..networking._asyncio import AsyncHTTPClient
+from ..networking._helper import select_proxy
+from ..networking.exceptions import HTTPError, IncompleteRead, TransportError
+from ..utils import (
+    DownloadError,
+    RetryManager,
+    encodeFilename,
+    extract_basic_auth,
+    sanitize_url,
+    timeconvert,
+    traverse_obj,
+)
+from ..utils.networking import HTTPHeaderDict, clean_headers, clean_proxies
 from ..utils.progress import ProgressCalculator
 
 
@@ -24,6 +38,315 @@ def to_screen(self, *args, **kargs):
     to_console_title = to_screen
 
 
+class _FragmentBuffer:
+    """Write-only stream that keeps a fragment in memory until the pool runs out of room"""
+
+    def __init__(self, pool, filename, opener):
+        self._pool = pool
+        self._filename = filename
+        self._opener = opener
+        self.data = bytearray()
+        self.stream = None
+
+    def spill(self, open_mode='wb'):
+        self.stream, _ = self._opener(self._filename, open_mode)
+        if self.data:
+            self.stream.write(self.data)
+            self._pool.release(len(self.data))
+            self.data = bytearray()
+
+    def write(self, data):
+        if self.stream is None and not self._pool.reserve(len(data)):
+            self.spill()
+        if self.stream is not None:
+            return self.stream.write(data)
+        self.data += data
+        return len(data)
+
+    def flush(self):
+        if self.stream is not None:
+            self.stream.flush()
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+
+
+class FragmentMemoryPool:
+    """
+    Keeps downloaded fragments in memory, limiting the total number of bytes held
+
+    A fragment that does not fit into the remaining budget is written to its
+    usual temporary file instead, so that downloading never has to wait for
+    memory to be freed
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self._buffers = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, size):
+        with self._lock:
+            if self.used + size > self.limit:
+                return False
+            self.used += size
+            return True
+
+    def release(self, size):
+        with self._lock:
+            self.used -= size
+
+    def open(self, filename, open_mode, opener):
+        self.discard(filename)
+        buffer = _FragmentBuffer(self, filename, opener)
+        # Data that has been held in memory is never visible to the HTTP downloader,
+        # so only a fragment that has already been spilled to disk can be resumed
+        if 'a' in open_mode and os.path.isfile(encodeFilename(filename)):
+            buffer.spill(open_mode)
+        with self._lock:
+            self._buffers[filename] = buffer
+        return buffer
+
+    def pop(self, filename):
+        """Return the content of an in-memory fragment, or None if it is not held in memory"""
+        with self._lock:
+            buffer = self._buffers.pop(filename, None)
+        if buffer is None or buffer.stream is not None:
+            return None
+        self.release(len(buffer.data))
+        return bytes(buffer.data)
+
+    def discard(self, filename):
+        with self._lock:
+            buffer = self._buffers.pop(filename, None)
+        if buffer is not None and buffer.stream is None:
+            self.release(len(buffer.data))
+
+
+class HttpMemoryDownloader(HttpQuietDownloader):
+    """Downloads fragments into a FragmentMemoryPool instead of temporary files"""
+
+    def __init__(self, ydl, params, pool):
+        super().__init__(ydl, params)
+        self.pool = pool
+
+    def temp_name(self, filename):
+        return filename
+
+    def sanitize_open(self, filename, open_mode):
+        return self.pool.open(filename, open_mode, super().sanitize_open), filename
+
+    def try_utime(self, filename, last_modified_hdr):
+        if os.path.isfile(encodeFilename(filename)):
+            return super().try_utime(filename, last_modified_hdr)
+        return timeconvert(last_modified_hdr) if last_modified_hdr else None
+
+
+class _PositionalFragmentWriter:
+    """
+    Writes fragments of known size directly to their final position in the output file,
+    in whatever order they finish downloading
+    """
+
+    def __init__(self, fd, ctx, fragments):
+        self.fd, self.ctx = fd, ctx
+        self.positions, self.offsets = {}, []
+        offset = ctx['complete_frags_downloaded_bytes']
+        for position, fragment in enumerate(fragments):
+            self.positions[fragment['frag_index']] = position
+            self.offsets.append(offset)
+            offset += fragment['byte_range']['end'] - fragment['byte_range']['start']
+        self.offsets.append(offset)
+        self.fragments = fragments
+        self.done = set()
+        self.next_position = 0
+        self.fragment_index = ctx['fragment_index']
+        ctx['fragment_offset'] = self.offsets[0]
+        self.stream = os.open(encodeFilename(ctx['tmpfilename']), os.O_WRONLY)
+
+    @staticmethod
+    def suitable(ctx, fragments):
+        return (hasattr(os, 'pwrite') and not ctx['live'] and ctx['tmpfilename'] != '-'
+                and isinstance(fragments, list) and fragments
+                and all(fragment and fragment.get('byte_range')
+                        and traverse_obj(fragment, ('decrypt_info', 'METHOD')) in (None, 'NONE')
+                        for fragment in fragments))
+
+    def write(self, frag_content, frag_index, fatal):
+        position = self.positions[frag_index]
+        offset, size = self.offsets[position], self.offsets[position + 1] - self.offsets[position]
+        if not frag_content:
+            if fatal:
+                self.ctx['dest_stream'].close()
+                self.fd.report_error(f'fragment {frag_index} not found, unable to continue')
+                return False
+            self.fd.report_skip_fragment(frag_index, 'fragment not found')
+            self.ctx.setdefault('fragment_holes', []).append([offset, size])
+        elif len(frag_content) != size:
+            self.ctx['dest_stream'].close()
+            self.fd.report_error(
+                f'fragment {frag_index} has an unexpected size ({len(frag_content)} bytes instead of {size}), '
+                'unable to continue')
+            return False
+        else:
+            view = memoryview(frag_content)
+            while view:
+                view = view[os.pwrite(self.stream, view, offset + len(frag_content) - len(view)):]
+
+        self.done.add(position)
+        while self.next_position in self.done:
+            self.done.remove(self.next_position)
+            self.next_position += 1
+        if self.next_position:
+            self.fragment_index = self.fragments[self.next_position - 1]['frag_index']
+        self.ctx['fragment_offset'] = self.offsets[self.next_position]
+        return True
+
+    def close(self):
+        os.close(self.stream)
+        if not self.ctx['dest_stream'].closed:
+            self.ctx['dest_stream'].seek(0, os.SEEK_END)
+
+
+class AsyncFragmentEngine:
+    """
+    Downloads fragments as coroutines on an event loop running in a background thread
+
+    submit() returns concurrent.futures.Future objects, so the engine can be used in
+    place of a ThreadPoolExecutor. At most max_concurrency submitted coroutines run at
+    once. Fragments that the asyncio client cannot fetch (e.g. because they need a proxy)
+    can be handed to run_in_thread() instead
+
+    The requests do not go through the RequestDirector. They share its cookiejar and
+    TLS sessions, and their handshakes are counted in its tls_stats(). Fragment requests
+    have no rate_limit or http_cache extension, so the director would not apply those either
+    """
+
+    def __init__(self, fd, max_concurrency):
+        self.fd = fd
+        self.max_concurrency = max_concurrency
+        params = fd.ydl.params
+        self._headers = params.get('http_headers')
+        self._proxies = fd.ydl.proxies
+        self.client = AsyncHTTPClient(
+            cookiejar=fd.ydl.cookiejar,
+            timeout=float(params.get('socket_timeout') or 20),
+            source_address=params.get('source_address'),
+            ssl_context=fd.ydl._request_director.tls_session_cache.make_ssl_context(
+                verify=not params.get('nocheckcertificate'),
+                legacy_support=params.get('legacyserverconnect'),
+                use_certifi='no-certifi' not in params.get('compat_opts', []),
+                **traverse_obj(params, {
+                    'client_certificate': 'client_certificate',
+                    'client_certificate_key': 'client_certificate_key',
+                    'client_certificate_password': 'client_certificate_password',
+                })),
+            max_idle_per_host=max_concurrency)
+        self._semaphore = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def suitable(params):
+        return (params.get('fragment_engine') == 'asyncio'
+                and not any(params.get(key) for key in ('keep_fragments', 'ratelimit', 'impersonate')))
+
+    def prepare_request(self, url, headers):
+        """Returns (url, headers) to fetch with the asyncio client, or None if it does not support the URL"""
+        url, basic_auth_header = extract_basic_auth(url)
+        headers = HTTPHeaderDict(self._headers, headers)
+        if basic_auth_header:
+            headers['Authorization'] = basic_auth_header
+        proxies = self._proxies.copy()
+        clean_proxies(proxies, headers)
+        clean_headers(headers)
+        url = sanitize_url(url)
+        if urllib.parse.urlparse(url).scheme.lower() not in ('http', 'https') or select_proxy(url, proxies):
+            return None
+        return url, headers
+
+    async def fetch(self, ctx, info_dict, url, headers, progress_key):
+        """Download a fragment, reporting its progress to the hooks of ctx['dl']. Returns the content"""
+        status = {
+            'status': 'downloading',
+            'filename': ctx['filename'],
+            'tmpfilename': ctx['tmpfilename'],
+            'ctx_id': ctx.get('ctx_id'),
+            'progress_key': progress_key,
+        }
+
+        def progress(downloaded, total):
+            ctx['dl']._hook_progress({
+                **status,
+                'downloaded_bytes': downloaded,
+                'total_bytes': total,
+            }, info_dict)
+
+        _, response_headers, content = await self.client.get(url, headers, progress)
+        if self.fd.params.get('updatetime', True):
+            filetime = timeconvert(response_headers.get('last-modified'))
+            if filetime:
+                ctx['fragment_filetime'] = filetime
+        ctx['dl']._hook_progress({
+            **status,
+            'status': 'finished',
+            'downloaded_bytes': len(content),
+            'total_bytes': len(content),
+        }, info_dict)
+        return content
+
+    async def run_in_thread(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def _run(self, func, args):
+        if self._semaphore is None:
+            # Must be created in the event loop's thread for Python < 3.10
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await func(*args)
+
+    def submit(self, func, *args):
+        """Schedule the coroutine function func(*args) to run in the event loop"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('cannot schedule new downloads after shutdown')
+            return asyncio.run_coroutine_threadsafe(self._run(func, args), self._loop)
+
+    async def _close(self, cancel):
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        if cancel:
+            for task in tasks:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.client.close()
+        # Let the transports finish closing
+        await asyncio.sleep(0)
+
+    def shutdown(self, wait=True):
+        """Stop the event loop. Unless wait is set, the downloads that are still running are cancelled"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(cancel=not wait), self._loop).result()
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown(wait=exc_type is None)
+
+
 class FragmentFD(FileDownloader):
     """
     A base file downloader class for fragmented media (e.g. f4m/m3u8 manifests).
@@ -37,6 +360,19 @@ class FragmentFD(FileDownloader):
     keep_fragments:     Keep downloaded fragments on disk after downloading is
                         finished
     concurrent_fragment_downloads:  The number of threads to use for native hls and dash downloads
+    fragment_reorder_window: The maximum number of fragments that are queued or held
+                        while waiting for an earlier fragment to finish when
+                        downloading concurrently. Default is 4 per thread.
+                        Fragments of known size are written to the output file
+                        as soon as they finish, irrespective of this limit
+    fragment_memory_limit: Keep downloaded fragments in memory instead of writing
+                        them to temporary files, using at most this many bytes.
+                        Fragments that do not fit are written to disk as usual.
+                        Ignored when keep_fragments is set
+    fragment_engine:    "threads" (default) or "asyncio". The asyncio engine downloads
+                        up to concurrent_fragment_downloads fragments from a
+                        single event loop instead of a thread each. It is not
+                        used with keep_fragments, ratelimit or impersonate
     _no_ytdl_file:      Don't use .ytdl file
 
     For each incomplete fragment download yt-dlp keeps on disk a special
@@ -54,12 +390,19 @@ class FragmentFD(FileDownloader):
             current_fragment:
                 Dictionary with current (being downloaded) fragment data:
                 index:  0-based index of current fragment among all fragments
+                offset: Size of the output file up to the current fragment, if
+                        later fragments may have been written ahead of it
             fragment_count:
                 Total count of fragments
+            fragment_holes:
+                List of [offset, size] of skipped fragments that are to be cut
+                out of the output file once the download is finished
 
     This feature is experimental and file format may change in future.
     """
 
+    _fragment_memory_pool = None
+
     def report_retry_fragment(self, err, frag_index, count, retries):
         self.deprecation_warning('yt_dlp.downloader.FragmentFD.report_retry_fragment is deprecated. '
                                  'Use yt_dlp.downloader.FileDownloader.report_retry instead')
@@ -86,6 +429,10 @@ def _read_ytdl_file(self, ctx):
         try:
             ytdl_data = json.loads(stream.read())
             ctx['fragment_index'] = ytdl_data['downloader']['current_fragment']['index']
+            if 'offset' in ytdl_data['downloader']['current_fragment']:
+                ctx['fragment_offset'] = ytdl_data['downloader']['current_fragment']['offset']
+            if 'fragment_holes' in ytdl_data['downloader']:
+                ctx['fragment_holes'] = ytdl_data['downloader']['fragment_holes']
             if 'extra_state' in ytdl_data['downloader']:
                 ctx['extra_state'] = ytdl_data['downloader']['extra_state']
         except Exception:
@@ -101,6 +448,10 @@ def _write_ytdl_file(self, ctx):
                     'index': ctx['fragment_index'],
                 },
             }
+            if ctx.get('fragment_offset') is not None:
+                downloader['current_fragment']['offset'] = ctx['fragment_offset']
+            if ctx.get('fragment_holes'):
+                downloader['fragment_holes'] = ctx['fragment_holes']
             if 'extra_state' in ctx:
                 downloader['extra_state'] = ctx['extra_state']
             if ctx.get('fragment_count') is not None:
@@ -124,6 +475,8 @@ def _download_fragment(self, ctx, frag_url, info_dict, headers=None, request_dat
 
         success, _ = ctx['dl'].download(fragment_filename, fragment_info_dict)
         if not success:
+            if self._fragment_memory_pool:
+                self._fragment_memory_pool.discard(fragment_filename)
             return False
         if fragment_info_dict.get('filetime'):
             ctx['fragment_filetime'] = fragment_info_dict.get('filetime')
@@ -133,6 +486,10 @@ def _download_fragment(self, ctx, frag_url, info_dict, headers=None, request_dat
     def _read_fragment(self, ctx):
         if not ctx.get('fragment_filename_sanitized'):
             return None
+        if self._fragment_memory_pool:
+            frag_content = self._fragment_memory_pool.pop(ctx['fragment_filename_sanitized'])
+            if frag_content is not None:
+                return frag_content
         try:
             down, frag_sanitized = self.sanitize_open(ctx['fragment_filename_sanitized'], 'rb')
         except FileNotFoundError:
@@ -151,9 +508,10 @@ def _append_fragment(self, ctx, frag_content):
         finally:
             if self.__do_ytdl_file(ctx):
                 self._write_ytdl_file(ctx)
-            if not self.params.get('keep_fragments', False):
+            # Fragments downloaded by the asyncio engine are never written to disk
+            if ctx.get('fragment_filename_sanitized') and not self.params.get('keep_fragments', False):
                 self.try_remove(encodeFilename(ctx['fragment_filename_sanitized']))
-            del ctx['fragment_filename_sanitized']
+            ctx.pop('fragment_filename_sanitized', None)
 
     def _prepare_frag_download(self, ctx):
         if not ctx.setdefault('live', False):
@@ -165,14 +523,24 @@ def _prepare_frag_download(self, ctx):
             total_frags_str = 'unknown (live)'
         self.to_screen(f'[{self.FD_NAME}] Total fragments: {total_frags_str}')
         self.report_destination(ctx['filename'])
-        dl = HttpQuietDownloader(self.ydl, {
+        dl_params = {
             **self.params,
             'noprogress': True,
             'test': False,
             'sleep_interval': 0,
             'max_sleep_interval': 0,
             'sleep_interval_subtitles': 0,
-        })
+        }
+        memory_limit = self.params.get('fragment_memory_limit')
+        if memory_limit and not self.params.get('keep_fragments', False):
+            if self._fragment_memory_pool is None:
+                self._fragment_memory_pool = FragmentMemoryPool(memory_limit)
+            dl = HttpMemoryDownloader(self.ydl, {
+                **dl_params,
+                'xattr_set_filesize': False,
+            }, self._fragment_memory_pool)
+        else:
+            dl = HttpQuietDownloader(self.ydl, dl_params)
         tmpfilename = self.temp_name(ctx['filename'])
         open_mode = 'wb'
 
@@ -201,15 +569,24 @@ def _prepare_frag_download(self, ctx):
                     self.report_warning(
                         f'{message}. Restarting from the beginning ...')
                     ctx['fragment_index'] = resume_len = 0
+                    ctx.pop('fragment_holes', None)
                     if 'ytdl_corrupt' in ctx:
                         del ctx['ytdl_corrupt']
                     self._write_ytdl_file(ctx)
+                elif ctx.get('fragment_offset') is not None and resume_len > ctx['fragment_offset']:
+                    # Discard fragments that were written ahead of the last consistent position
+                    with open(encodeFilename(tmpfilename), 'r+b') as f:
+                        f.truncate(ctx['fragment_offset'])
+                    resume_len = ctx['fragment_offset']
+                ctx.pop('fragment_offset', None)
 
             else:
                 if not continuedl:
                     if ytdl_file_exists:
                         self._read_ytdl_file(ctx)
                     ctx['fragment_index'] = resume_len = 0
+                    ctx.pop('fragment_offset', None)
+                    ctx.pop('fragment_holes', None)
                 self._write_ytdl_file(ctx)
                 assert ctx['fragment_index'] == 0
 
@@ -257,21 +634,23 @@ def frag_progress_hook(s):
             frag_total_bytes = s.get('total_bytes') or 0
             s['fragment_info_dict'] = s.pop('info_dict', {})
 
+            # The asyncio engine downloads many fragments in the same thread
+            progress_key = s.get('progress_key')
             # XXX: Fragment resume is not accounted for here
             if not ctx['live']:
                 estimated_size = (
                     (ctx['complete_frags_downloaded_bytes'] + frag_total_bytes)
                     / (state['fragment_index'] + 1) * total_frags)
                 progress.total = estimated_size
-                progress.update(s.get('downloaded_bytes'))
+                progress.update(s.get('downloaded_bytes'), progress_key)
                 state['total_bytes_estimate'] = progress.total
             else:
-                progress.update(s.get('downloaded_bytes'))
+                progress.update(s.get('downloaded_bytes'), progress_key)
 
             if s['status'] == 'finished':
                 state['fragment_index'] += 1
                 ctx['fragment_index'] = state['fragment_index']
-                progress.thread_reset()
+                progress.thread_reset(progress_key)
 
             state['downloaded_bytes'] = ctx['complete_frags_downloaded_bytes'] = progress.downloaded
             state['speed'] = ctx['speed'] = progress.speed.smooth
@@ -379,11 +758,16 @@ def download_and_append_fragments_multiple(self, *args, **kwargs):
             self._prepare_multiline_status(max_progress)
         is_live = any(traverse_obj(args, (..., 2, 'is_live')))
 
+        # All the formats share one event loop, so each only needs a thread to write its fragments
+        engine = None
+        if AsyncFragmentEngine.suitable(self.params) and not any(traverse_obj(args, (..., 2, 'request_data'))):
+            engine = AsyncFragmentEngine(self, max_workers)
+
         def thread_func(idx, ctx, fragments, info_dict, tpe):
             ctx['max_progress'] = max_progress
             ctx['progress_idx'] = idx
             return self.download_and_append_fragments(
-                ctx, fragments, info_dict, **kwargs, tpe=tpe, interrupt_trigger=interrupt_trigger)
+                ctx, fragments, info_dict, **kwargs, tpe=tpe, interrupt_trigger=interrupt_trigger, engine=engine)
 
         class FTPE(concurrent.futures.ThreadPoolExecutor):
             # has to stop this or it's going to wait on the worker thread itself
@@ -411,18 +795,28 @@ def interrupt_trigger_iter(fg):
 
         spins = []
         for idx, (ctx, fragments, info_dict) in enumerate(args):
-            tpe = FTPE(math.ceil(max_workers / max_progress))
+            tpe = FTPE(1 if engine else math.ceil(max_workers / max_progress))
             job = tpe.submit(thread_func, idx, ctx, interrupt_trigger_iter(fragments), info_dict, tpe)
             spins.append((tpe, job))
 
         result = True
-        for tpe, job in spins:
-            try:
-                result = result and future_result(job)
-            except KeyboardInterrupt:
-                interrupt_trigger[0] = False
-            finally:
-                tpe.shutdown(wait=True)
+        try:
+            for tpe, job in spins:
+                try:
+                    result = result and future_result(job)
+                except KeyboardInterrupt:
+                    interrupt_trigger[0] = False
+                    if engine is not None:
+                        engine.shutdown(wait=False)
+                except concurrent.futures.CancelledError:
+                    # The downloads were cancelled by the engine shutting down
+                    if interrupt_trigger[0]:
+                        raise
+                finally:
+                    tpe.shutdown(wait=True)
+        finally:
+            if engine is not None:
+                engine.shutdown()
         if not interrupt_trigger[0] and not is_live:
             raise KeyboardInterrupt
         # we expect the user wants to stop and DO WANT the preceding postprocessors to run;
@@ -431,22 +825,26 @@ def interrupt_trigger_iter(fg):
 
     def download_and_append_fragments(
             self, ctx, fragments, info_dict, *, is_fatal=(lambda idx: False),
-            pack_func=(lambda content, idx: content), finish_func=None,
-            tpe=None, interrupt_trigger=(True, )):
+            pack_func=None, finish_func=None,
+            tpe=None, interrupt_trigger=(True, ), engine=None):
 
         if not self.params.get('skip_unavailable_fragments', True):
             is_fatal = lambda _: True
 
+        def fragment_headers(fragment):
+            headers = HTTPHeaderDict(info_dict.get('http_headers'))
+            byte_range = fragment.get('byte_range')
+            if byte_range:
+                headers['Range'] = 'bytes=%d-%d' % (byte_range['start'], byte_range['end'] - 1)
+            return headers
+
         def download_fragment(fragment, ctx):
             if not interrupt_trigger[0]:
                 return
 
             frag_index = ctx['fragment_index'] = fragment['frag_index']
             ctx['last_error'] = None
-            headers = HTTPHeaderDict(info_dict.get('http_headers'))
-            byte_range = fragment.get('byte_range')
-            if byte_range:
-                headers['Range'] = 'bytes=%d-%d' % (byte_range['start'], byte_range['end'] - 1)
+            headers = fragment_headers(fragment)
 
             # Never skip the first fragment
             fatal = is_fatal(fragment.get('index') or (frag_index - 1))
@@ -472,7 +870,7 @@ def error_callback(err, count, retries):
 
         def append_fragment(frag_content, frag_index, ctx):
             if frag_content:
-                self._append_fragment(ctx, pack_func(frag_content, frag_index))
+                self._append_fragment(ctx, pack_func(frag_content, frag_index) if pack_func else frag_content)
             elif not is_fatal(frag_index - 1):
                 self.report_skip_fragment(frag_index, 'fragment not found')
             else:
@@ -485,27 +883,105 @@ def append_fragment(frag_content, frag_index, ctx):
 
         max_workers = math.ceil(
             self.params.get('concurrent_fragment_downloads', 1) / ctx.get('max_progress', 1))
-        if max_workers > 1:
+        use_engine = engine is not None or (
+            AsyncFragmentEngine.suitable(self.params) and not info_dict.get('request_data'))
+        if use_engine or max_workers > 1:
             def _download_fragment(fragment):
                 ctx_copy = ctx.copy()
                 download_fragment(fragment, ctx_copy)
-                return fragment, fragment['frag_index'], ctx_copy.get('fragment_filename_sanitized')
+                return fragment, fragment['frag_index'], ctx_copy.get('fragment_filename_sanitized'), None
 
-            with tpe or concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
+            async def _download_fragment_async(fragment):
+                frag_index = fragment['frag_index']
+                if not interrupt_trigger[0]:
+                    return fragment, frag_index, None, None
+                request = pool.prepare_request(fragment['url'], fragment_headers(fragment))
+                if request is None:
+                    return await pool.run_in_thread(_download_fragment, fragment)
+
+                fatal = is_fatal(fragment.get('index') or (frag_index - 1))
+                delays = []
+
+                def error_callback(err, count, retries):
+                    if fatal and count > retries:
+                        ctx['dest_stream'].close()
+                    # Sleeping here would block the event loop
+                    self.report_retry(err, count, retries, frag_index, fatal, sleep=delays.append)
+
+                for retry in RetryManager(self.params.get('fragment_retries'), error_callback):
+                    if delays:
+                        await asyncio.sleep(delays.pop())
+                    try:
+                        return fragment, frag_index, None, await pool.fetch(ctx, info_dict, *request, frag_index)
+                    except (HTTPError, IncompleteRead, TransportError) as err:
+                        retry.error = err
+                        continue
+                return fragment, frag_index, None, None
+
+            writer = None
+            if pack_func is None and _PositionalFragmentWriter.suitable(ctx, fragments):
+                writer = _PositionalFragmentWriter(self, ctx, fragments)
+
+            def write_fragment(job):
+                fragment, frag_index, frag_filename, frag_content = job.result()
+                ctx['fragment_filename_sanitized'] = frag_filename
+                if frag_content is None:
+                    frag_content = self._read_fragment(ctx)
+                if writer is None:
+                    ctx['fragment_index'] = frag_index
+                    return append_fragment(decrypt_fragment(fragment, frag_content), frag_index, ctx)
                 try:
-                    for fragment, frag_index, frag_filename in pool.map(_download_fragment, fragments):
-                        ctx.update({
-                            'fragment_filename_sanitized': frag_filename,
-                            'fragment_index': frag_index,
-                        })
-                        if not append_fragment(decrypt_fragment(fragment, self._read_fragment(ctx)), frag_index, ctx):
-                            return False
+                    return writer.write(frag_content, frag_index, is_fatal(frag_index - 1))
+                finally:
+                    ctx['fragment_index'] = writer.fragment_index
+                    if self.__do_ytdl_file(ctx):
+                        self._write_ytdl_file(ctx)
+                    if frag_filename and not self.params.get('keep_fragments', False):
+                        self.try_remove(encodeFilename(frag_filename))
+                    ctx.pop('fragment_filename_sanitized', None)
+
+            # Fragments of unknown size have to be appended in order, so the number of
+            # fragments that are held back by a slow one is bounded by the window
+            window = self.params.get('fragment_reorder_window') or max_workers * 4
+            fragments = iter(fragments)
+            jobs = collections.deque()
+            if not use_engine:
+                pool_cm, download_func = tpe or concurrent.futures.ThreadPoolExecutor(max_workers), _download_fragment
+            elif engine is not None:
+                pool_cm, download_func = contextlib.nullcontext(engine), _download_fragment_async
+            else:
+                pool_cm = AsyncFragmentEngine(self, self.params.get('concurrent_fragment_downloads', 1))
+                download_func = _download_fragment_async
+            with pool_cm as pool:
+                try:
+                    while True:
+                        while len(jobs) < window and interrupt_trigger[0]:
+                            fragment = next(fragments, None)
+                            if fragment is None:
+                                break
+                            jobs.append(pool.submit(download_func, fragment))
+                        if not jobs:
+                            break
+                        if writer is None:
+                            done = [jobs.popleft()]
+                        else:
+                            done, _ = concurrent.futures.wait(jobs, return_when=concurrent.futures.FIRST_COMPLETED)
+                        for job in done:
+                            if writer is not None:
+                                jobs.remove(job)
+                            if not write_fragment(job):
+                                return False
                 except KeyboardInterrupt:
                     self._finish_multiline_status()
                     self.report_error(
                         'Interrupted by user. Waiting for all threads to shutdown...', is_error=False, tb=False)
+                    for job in jobs:
+                        job.cancel()
                     pool.shutdown(wait=False)
                     raise
+                finally:
+                    if writer is not None:
+                        writer.close()
         else:
             for fragment in fragments:
                 if not interrupt_trigger[0]:
@@ -521,7 +997,30 @@ def _download_fragment(fragment):
                 if not result:
                     return False
 
+        if ctx.get('fragment_holes'):
+            ctx['dest_stream'].flush()
+            self._remove_fragment_holes(ctx)
         if finish_func is not None:
             ctx['dest_stream'].write(finish_func())
             ctx['dest_stream'].flush()
         return self._finish_frag_download(ctx, info_dict)
+
+    def _remove_fragment_holes(self, ctx):
+        """Cut the space reserved for skipped fragments out of the output file"""
+        BLOCK_SIZE = 1024 * 1024
+        with open(encodeFilename(ctx['tmpfilename']), 'r+b') as f:
+            read_pos = write_pos = 0
+            for hole_start, hole_size in [*sorted(ctx['fragment_holes']), (None, 0)]:
+                while hole_start is None or read_pos < hole_start:
+                    f.seek(read_pos)
+                    data = f.read(BLOCK_SIZE if hole_start is None else min(BLOCK_SIZE, hole_start - read_pos))
+                    if not data:
+                        break
+                    f.seek(write_pos)
+                    f.write(data)
+                    read_pos += len(data)
+                    write_pos += len(data)
+                read_pos = max(read_pos, (hole_start or 0) + hole_size)
+            f.truncate(write_pos)
+        ctx['dest_stream'].seek(0, os.SEEK_END)
+        del ctx['fragment_holes']
@@ -1,6 +1,7 @@
 import binascii
 import io
 import re
+import time
 import urllib.parse
 
 from . import get_suitable_downloader
@@ -8,13 +9,14 @@
 from .fragment import FragmentFD
 from .. import webvtt
 from ..dependencies import Cryptodome
+from ..m3u8 import M3U8Playlist
+from ..networking.exceptions import network_exceptions
 from ..utils import (
     bug_reports_message,
-    parse_m3u8_attributes,
+    float_or_none,
     remove_start,
     traverse_obj,
     update_url_query,
-    urljoin,
 )
 
 
@@ -23,9 +25,16 @@ class HlsFD(FragmentFD):
     Download segments in a m3u8 manifest. External downloaders can take over
     the fragment downloads by supporting the 'm3u8_frag_urls' protocol and
     re-defining 'supports_manifest' function
+
+    The media playlist of a live stream is reloaded until it ends, and the new
+    segments are downloaded as they appear
     """
 
     FD_NAME = 'hlsnative'
+    # As of RFC 8216 §6.3.3, playback should not start closer than 3 segments to the live edge
+    _LIVE_EDGE_SEGMENTS = 3
+    # The number of reloads without new segments after which a live stream is considered ended
+    _LIVE_STALL_RELOADS = 20
 
     @staticmethod
     def _has_drm(manifest):  # TODO: https://github.com/yt-dlp/yt-dlp/pull/5039
@@ -63,7 +72,6 @@ def can_download(cls, manifest, info_dict, allow_unplayable_formats=False):
             ]
 
         def check_results():
-            yield not info_dict.get('is_live')
             for feature in UNSUPPORTED_FEATURES:
                 yield not re.search(feature, manifest)
             if not allow_unplayable_formats:
@@ -85,11 +93,16 @@ def real_download(self, filename, info_dict):
             if no_crypto and has_ffmpeg:
                 can_download, message = False, 'The stream has AES-128 encryption and pycryptodomex is not available'
             elif no_crypto:
+                from ..dependencies import numpy
+
                 message = ('The stream has AES-128 encryption and neither ffmpeg nor pycryptodomex are available; '
-                           'Decryption will be performed natively, but will be extremely slow')
-            elif info_dict.get('extractor_key') == 'Generic' and re.search(r'(?m)#EXT-X-MEDIA-SEQUENCE:(?!0$)', s):
+                           'Decryption will be performed natively, but will be slow'
+                           + ('' if numpy else ' unless numpy is installed'))
+            elif (info_dict.get('extractor_key') == 'Generic' and not info_dict.get('is_live')
+                    and re.search(r'(?m)#EXT-X-MEDIA-SEQUENCE:(?!0$)', s)):
                 install_ffmpeg = '' if has_ffmpeg else 'install ffmpeg and '
-                message = ('Live HLS streams are not supported by the native downloader. If this is a livestream, '
+                message = ('The native downloader only follows HLS streams that the extractor reports as live, '
+                           'so only the fragments that are listed now will be downloaded. If this is a livestream, '
                            f'please {install_ffmpeg}add "--downloader ffmpeg --hls-use-mpegts" to your command')
         if not can_download:
             if self._has_drm(s) and not self.params.get('allow_unplayable_formats'):
@@ -107,9 +120,13 @@ def real_download(self, filename, info_dict):
         elif message:
             self.report_warning(message)
 
+        playlist = M3U8Playlist(s, man_url)
+        is_live = bool(info_dict.get('is_live')) and not playlist.endlist
         is_webvtt = info_dict['ext'] == 'vtt'
         if is_webvtt:
             real_downloader = None  # Packing the fragments is not currently supported for external downloader
+        elif is_live:
+            real_downloader = None  # The fragments are not known in advance
         else:
             real_downloader = get_suitable_downloader(
                 info_dict, self.params, None, protocol='m3u8_frag_urls', to_stdout=(filename == '-'))
@@ -118,38 +135,11 @@ def real_download(self, filename, info_dict):
         if real_downloader:
             self.to_screen(f'[{self.FD_NAME}] Fragment downloads will be delegated to {real_downloader.get_basename()}')
 
-        def is_ad_fragment_start(s):
-            return (s.startswith('#ANVATO-SEGMENT-INFO') and 'type=ad' in s
-                    or s.startswith('#UPLYNK-SEGMENT') and s.endswith(',ad'))
-
-        def is_ad_fragment_end(s):
-            return (s.startswith('#ANVATO-SEGMENT-INFO') and 'type=master' in s
-                    or s.startswith('#UPLYNK-SEGMENT') and s.endswith(',segment'))
-
-        fragments = []
-
-        media_frags = 0
-        ad_frags = 0
-        ad_frag_next = False
-        for line in s.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith('#'):
-                if is_ad_fragment_start(line):
-                    ad_frag_next = True
-                elif is_ad_fragment_end(line):
-                    ad_frag_next = False
-                continue
-            if ad_frag_next:
-                ad_frags += 1
-                continue
-            media_frags += 1
-
         ctx = {
             'filename': filename,
-            'total_frags': media_frags,
-            'ad_frags': ad_frags,
+            'total_frags': playlist.segment_count - playlist.ad_segment_count,
+            'ad_frags': playlist.ad_segment_count,
+            'live': is_live,
         }
 
         if real_downloader:
@@ -166,9 +156,6 @@ def is_ad_fragment_end(s):
         extra_key_query = None
         if extra_param_to_key_url := info_dict.get('extra_param_to_key_url'):
             extra_key_query = urllib.parse.parse_qs(extra_param_to_key_url)
-        i = 0
-        media_sequence = 0
-        decrypt_info = {'METHOD': 'NONE'}
         external_aes_key = traverse_obj(info_dict, ('hls_aes', 'key'))
         if external_aes_key:
             external_aes_key = binascii.unhexlify(remove_start(external_aes_key, '0x'))
@@ -176,103 +163,131 @@ def is_ad_fragment_end(s):
         external_aes_iv = traverse_obj(info_dict, ('hls_aes', 'iv'))
         if external_aes_iv:
             external_aes_iv = binascii.unhexlify(remove_start(external_aes_iv, '0x').zfill(32))
-        byte_range = {}
-        discontinuity_count = 0
-        frag_index = 0
-        ad_frag_next = False
-        for line in s.splitlines():
-            line = line.strip()
-            if line:
-                if not line.startswith('#'):
-                    if format_index and discontinuity_count != format_index:
+
+        # The fragments that share a key share its decrypt_info, so that the key is only fetched once
+        decrypt_infos = {}
+
+        def get_decrypt_info(key):
+            cache_key = key and tuple(key.items())
+            decrypt_info = decrypt_infos.get(cache_key)
+            if decrypt_info is not None:
+                return decrypt_info
+            decrypt_info = decrypt_infos[cache_key] = dict(key or {'METHOD': 'NONE'})
+            if decrypt_info['METHOD'] == 'AES-128':
+                if external_aes_iv:
+                    decrypt_info['IV'] = external_aes_iv
+                elif 'IV' in decrypt_info:
+                    decrypt_info['IV'] = binascii.unhexlify(decrypt_info['IV'][2:].zfill(32))
+                if external_aes_key:
+                    decrypt_info['KEY'] = external_aes_key
+                else:
+                    decrypt_info['URI'] = playlist.resolve_url(decrypt_info['URI'])
+                    if extra_key_query or extra_segment_query:
+                        # Fall back to extra_segment_query to key for backwards compat
+                        decrypt_info['URI'] = update_url_query(
+                            decrypt_info['URI'], extra_key_query or extra_segment_query)
+            return decrypt_info
+
+        def build_fragment(segment, frag_index):
+            frag_url = playlist.resolve_url(segment.uri)
+            if extra_segment_query:
+                frag_url = update_url_query(frag_url, extra_segment_query)
+
+            byte_range = {}
+            if segment.byte_range:
+                byte_range['start'], byte_range['end'] = segment.byte_range
+            return {
+                'frag_index': frag_index,
+                'url': frag_url,
+                'decrypt_info': get_decrypt_info(segment.key),
+                'byte_range': byte_range,
+                'media_sequence': segment.media_sequence,
+            }
+
+        def live_fragments():
+            nonlocal playlist
+            frag_index, init, last_init = 0, None, None
+            next_sequence = playlist.next_sequence - self._LIVE_EDGE_SEGMENTS
+            loaded, stalled_reloads = time.time(), 0
+            while True:
+                has_new_segments = False
+                for segment in playlist:
+                    # Only one part of a stream that is split at its discontinuities is downloaded
+                    in_format = not format_index or segment.discontinuity == format_index
+                    if segment.is_init:
+                        if in_format:
+                            init = segment
                         continue
-                    if ad_frag_next:
+                    if segment.media_sequence < next_sequence:
                         continue
-                    frag_index += 1
-                    if frag_index <= ctx['fragment_index']:
-                        continue
-                    frag_url = urljoin(man_url, line)
-                    if extra_segment_query:
-                        frag_url = update_url_query(frag_url, extra_segment_query)
-
-                    fragments.append({
-                        'frag_index': frag_index,
-                        'url': frag_url,
-                        'decrypt_info': decrypt_info,
-                        'byte_range': byte_range,
-                        'media_sequence': media_sequence,
-                    })
-                    media_sequence += 1
-
-                elif line.startswith('#EXT-X-MAP'):
-                    if format_index and discontinuity_count != format_index:
+                    if format_index and segment.discontinuity > format_index:
+                        return
+                    if segment.media_sequence > next_sequence and frag_index:
+                        self.report_warning(
+                            f'{segment.media_sequence - next_sequence} fragments were removed from the '
+                            'playlist before they could be downloaded')
+                    next_sequence, has_new_segments = segment.media_sequence + 1, True
+                    if segment.is_ad or not in_format:
                         continue
+                    if init and (init.uri, init.byte_range) != last_init:
+                        frag_index += 1
+                        last_init = init.uri, init.byte_range
+                        yield build_fragment(init, frag_index)
+                    frag_index += 1
+                    yield build_fragment(segment, frag_index)
+
+                if playlist.endlist:
+                    return
+                stalled_reloads = 0 if has_new_segments else stalled_reloads + 1
+                if stalled_reloads > self._LIVE_STALL_RELOADS:
+                    self.to_screen(
+                        f'[{self.FD_NAME}] The live stream has not been updated in a while; assuming it has ended')
+                    return
+                # As of RFC 8216 §6.3.4, reload after the target duration, or half of it if nothing has changed
+                target_duration = playlist.target_duration or 1
+                if not has_new_segments:
+                    target_duration /= 2
+                reload_url = man_url
+                try:
+                    time.sleep(max(0, target_duration - (time.time() - loaded)))
+                    # A playlist delta update may only be requested with a playlist that is
+                    # not older than half of the skip boundary (RFC 8216bis §6.2.5.1)
+                    can_skip_until = float_or_none(playlist.server_control.get('CAN-SKIP-UNTIL'))
+                    if can_skip_until and time.time() - loaded < can_skip_until / 2:
+                        reload_url = update_url_query(man_url, {'_HLS_skip': 'YES'})
+                    doc = self.ydl.urlopen(self._prepare_url(info_dict, reload_url)).read().decode('utf-8', 'ignore')
+                except network_exceptions as err:
+                    self.report_warning(f'Unable to reload the m3u8 manifest: {err}')
+                    continue
+                except KeyboardInterrupt:
+                    # Keep what has been downloaded, as when a live stream is interrupted during a fragment
+                    return
+                loaded = time.time()
+                playlist = M3U8Playlist(doc, man_url, previous=playlist)
+
+        if is_live:
+            fragments = live_fragments()
+        else:
+            fragments = []
+            frag_index = 0
+            for segment in playlist:
+                if format_index and segment.discontinuity != format_index:
+                    continue
+                if segment.is_init:
                     if frag_index > 0:
                         self.report_error(
                             'Initialization fragment found after media fragments, unable to download')
                         return False
-                    frag_index += 1
-                    map_info = parse_m3u8_attributes(line[11:])
-                    frag_url = urljoin(man_url, map_info.get('URI'))
-                    if extra_segment_query:
-                        frag_url = update_url_query(frag_url, extra_segment_query)
-
-                    if map_info.get('BYTERANGE'):
-                        splitted_byte_range = map_info.get('BYTERANGE').split('@')
-                        sub_range_start = int(splitted_byte_range[1]) if len(splitted_byte_range) == 2 else byte_range['end']
-                        byte_range = {
-                            'start': sub_range_start,
-                            'end': sub_range_start + int(splitted_byte_range[0]),
-                        }
-
-                    fragments.append({
-                        'frag_index': frag_index,
-                        'url': frag_url,
-                        'decrypt_info': decrypt_info,
-                        'byte_range': byte_range,
-                        'media_sequence': media_sequence,
-                    })
-                    media_sequence += 1
-
-                elif line.startswith('#EXT-X-KEY'):
-                    decrypt_url = decrypt_info.get('URI')
-                    decrypt_info = parse_m3u8_attributes(line[11:])
-                    if decrypt_info['METHOD'] == 'AES-128':
-                        if external_aes_iv:
-                            decrypt_info['IV'] = external_aes_iv
-                        elif 'IV' in decrypt_info:
-                            decrypt_info['IV'] = binascii.unhexlify(decrypt_info['IV'][2:].zfill(32))
-                        if external_aes_key:
-                            decrypt_info['KEY'] = external_aes_key
-                        else:
-                            decrypt_info['URI'] = urljoin(man_url, decrypt_info['URI'])
-                            if extra_key_query or extra_segment_query:
-                                # Fall back to extra_segment_query to key for backwards compat
-                                decrypt_info['URI'] = update_url_query(
-                                    decrypt_info['URI'], extra_key_query or extra_segment_query)
-                            if decrypt_url != decrypt_info['URI']:
-                                decrypt_info['KEY'] = None
-
-                elif line.startswith('#EXT-X-MEDIA-SEQUENCE'):
-                    media_sequence = int(line[22:])
-                elif line.startswith('#EXT-X-BYTERANGE'):
-                    splitted_byte_range = line[17:].split('@')
-                    sub_range_start = int(splitted_byte_range[1]) if len(splitted_byte_range) == 2 else byte_range['end']
-                    byte_range = {
-                        'start': sub_range_start,
-                        'end': sub_range_start + int(splitted_byte_range[0]),
-                    }
-                elif is_ad_fragment_start(line):
-                    ad_frag_next = True
-                elif is_ad_fragment_end(line):
-                    ad_frag_next = False
-                elif line.startswith('#EXT-X-DISCONTINUITY'):
-                    discontinuity_count += 1
-                i += 1
+                elif segment.is_ad:
+                    continue
+                frag_index += 1
+                if frag_index <= ctx['fragment_index']:
+                    continue
+                fragments.append(build_fragment(segment, frag_index))
 
         # We only download the first fragment during the test
         if self.params.get('test', False):
-            fragments = [fragments[0] if fragments else None]
+            fragments = [next(iter(fragments), None)]
 
         if real_downloader:
             info_dict['fragments'] = fragments
@@ -372,7 +387,7 @@ def fin_fragments():
 
                 return output.getvalue().encode()
 
-            if len(fragments) == 1:
+            if not is_live and len(fragments) == 1:
                 self.download_and_append_fragments(ctx, fragments, info_dict)
             else:
                 self.download_and_append_fragments(
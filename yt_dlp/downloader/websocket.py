@@ -6,7 +6,6 @@
 
 from .common import FileDownloader
 from .external import FFmpegFD
-from ..dependencies import websockets
 
 
 class FFmpegSinkFD(FileDownloader):
@@ -45,6 +44,8 @@ async def real_connection(self, sink, info_dict):
 
 class WebSocketFragmentFD(FFmpegSinkFD):
     async def real_connection(self, sink, info_dict):
+        from ..dependencies import websockets
+
         async with websockets.connect(info_dict['url'], extra_headers=info_dict.get('http_headers', {})) as ws:
             while True:
                 recv = await ws.recv()
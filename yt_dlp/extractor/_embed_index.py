@@ -0,0 +1,116 @@
+"""
+Index of the extractors by the text that must appear in a webpage for them to find embeds in it
+
+Most extractors find their embeds only with the `_EMBED_REGEX` regexes, and every match
+of these has some literal text, such as `youtube.com/embed/` or `<iframe`. The literals
+are searched for in the webpage once, and only the extractors with a literal in the
+webpage need to run their regexes. Extractors with their own `_extract_from_webpage`
+or `_extract_embed_urls`, or with regexes that cannot be analysed, always run
+"""
+
+import functools
+import re
+
+try:
+    import re._constants as sre_constants  # Python 3.11+
+    import re._parser as sre_parse
+except ImportError:
+    import sre_constants
+    import sre_parse
+
+# Shorter literals are in almost every webpage
+_MIN_LITERAL_LENGTH = 3
+# The non-ASCII characters that match an ASCII letter with re.IGNORECASE
+_CASE_FOLDING = str.maketrans({'İ': 'i', 'ı': 'i', 'ſ': 's', 'K': 'k'})
+_REPEATS = tuple(filter(None, (
+    sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, getattr(sre_constants, 'POSSESSIVE_REPEAT', None))))
+
+
+def _ascii_literal(op, av):
+    if op is sre_constants.IN and len(av) == 1:
+        op, av = av[0]
+    return chr(av).lower() if op is sre_constants.LITERAL and av < 128 else None
+
+
+def _required_literals(pattern):
+    """A set of lowercase literals one of which is in every match of the parsed pattern, or None"""
+    candidates, run = [], ''
+    for op, av in (*pattern, (None, None)):
+        char = op and _ascii_literal(op, av)
+        if char:
+            run += char
+            continue
+        if len(run) >= _MIN_LITERAL_LENGTH:
+            candidates.append({run})
+        run = ''
+
+        if op is sre_constants.SUBPATTERN:
+            required = _required_literals(av[-1])
+        elif op is getattr(sre_constants, 'ATOMIC_GROUP', None):
+            required = _required_literals(av)
+        elif op in _REPEATS and av[0]:
+            required = _required_literals(av[2])
+        elif op is sre_constants.ASSERT:
+            required = _required_literals(av[1])
+        elif op is sre_constants.BRANCH:
+            branches = [_required_literals(branch) for branch in av[1]]
+            required = None if None in branches else set().union(*branches)
+        else:
+            required = None
+        if required:
+            candidates.append(required)
+
+    # The longest literals are found in the fewest webpages
+    return min(candidates, key=lambda literals: (-min(map(len, literals)), len(literals)), default=None)
+
+
+def _uses_embed_regex(ie):
+    from .common import InfoExtractor
+
+    return all(
+        getattr(getattr(ie, name), '__func__', None) is getattr(InfoExtractor, name).__func__
+        for name in ('extract_from_webpage', '_extract_from_webpage', '_extract_embed_urls'))
+
+
+@functools.cache
+def embed_literals(ie):
+    """
+    The literals one of which must be in the lowercase webpage for the extractor class
+    to find embeds in it, or None if the extractor must always be tried
+    """
+    if not _uses_embed_regex(ie):
+        return None
+    literals = set()
+    for regex in ie._EMBED_REGEX:
+        try:
+            required = _required_literals(sre_parse.parse(regex))
+        except (re.error, RecursionError):
+            return None
+        if not required:
+            return None
+        literals.update(required)
+    return frozenset(literals)
+
+
+class EmbedFilter:
+    """Tells which extractors may find embeds in a webpage"""
+
+    def __init__(self, webpage):
+        self._webpage = webpage
+        self._found = {}
+
+    @functools.cached_property
+    def _text(self):
+        return self._webpage.translate(_CASE_FOLDING).lower()
+
+    def _contains(self, literal):
+        found = self._found.get(literal)
+        if found is None:
+            found = self._found[literal] = literal in self._text
+        return found
+
+    def may_have_embeds(self, ie):
+        """Whether the extractor, a class or an instance, may find embeds in the webpage"""
+        ie = ie if isinstance(ie, type) else type(ie)
+        literals = embed_literals(getattr(ie, 'real_class', ie))
+        return literals is None or any(map(self._contains, sorted(literals)))
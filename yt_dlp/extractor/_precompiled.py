@@ -0,0 +1,87 @@
+"""
+Regexes compiled ahead of time
+
+Parsing the `_VALID_URL` regexes is most of the time taken to find the extractor for
+a URL that is only matched by the generic extractor. devscripts/make_lazy_extractors.py
+stores the compiled code of the regexes in lazy_extractors.py, which the same version
+of Python can load without parsing the regexes again
+"""
+
+import _sre
+import array
+import base64
+import marshal
+import re
+import sys
+import zlib
+
+try:
+    import re._compiler as sre_compile  # Python 3.11+
+    import re._constants as sre_constants
+    import re._parser as sre_parse
+except ImportError:
+    import sre_compile
+    import sre_constants
+    import sre_parse
+
+
+def _code_key():
+    """Everything that the compiled code of a regex depends on"""
+    return (
+        sys.implementation.name, sys.implementation.cache_tag, sys.version_info[:2], sre_constants.MAGIC,
+        _sre.CODESIZE, array.array('I').itemsize, sys.byteorder, marshal.version)
+
+
+def _compile(pattern, compiled):
+    flags, groups, groupindex, indexgroup, code = compiled
+    return _sre.compile(pattern, flags, array.array('I', code).tolist(), groups, groupindex, indexgroup)
+
+
+def serialize_regexes(patterns):
+    """Compile the regexes, and return the arguments for PrecompiledRegexes"""
+    regexes = {}
+    for pattern in sorted(set(patterns)):
+        parsed = sre_parse.parse(pattern, 0)
+        indexgroup = [None] * parsed.state.groups
+        for name, index in parsed.state.groupdict.items():
+            indexgroup[index] = name
+        compiled = (
+            parsed.state.flags, parsed.state.groups - 1, dict(parsed.state.groupdict), tuple(indexgroup),
+            array.array('I', sre_compile._code(parsed, 0)).tobytes())
+        # Only keep the regexes that compile exactly as re.compile would
+        if _compile(pattern, compiled) == re.compile(pattern):
+            regexes[pattern] = compiled
+    return _code_key(), base64.encodebytes(zlib.compress(marshal.dumps(regexes), 9)).decode()
+
+
+class PrecompiledRegexes:
+    """
+    Regexes that have been compiled by serialize_regexes
+
+    @param key      The version of the compiled code. If it does not match the running
+                    Python, all the regexes are compiled normally
+    @param data     The compiled regexes, encoded by serialize_regexes
+    """
+
+    def __init__(self, key, data):
+        self._key, self._data = key, data
+        self._regexes = None
+
+    def _load(self):
+        if self._key != _code_key():
+            return {}
+        try:
+            return marshal.loads(zlib.decompress(base64.b64decode(self._data)))
+        except (ValueError, EOFError, TypeError, zlib.error):
+            return {}
+
+    def compile(self, pattern):
+        if self._regexes is None:
+            self._regexes = self._load()
+        compiled = self._regexes.get(pattern)
+        if compiled is not None:
+            try:
+                return _compile(pattern, compiled)
+            except (TypeError, ValueError, RuntimeError):  # _sre raises RuntimeError for invalid code
+                pass
+        return re.compile(pattern)
@@ -0,0 +1,284 @@
+"""
+Index of the extractors by the words that must appear in the host of the URLs they match
+
+For example, every URL that matches `https?://(?:www\\.)?youtube\\.com/watch` has the
+word "youtube" in its host. The index is built from the `_VALID_URL` regexes by
+devscripts/make_lazy_extractors.py, so that only the extractors that may be
+suitable for a URL need to be tried. Extractors whose regexes cannot be
+analysed are always tried, and the candidates keep their original order
+"""
+
+import collections
+import functools
+import itertools
+import re
+
+try:
+    import re._constants as sre_constants  # Python 3.11+
+    import re._parser as sre_parse
+except ImportError:
+    import sre_constants
+    import sre_parse
+
+_TOKEN_RE = re.compile(r'[a-z0-9_-]+')
+_TOKEN_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789_-')
+# Non-ASCII characters whose lowercase form contains a token character
+_TOKEN_PROBE = ''.join(sorted(_TOKEN_CHARS)) + 'ABCDEFGHIJKLMNOPQRSTUVWXYZİK'
+_URL_HOST_RE = re.compile(r'(?:[a-zA-Z][a-zA-Z0-9+.-]*:)?//([^/]*)')
+_SCHEME_RE = re.compile(r'[a-z][a-z0-9+.-]*')
+
+# Patterns that expand to more alternatives than this are not indexed
+_MAX_ALTERNATIVES = 256
+
+
+class _Unindexable(Exception):
+    pass
+
+
+# Any string of the characters a part of the pattern can match
+_Wildcard = collections.namedtuple('_Wildcard', ('slash', 'token', 'empty'))
+_ANYTHING = _Wildcard(True, True, True)
+_END = object()
+
+
+def url_host_tokens(url):
+    """The words in the host of the URL, or None if the URL has no host"""
+    mobj = _URL_HOST_RE.match(url)
+    return mobj and set(_TOKEN_RE.findall(mobj.group(1).lower()))
+
+
+def _class_matches(items, char):
+    matched = negate = False
+    for op, av in items:
+        if op is sre_constants.NEGATE:
+            negate = True
+        elif op is sre_constants.LITERAL:
+            matched = matched or chr(av) == char
+        elif op is sre_constants.RANGE:
+            matched = matched or av[0] <= ord(char) <= av[1]
+        elif op is sre_constants.CATEGORY:
+            category = {
+                sre_constants.CATEGORY_DIGIT: r'\d',
+                sre_constants.CATEGORY_NOT_DIGIT: r'\D',
+                sre_constants.CATEGORY_SPACE: r'\s',
+                sre_constants.CATEGORY_NOT_SPACE: r'\S',
+                sre_constants.CATEGORY_WORD: r'\w',
+                sre_constants.CATEGORY_NOT_WORD: r'\W',
+            }.get(av)
+            matched = matched or category is None or bool(re.fullmatch(category, char))
+        else:
+            return True
+    return matched != negate
+
+
+def _can_match(pattern, flags, chars):
+    """Whether the pattern can match a string that contains any of the characters"""
+    for op, av in pattern:
+        if op is sre_constants.LITERAL:
+            if chr(av).lower() in chars or chr(av) in chars:
+                return True
+        elif op is sre_constants.NOT_LITERAL:
+            if any(char != chr(av) for char in chars):
+                return True
+        elif op is sre_constants.IN:
+            if any(_class_matches(av, case_char) for char in chars for case_char in (
+                    (char, char.lower(), char.upper()) if flags & re.IGNORECASE else (char,))):
+                return True
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT,
+                    getattr(sre_constants, 'POSSESSIVE_REPEAT', None)):
+            if av[1] and _can_match(av[2], flags, chars):
+                return True
+        elif op is sre_constants.SUBPATTERN:
+            if _can_match(av[-1], (flags | av[1]) & ~av[2], chars):
+                return True
+        elif op is sre_constants.BRANCH:
+            if any(_can_match(branch, flags, chars) for branch in av[1]):
+                return True
+        elif op is getattr(sre_constants, 'ATOMIC_GROUP', None):
+            if _can_match(av, flags, chars):
+                return True
+        elif op not in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            return True
+    return False
+
+
+def _wildcard(pattern, flags, empty):
+    """A wildcard for anything that the pattern can match"""
+    return _Wildcard(_can_match(pattern, flags, '/'), _can_match(pattern, flags, _TOKEN_PROBE), empty)
+
+
+def _concat(*alternatives):
+    result = [()]
+    for alts in alternatives:
+        result = [a + b for a, b in itertools.product(result, alts)]
+        if len(result) > _MAX_ALTERNATIVES:
+            raise _Unindexable
+    return result
+
+
+def _expand(pattern, flags):
+    """All the alternatives of the pattern, as tuples of lowercase characters and wildcards"""
+    result = [()]
+    for op, av in pattern:
+        if op is sre_constants.LITERAL:
+            alts = [(chr(av).lower(),)]
+        elif op is sre_constants.IN and len(av) == 1 and av[0][0] is sre_constants.LITERAL:
+            alts = [(chr(av[0][1]).lower(),)]
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT,
+                    getattr(sre_constants, 'POSSESSIVE_REPEAT', None)):
+            min_count, max_count, sub = av
+            if max_count == 0:
+                alts = [()]
+            elif (min_count, max_count) == (0, 1):
+                alts = [*_expand(sub, flags), ()]
+            else:
+                alts = [(_wildcard(sub, flags, empty=min_count == 0),)]
+        elif op is sre_constants.SUBPATTERN:
+            alts = _expand(av[-1], (flags | av[1]) & ~av[2])
+        elif op is getattr(sre_constants, 'ATOMIC_GROUP', None):
+            alts = _expand(av, flags)
+        elif op is sre_constants.BRANCH:
+            alts = [alt for branch in av[1] for alt in _expand(branch, flags)]
+        elif op is sre_constants.GROUPREF_EXISTS:
+            alts = [*_expand(av[1], flags), *(_expand(av[2], flags) if av[2] else [()])]
+        elif op is sre_constants.AT:
+            alts = [(_END,)] if av in (sre_constants.AT_END, sre_constants.AT_END_STRING) else [()]
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            alts = [()]
+        elif op in (sre_constants.IN, sre_constants.ANY, sre_constants.NOT_LITERAL):
+            alts = [(_wildcard([(op, av)], flags, empty=False),)]
+        else:
+            alts = [(_ANYTHING,)]
+        result = _concat(result, alts)
+    return result
+
+
+def _host_tokens(alternative):
+    """The words that are always complete in the host of a URL that the alternative matches"""
+    index = next((i for i, item in enumerate(alternative) if not isinstance(item, str)), len(alternative))
+    prefix = ''.join(alternative[:index])
+    if prefix.startswith('//'):
+        start = 2
+    else:
+        scheme, sep, _ = prefix.partition('://')
+        if not sep or not _SCHEME_RE.fullmatch(scheme):
+            return set()
+        start = len(scheme) + 3
+
+    tokens, token, left_complete = set(), '', True
+    # The match may continue with anything unless it is anchored
+    for item in (*alternative[start:], _ANYTHING):
+        if item is _END or item == '/':
+            if token and left_complete:
+                tokens.add(token)
+            break
+        elif isinstance(item, str):
+            if item in _TOKEN_CHARS:
+                token += item
+                continue
+            if token and left_complete:
+                tokens.add(token)
+            token, left_complete = '', True
+        else:
+            # A wildcard is only a word boundary if it always matches something other than a word character
+            is_delimiter = not item.token and not item.empty
+            if token and left_complete and is_delimiter:
+                tokens.add(token)
+            if item.slash:
+                break
+            token, left_complete = '', is_delimiter
+    return tokens
+
+
+def valid_url_tokens(valid_url):
+    """
+    The sets of words that a URL matching _VALID_URL has in its host, one for
+    each alternative of the regexes. Returns None if the regexes cannot be analysed
+    """
+    if valid_url is False:
+        return []
+    patterns = [valid_url] if isinstance(valid_url, str) else valid_url
+    try:
+        alternatives = [alt for pattern in patterns for alt in _expand(sre_parse.parse(pattern), 0)]
+    except (_Unindexable, re.error, RecursionError):
+        return None
+    result = []
+    for alternative in alternatives:
+        tokens = _host_tokens(alternative)
+        if not tokens:
+            return None
+        result.append(tokens)
+    return result
+
+
+def build_url_index(ie_classes):
+    """
+    Build a dict that maps a word to the keys of the extractors that may match a URL with the word in its host.
+    Extractors that never match any URL are listed under the empty string.
+    Extractors that are not in the index must always be tried
+    """
+    from .common import InfoExtractor
+
+    ie_tokens = {}
+    for ie in ie_classes:
+        if (ie.suitable.__func__ is not InfoExtractor.suitable.__func__
+                or ie._match_valid_url.__func__ is not InfoExtractor._match_valid_url.__func__):
+            continue
+        tokens = valid_url_tokens(ie._VALID_URL)
+        if tokens is not None:
+            ie_tokens[ie.ie_key()] = tokens
+
+    # Index each alternative under its least common word, so that URLs have few candidates
+    counts = collections.Counter(token for tokens in ie_tokens.values() for token in set().union(*tokens))
+    index = collections.defaultdict(list)
+    for ie_key, tokens in ie_tokens.items():
+        keys = {min(alternative, key=lambda token: (counts[token], -len(token), token)) for alternative in tokens}
+        for key in sorted(keys) or ['']:
+            index[key].append(ie_key)
+    return {token: tuple(ie_keys) for token, ie_keys in sorted(index.items())}
+
+
+@functools.lru_cache(maxsize=None)
+def get_url_index():
+    from .extractors import _LAZY_LOADER
+
+    if not _LAZY_LOADER:
+        # Building the index takes longer than trying every extractor for a few URLs
+        return {}
+    from . import lazy_extractors
+
+    # Lazy extractors made by older versions have no index
+    return getattr(lazy_extractors, '_URL_INDEX', {})
+
+
+class ExtractorIndex:
+    """The extractors of a YoutubeDL instance, looked up by the host of a URL"""
+
+    def __init__(self, ies, url_index):
+        self._ies = ies
+        self._keys = list(ies)
+        positions = {}
+        for position, (ie_key, ie) in enumerate(ies.items()):
+            # Plugins, including those that override a builtin extractor, are always tried
+            if (ie if isinstance(ie, type) else type(ie)).__module__.startswith('yt_dlp.extractor.'):
+                positions[ie_key] = position
+        self._by_token = {}
+        indexed = set()
+        for token, ie_keys in url_index.items():
+            self._by_token[token] = [positions[ie_key] for ie_key in ie_keys if ie_key in positions]
+            indexed.update(self._by_token[token])
+        self._always = [position for position in range(len(self._keys)) if position not in indexed]
+
+    def candidates(self, url):
+        """Yield the (ie_key, ie) pairs that may be suitable for the URL, in order"""
+        tokens = url_host_tokens(url) if len(self._always) < len(self._keys) else None
+        if tokens is None:
+            positions = range(len(self._keys))
+        else:
+            positions = set(self._always)
+            for token in tokens:
+                positions.update(self._by_token.get(token, ()))
+            positions = sorted(positions)
+        for position in positions:
+            ie_key = self._keys[position]
+            yield ie_key, self._ies[ie_key]
@@ -31,6 +31,7 @@
 from ..cookies import LenientSimpleCookie
 from ..downloader.f4m import get_base_url, remove_encrypted_media
 from ..downloader.hls import HlsFD
+from ..m3u8 import M3U8Playlist
 from ..networking import HEADRequest, Request
 from ..networking.exceptions import (
     HTTPError,
@@ -75,7 +76,6 @@
     parse_codecs,
     parse_duration,
     parse_iso8601,
-    parse_m3u8_attributes,
     parse_resolution,
     sanitize_filename,
     sanitize_url,
@@ -590,6 +590,10 @@ def __init__(self, downloader=None):
         self._printed_messages = set()
         self.set_downloader(downloader)
 
+    @classmethod
+    def _compile_valid_url(cls):
+        return tuple(map(re.compile, variadic(cls._VALID_URL)))
+
     @classmethod
     def _match_valid_url(cls, url):
         if cls._VALID_URL is False:
@@ -598,7 +602,7 @@ def _match_valid_url(cls, url):
         # we have cached the regexp for *this* class, whereas getattr would also
         # match the superclass
         if '_VALID_URL_RE' not in cls.__dict__:
-            cls._VALID_URL_RE = tuple(map(re.compile, variadic(cls._VALID_URL)))
+            cls._VALID_URL_RE = cls._compile_valid_url()
         return next(filter(None, (regex.match(url) for regex in cls._VALID_URL_RE)), None)
 
     @classmethod
@@ -847,8 +851,9 @@ def _request_webpage(self, url_or_request, video_id, note=None, errnote=None, fa
         if not self._downloader._first_webpage_request:
             sleep_interval = self.get_param('sleep_interval_requests') or 0
             if sleep_interval > 0:
-                self.to_screen(f'Sleeping {sleep_interval} seconds ...')
-                time.sleep(sleep_interval)
+                with self._downloader._request_sleep_lock:
+                    self.to_screen(f'Sleeping {sleep_interval} seconds ...')
+                    time.sleep(sleep_interval)
         else:
             self._downloader._first_webpage_request = False
 
@@ -869,7 +874,10 @@ def _request_webpage(self, url_or_request, video_id, note=None, errnote=None, fa
             headers = (headers or {}).copy()
             headers.setdefault('X-Forwarded-For', self._x_forwarded_for_ip)
 
-        extensions = {}
+        extensions = {
+            'rate_limit': self._rate_limit_options(),
+            'http_cache': {'ttl': float_or_none(self._configuration_arg('cache_ttl', [None])[0])},
+        }
 
         if impersonate in (True, ''):
             impersonate = ImpersonateTarget()
@@ -2077,7 +2085,7 @@ def _extract_m3u8_playlist_indices(manifest_url=None, m3u8_doc=None):
                         note=False, errnote='Failed to download m3u8 playlist information')
                     if m3u8_doc is False:
                         return []
-                return range(1 + sum(line.startswith('#EXT-X-DISCONTINUITY') for line in m3u8_doc.splitlines()))
+                return range(1 + M3U8Playlist(m3u8_doc).discontinuity_count)
 
         else:
             def _extract_m3u8_playlist_indices(*args, **kwargs):
@@ -2099,7 +2107,7 @@ def _extract_m3u8_playlist_indices(*args, **kwargs):
         # media playlist and MUST NOT appear in master playlist thus we can
         # clearly detect media playlist with this criterion.
 
-        if '#EXT-X-TARGETDURATION' in m3u8_doc:  # media playlist, return as is
+        if M3U8Playlist.is_media_playlist(m3u8_doc):  # media playlist, return as is
             formats = [{
                 'format_id': join_nonempty(m3u8_id, idx),
                 'format_index': idx,
@@ -2113,11 +2121,10 @@ def _extract_m3u8_playlist_indices(*args, **kwargs):
 
             return formats, subtitles
 
+        playlist = M3U8Playlist(m3u8_doc, m3u8_url)
         groups = {}
-        last_stream_inf = {}
 
-        def extract_media(x_media_line):
-            media = parse_m3u8_attributes(x_media_line)
+        def extract_media(media):
             # As per [1, 4.3.4.1] TYPE, GROUP-ID and NAME are REQUIRED
             media_type, group_id, name = media.get('TYPE'), media.get('GROUP-ID'), media.get('NAME')
             if not (media_type and group_id and name):
@@ -2186,98 +2193,91 @@ def build_stream_name():
         # parse EXT-X-MEDIA tags before EXT-X-STREAM-INF in order to have the
         # chance to detect video only formats when EXT-X-STREAM-INF tags
         # precede EXT-X-MEDIA tags in HLS manifest such as [3].
-        for line in m3u8_doc.splitlines():
-            if line.startswith('#EXT-X-MEDIA:'):
-                extract_media(line)
-
-        for line in m3u8_doc.splitlines():
-            if line.startswith('#EXT-X-STREAM-INF:'):
-                last_stream_inf = parse_m3u8_attributes(line)
-            elif line.startswith('#') or not line.strip():
-                continue
-            else:
-                tbr = float_or_none(
-                    last_stream_inf.get('AVERAGE-BANDWIDTH')
-                    or last_stream_inf.get('BANDWIDTH'), scale=1000)
-                manifest_url = format_url(line.strip())
-
-                for idx in _extract_m3u8_playlist_indices(manifest_url):
-                    format_id = [m3u8_id, None, idx]
-                    # Bandwidth of live streams may differ over time thus making
-                    # format_id unpredictable. So it's better to keep provided
-                    # format_id intact.
-                    if not live:
-                        stream_name = build_stream_name()
-                        format_id[1] = stream_name or '%d' % (tbr or len(formats))
-                    f = {
-                        'format_id': join_nonempty(*format_id),
-                        'format_index': idx,
-                        'url': manifest_url,
-                        'manifest_url': m3u8_url,
-                        'tbr': tbr,
-                        'ext': ext,
-                        'fps': float_or_none(last_stream_inf.get('FRAME-RATE')),
-                        'protocol': entry_protocol,
-                        'preference': preference,
-                        'quality': quality,
-                        'has_drm': has_drm,
-                    }
+        for media in playlist.media:
+            extract_media(media)
+
+        for last_stream_inf, variant_url in playlist.variants:
+            tbr = float_or_none(
+                last_stream_inf.get('AVERAGE-BANDWIDTH')
+                or last_stream_inf.get('BANDWIDTH'), scale=1000)
+            manifest_url = format_url(variant_url)
+
+            for idx in _extract_m3u8_playlist_indices(manifest_url):
+                format_id = [m3u8_id, None, idx]
+                # Bandwidth of live streams may differ over time thus making
+                # format_id unpredictable. So it's better to keep provided
+                # format_id intact.
+                if not live:
+                    stream_name = build_stream_name()
+                    format_id[1] = stream_name or '%d' % (tbr or len(formats))
+                f = {
+                    'format_id': join_nonempty(*format_id),
+                    'format_index': idx,
+                    'url': manifest_url,
+                    'manifest_url': m3u8_url,
+                    'tbr': tbr,
+                    'ext': ext,
+                    'fps': float_or_none(last_stream_inf.get('FRAME-RATE')),
+                    'protocol': entry_protocol,
+                    'preference': preference,
+                    'quality': quality,
+                    'has_drm': has_drm,
+                }
+
+                # YouTube-specific
+                if yt_audio_content_id := last_stream_inf.get('YT-EXT-AUDIO-CONTENT-ID'):
+                    f['language'] = yt_audio_content_id.split('.')[0]
 
-                    # YouTube-specific
-                    if yt_audio_content_id := last_stream_inf.get('YT-EXT-AUDIO-CONTENT-ID'):
-                        f['language'] = yt_audio_content_id.split('.')[0]
-
-                    resolution = last_stream_inf.get('RESOLUTION')
-                    if resolution:
-                        mobj = re.search(r'(?P<width>\d+)[xX](?P<height>\d+)', resolution)
-                        if mobj:
-                            f['width'] = int(mobj.group('width'))
-                            f['height'] = int(mobj.group('height'))
-                    # Unified Streaming Platform
-                    mobj = re.search(
-                        r'audio.*?(?:%3D|=)(\d+)(?:-video.*?(?:%3D|=)(\d+))?', f['url'])
+                resolution = last_stream_inf.get('RESOLUTION')
+                if resolution:
+                    mobj = re.search(r'(?P<width>\d+)[xX](?P<height>\d+)', resolution)
                     if mobj:
-                        abr, vbr = mobj.groups()
-                        abr, vbr = float_or_none(abr, 1000), float_or_none(vbr, 1000)
-                        f.update({
-                            'vbr': vbr,
-                            'abr': abr,
-                        })
-                    codecs = parse_codecs(last_stream_inf.get('CODECS'))
-                    f.update(codecs)
-                    audio_group_id = last_stream_inf.get('AUDIO')
-                    # As per [1, 4.3.4.1.1] any EXT-X-STREAM-INF tag which
-                    # references a rendition group MUST have a CODECS attribute.
-                    # However, this is not always respected. E.g. [2]
-                    # contains EXT-X-STREAM-INF tag which references AUDIO
-                    # rendition group but does not have CODECS and despite
-                    # referencing an audio group it represents a complete
-                    # (with audio and video) format. So, for such cases we will
-                    # ignore references to rendition groups and treat them
-                    # as complete formats.
-                    if audio_group_id and codecs and f.get('vcodec') != 'none':
-                        audio_group = groups.get(audio_group_id)
-                        if audio_group and audio_group[0].get('URI'):
-                            # TODO: update acodec for audio only formats with
-                            # the same GROUP-ID
-                            f['acodec'] = 'none'
-                    if not f.get('ext'):
-                        f['ext'] = 'm4a' if f.get('vcodec') == 'none' else 'mp4'
-                    formats.append(f)
-
-                    # for DailyMotion
-                    progressive_uri = last_stream_inf.get('PROGRESSIVE-URI')
-                    if progressive_uri:
-                        http_f = f.copy()
-                        del http_f['manifest_url']
-                        http_f.update({
-                            'format_id': f['format_id'].replace('hls-', 'http-'),
-                            'protocol': 'http',
-                            'url': progressive_uri,
-                        })
-                        formats.append(http_f)
+                        f['width'] = int(mobj.group('width'))
+                        f['height'] = int(mobj.group('height'))
+                # Unified Streaming Platform
+                mobj = re.search(
+                    r'audio.*?(?:%3D|=)(\d+)(?:-video.*?(?:%3D|=)(\d+))?', f['url'])
+                if mobj:
+                    abr, vbr = mobj.groups()
+                    abr, vbr = float_or_none(abr, 1000), float_or_none(vbr, 1000)
+                    f.update({
+                        'vbr': vbr,
+                        'abr': abr,
+                    })
+                codecs = parse_codecs(last_stream_inf.get('CODECS'))
+                f.update(codecs)
+                audio_group_id = last_stream_inf.get('AUDIO')
+                # As per [1, 4.3.4.1.1] any EXT-X-STREAM-INF tag which
+                # references a rendition group MUST have a CODECS attribute.
+                # However, this is not always respected. E.g. [2]
+                # contains EXT-X-STREAM-INF tag which references AUDIO
+                # rendition group but does not have CODECS and despite
+                # referencing an audio group it represents a complete
+                # (with audio and video) format. So, for such cases we will
+                # ignore references to rendition groups and treat them
+                # as complete formats.
+                if audio_group_id and codecs and f.get('vcodec') != 'none':
+                    audio_group = groups.get(audio_group_id)
+                    if audio_group and audio_group[0].get('URI'):
+                        # TODO: update acodec for audio only formats with
+                        # the same GROUP-ID
+                        f['acodec'] = 'none'
+                if not f.get('ext'):
+                    f['ext'] = 'm4a' if f.get('vcodec') == 'none' else 'mp4'
+                formats.append(f)
+
+                # for DailyMotion
+                progressive_uri = last_stream_inf.get('PROGRESSIVE-URI')
+                if progressive_uri:
+                    http_f = f.copy()
+                    del http_f['manifest_url']
+                    http_f.update({
+                        'format_id': f['format_id'].replace('hls-', 'http-'),
+                        'protocol': 'http',
+                        'url': progressive_uri,
+                    })
+                    formats.append(http_f)
 
-                last_stream_inf = {}
         return formats, subtitles
 
     def _extract_m3u8_vod_duration(
@@ -2292,12 +2292,11 @@ def _extract_m3u8_vod_duration(
         return self._parse_m3u8_vod_duration(m3u8_vod or '', video_id)
 
     def _parse_m3u8_vod_duration(self, m3u8_vod, video_id):
-        if '#EXT-X-ENDLIST' not in m3u8_vod:
+        playlist = M3U8Playlist(m3u8_vod)
+        if not playlist.endlist:
             return None
 
-        return int(sum(
-            float(line[len('#EXTINF:'):].split(',')[0])
-            for line in m3u8_vod.splitlines() if line.startswith('#EXTINF:'))) or None
+        return int(playlist.duration) or None
 
     def _extract_mpd_vod_duration(
             self, mpd_url, video_id, note=None, errnote=None, data=None, headers={}, query={}):
@@ -3849,6 +3848,14 @@ def _configuration_arg(self, key, default=NO_DEFAULT, *, ie_key=None, casesense=
             return [] if default is NO_DEFAULT else default
         return list(val) if casesense else [x.lower() for x in val]
 
+    def _rate_limit_options(self):
+        """The rate_limit extension of the requests made by this extractor (see RequestScheduler)"""
+        return {
+            'key': self.ie_key(),
+            'rate': float_or_none(self._configuration_arg('rate_limit', [None])[0]),
+            'burst': int_or_none(self._configuration_arg('rate_burst', [None])[0]),
+        }
+
     def _yes_playlist(self, playlist_id, video_id, smuggled_data=None, *, playlist_label='playlist', video_label='video'):
         if not playlist_id or not video_id:
             return not video_id
@@ -4,6 +4,7 @@
 import urllib.parse
 import xml.etree.ElementTree
 
+from ._embed_index import EmbedFilter
 from .common import InfoExtractor
 from .commonprotocols import RtmpIE
 from .youtube import YoutubeIE
@@ -2540,9 +2541,12 @@ def _extract_embeds(self, url, webpage, *, urlh=None, info_dict={}):
         # webpage = urllib.parse.unquote(webpage)
 
         embeds = []
+        embed_filter = EmbedFilter(webpage)
         for ie in self._downloader._ies.values():
             if ie.ie_key() in smuggled_data.get('block_ies', []):
                 continue
+            if not embed_filter.may_have_embeds(ie):
+                continue
             gen = ie.extract_from_webpage(self._downloader, url, webpage)
             current_embeds = []
             try:
@@ -1,10 +1,12 @@
 import collections
 import contextlib
+import functools
 import itertools
 import json
 import math
 import operator
 import re
+import time
 
 from .utils import (
     NO_DEFAULT,
@@ -133,6 +135,23 @@ def _js_ternary(cndn, if_true=True, if_false=False):
 _NAME_RE = r'[a-zA-Z_$][\w$]*'
 _MATCHING_PARENS = dict(zip(*zip('()', '{}', '[]')))
 _QUOTES = '\'"/'
+_INCREMENT_RE = re.compile(rf'''(?x)
+    (?P<pre_sign>\+\+|--)(?P<var1>{_NAME_RE})|
+    (?P<var2>{_NAME_RE})(?P<post_sign>\+\+|--)''')
+_EXPRESSION_RE = re.compile(fr'''(?x)
+    (?P<assign>
+        (?P<out>{_NAME_RE})(?:\[(?P<index>[^\]]+?)\])?\s*
+        (?P<op>{"|".join(map(re.escape, set(_OPERATORS) - _COMP_OPERATORS))})?
+        =(?!=)(?P<expr>.*)$
+    )|(?P<return>
+        (?!if|return|true|false|null|undefined|NaN)(?P<name>{_NAME_RE})$
+    )|(?P<indexing>
+        (?P<in>{_NAME_RE})\[(?P<idx>.+)\]$
+    )|(?P<attribute>
+        (?P<var>{_NAME_RE})(?:(?P<nullish>\?)?\.(?P<member>[^(]+)|\[(?P<member2>[^\]]+)\])\s*
+    )|(?P<function>
+        (?P<fname>{_NAME_RE})\((?P<args>.*)\)$
+    )''')
 
 
 class JS_Undefined:
@@ -170,15 +189,56 @@ def __delitem__(self, key):
 class Debugger:
     import sys
     ENABLED = False and 'pytest' in sys.modules
+    # {statement type: [count, total time, own time]}; set to a dict to collect timings
+    PROFILE = None
+    _profile_stack = []
 
     @staticmethod
     def write(*args, level=100):
         write_string(f'[debug] JS: {"  " * (100 - level)}'
                      f'{" ".join(truncate_string(str(x), 50, 50) for x in args)}\n')
 
+    @staticmethod
+    def statement_type(stmt):
+        stmt = stmt.strip()
+        if len(JSInterpreter._separate(stmt, ';')) > 1:
+            return 'statements'
+        m = re.match(r'(?:var|const|let|return|throw|new|void|try|if|switch|for|break|continue)\b', stmt)
+        if m:
+            return m.group(0)
+        elif not stmt:
+            return 'empty'
+        elif stmt[0] in _QUOTES:
+            return 'literal'
+        elif stmt[0] in _MATCHING_PARENS:
+            return {'(': 'group', '{': 'block', '[': 'array'}[stmt[0]]
+        m = _EXPRESSION_RE.match(stmt)
+        if m:
+            return m.lastgroup
+        return 'expression'
+
+    @classmethod
+    def _profile(cls, f, stmt, *args, **kwargs):
+        start, stack = time.perf_counter(), cls._profile_stack
+        stack.append(0)
+        try:
+            return f(stmt, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            own = elapsed - stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            stats = cls.PROFILE.setdefault(cls.statement_type(stmt), [0, 0, 0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] += own
+
     @classmethod
     def wrap_interpreter(cls, f):
         def interpret_statement(self, stmt, local_vars, allow_recursion, *args, **kwargs):
+            if cls.PROFILE is not None:
+                return cls._profile(
+                    functools.partial(f, self), stmt, local_vars, allow_recursion, *args, **kwargs)
             if cls.ENABLED and stmt.strip():
                 cls.write(stmt, level=allow_recursion)
             try:
@@ -215,6 +275,7 @@ class JSInterpreter:
     def __init__(self, code, objects=None):
         self.code, self._functions = code, {}
         self._objects = {} if objects is None else objects
+        self._compiled = {}
 
     class Exception(ExtractorError):  # noqa: A001
         def __init__(self, msg, expr=None, *args, **kwargs):
@@ -222,9 +283,12 @@ def __init__(self, msg, expr=None, *args, **kwargs):
                 msg = f'{msg.rstrip()} in: {truncate_string(expr, 50, 50)}'
             super().__init__(msg, *args, **kwargs)
 
-    def _named_object(self, namespace, obj):
+    def _new_name(self):
         self.__named_object_counter += 1
-        name = f'__yt_dlp_jsinterp_obj{self.__named_object_counter}'
+        return f'__yt_dlp_jsinterp_obj{self.__named_object_counter}'
+
+    def _named_object(self, namespace, obj):
+        name = self._new_name()
         if callable(obj) and not isinstance(obj, function_with_repr):
             obj = function_with_repr(obj, f'F<{self.__named_object_counter}>')
         namespace[name] = obj
@@ -242,7 +306,14 @@ def _regex_flags(cls, expr):
         return flags, expr[idx + 1:]
 
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def _separate(expr, delim=',', max_split=None):
+        # The code is split again for each enclosing statement that is compiled, and
+        # ternaries when they are run. Parsing is pure, so remember the results
+        return tuple(JSInterpreter._iter_separate(expr, delim, max_split))
+
+    @staticmethod
+    def _iter_separate(expr, delim=',', max_split=None):
         OP_CHARS = '+-*/%&|^=<>!,;{}:['
         if not expr:
             return
@@ -318,35 +389,93 @@ def _index(self, obj, idx, allow_undefined=False):
                 return JS_Undefined
             raise self.Exception(f'Cannot get index {idx}', repr(obj), cause=e)
 
-    def _dump(self, obj, namespace):
-        try:
-            return json.dumps(obj)
-        except TypeError:
-            return self._named_object(namespace, obj)
-
     @Debugger.wrap_interpreter
     def interpret_statement(self, stmt, local_vars, allow_recursion=100):
         if allow_recursion < 0:
             raise self.Exception('Recursion limit reached')
-        allow_recursion -= 1
+        return self._compile_statement(stmt)(local_vars, allow_recursion - 1)
+
+    def _compile_statement(self, stmt):
+        """
+        Get the statement as a closure: run(local_vars, allow_recursion) -> (ret, should_return)
+
+        The code is parsed only once, when it is first run, and not again for each
+        call of its function or each iteration of its loop. The statements that make up
+        this one are compiled when they are first run too
+        """
+        compiled = self._compiled.get(stmt)
+        if compiled is None:
+            compiled = self._compiled[stmt] = self._build_statement(stmt)
+        return compiled
+
+    @staticmethod
+    def _compile_value(value, should_return):
+        return lambda local_vars, allow_recursion: (value, should_return)
+
+    def _compile_with_values(self, parts, stmt, should_return):
+        """
+        Compile code made of parts, in which each None stands for a value that is only known when it is run
+
+        @returns run(values, local_vars, allow_recursion)
+        """
+        names, code = [], ''
+        for part in parts:
+            if part is None:
+                names.append(self._new_name())
+                part = names[-1]
+            code += part
+        compiled = None
+
+        def run(values, local_vars, allow_recursion):
+            nonlocal compiled
+            if compiled is None:
+                compiled = self._compile_expression(code, stmt, False)
+            saved = [local_vars.get(name, NO_DEFAULT) for name in names]
+            local_vars.update(zip(names, values))
+            try:
+                ret, should_abort = compiled(local_vars, allow_recursion)
+            finally:
+                # The code may be run again before this run reads the values, e.g. by recursion
+                for name, value in zip(names, saved):
+                    if value is not NO_DEFAULT:
+                        local_vars[name] = value
+            return ret, should_abort or should_return
+        return run
 
-        should_return = False
+    def _build_statement(self, stmt):
+        should_return, compiled = False, None
         sub_statements = list(self._separate(stmt, ';')) or ['']
         expr = stmt = sub_statements.pop().strip()
 
-        for sub_stmt in sub_statements:
-            ret, should_return = self.interpret_statement(sub_stmt, local_vars, allow_recursion)
-            if should_return:
-                return ret, should_return
-
         m = re.match(r'(?P<var>(?:var|const|let)\s)|return(?:\s+|(?=["\'])|$)|(?P<throw>throw\s+)', stmt)
         if m:
             expr = stmt[len(m.group(0)):].strip()
             if m.group('throw'):
-                raise JS_Throw(self.interpret_expression(expr, local_vars, allow_recursion))
+                def compiled(local_vars, allow_recursion):
+                    raise JS_Throw(self.interpret_expression(expr, local_vars, allow_recursion))
             should_return = not m.group('var')
+
+        if compiled is None:
+            try:
+                compiled = self._compile_expression(expr, stmt, should_return)
+            except Exception:
+                # The error must only be raised when the statement is run, after those before it
+                def compiled(local_vars, allow_recursion):
+                    return self._compile_expression(expr, stmt, should_return)(local_vars, allow_recursion)
+        if not sub_statements:
+            return compiled
+
+        def run_statements(local_vars, allow_recursion):
+            for sub_stmt in sub_statements:
+                ret, should_return = self.interpret_statement(sub_stmt, local_vars, allow_recursion)
+                if should_return:
+                    return ret, should_return
+            return compiled(local_vars, allow_recursion)
+        return run_statements
+
+    def _compile_expression(self, expr, stmt, should_return):
         if not expr:
-            return None, should_return
+            return self._compile_value(None, should_return)
 
         if expr[0] in _QUOTES:
             inner, outer = self._separate(expr, expr[0], 1)
@@ -359,58 +488,63 @@ def interpret_statement(self, stmt, local_vars, allow_recursion=100):
             else:
                 inner = json.loads(js_to_json(f'{inner}{expr[0]}', strict=True))
             if not outer:
-                return inner, should_return
-            expr = self._named_object(local_vars, inner) + outer
+                return self._compile_value(inner, should_return)
+            run_outer = self._compile_with_values((None, outer), stmt, should_return)
+            return lambda local_vars, allow_recursion: run_outer((inner,), local_vars, allow_recursion)
 
         if expr.startswith('new '):
             obj = expr[4:]
-            if obj.startswith('Date('):
-                left, right = self._separate_at_paren(obj[4:])
+            if not obj.startswith('Date('):
+                raise self.Exception(f'Unsupported object {obj}', expr)
+            left, right = self._separate_at_paren(obj[4:])
+            run_right = self._compile_with_values((None, right), stmt, should_return)
+
+            def new_date(local_vars, allow_recursion):
                 date = unified_timestamp(
                     self.interpret_expression(left, local_vars, allow_recursion), False)
                 if date is None:
                     raise self.Exception(f'Failed to parse date {left!r}', expr)
-                expr = self._dump(int(date * 1000), local_vars) + right
-            else:
-                raise self.Exception(f'Unsupported object {obj}', expr)
+                return run_right((int(date * 1000),), local_vars, allow_recursion)
+            return new_date
 
         if expr.startswith('void '):
-            left = self.interpret_expression(expr[5:], local_vars, allow_recursion)
-            return None, should_return
+            def void(local_vars, allow_recursion):
+                self.interpret_expression(expr[5:], local_vars, allow_recursion)
+                return None, should_return
+            return void
 
         if expr.startswith('{'):
             inner, outer = self._separate_at_paren(expr)
             # try for object expression (Map)
             sub_expressions = [list(self._separate(sub_expr.strip(), ':', 1)) for sub_expr in self._separate(inner)]
             if all(len(sub_expr) == 2 for sub_expr in sub_expressions):
-                def dict_item(key, val):
-                    val = self.interpret_expression(val, local_vars, allow_recursion)
-                    if re.match(_NAME_RE, key):
-                        return key, val
-                    return self.interpret_expression(key, local_vars, allow_recursion), val
+                items = [(key, bool(re.match(_NAME_RE, key)), val) for key, val in sub_expressions]
 
-                return dict(dict_item(k, v) for k, v in sub_expressions), should_return
+                def object_literal(local_vars, allow_recursion):
+                    obj = {}
+                    for key, is_name, val in items:
+                        val = self.interpret_expression(val, local_vars, allow_recursion)
+                        obj[key if is_name else self.interpret_expression(key, local_vars, allow_recursion)] = val
+                    return obj, should_return
+                return object_literal
 
-            inner, should_abort = self.interpret_statement(inner, local_vars, allow_recursion)
-            if not outer or should_abort:
-                return inner, should_abort or should_return
-            else:
-                expr = self._dump(inner, local_vars) + outer
+            return self._compile_group(inner, outer, stmt, should_return)
 
         if expr.startswith('('):
             inner, outer = self._separate_at_paren(expr)
-            inner, should_abort = self.interpret_statement(inner, local_vars, allow_recursion)
-            if not outer or should_abort:
-                return inner, should_abort or should_return
-            else:
-                expr = self._dump(inner, local_vars) + outer
+            return self._compile_group(inner, outer, stmt, should_return)
 
         if expr.startswith('['):
             inner, outer = self._separate_at_paren(expr)
-            name = self._named_object(local_vars, [
-                self.interpret_expression(item, local_vars, allow_recursion)
-                for item in self._separate(inner)])
-            expr = name + outer
+            items = self._separate(inner)
+            run_outer = outer and self._compile_with_values((None, outer), stmt, should_return)
+
+            def array(local_vars, allow_recursion):
+                ret = [self.interpret_expression(item, local_vars, allow_recursion) for item in items]
+                if not outer:
+                    return ret, should_return
+                return run_outer((ret,), local_vars, allow_recursion)
+            return array
 
         m = re.match(r'''(?x)
                 (?P<try>try)\s*\{|
@@ -418,23 +552,159 @@ def dict_item(key, val):
                 (?P<switch>switch)\s*\(|
                 (?P<for>for)\s*\(
                 ''', expr)
-        md = m.groupdict() if m else {}
-        if md.get('if'):
-            cndn, expr = self._separate_at_paren(expr[m.end() - 1:])
-            if_expr, expr = self._separate_at_paren(expr.lstrip())
-            # TODO: "else if" is not handled
-            else_expr = None
-            m = re.match(r'else\s*{', expr)
-            if m:
-                else_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
-            cndn = _js_ternary(self.interpret_expression(cndn, local_vars, allow_recursion))
-            ret, should_abort = self.interpret_statement(
-                if_expr if cndn else else_expr, local_vars, allow_recursion)
-            if should_abort:
-                return ret, True
+        if m:
+            run_block, expr = getattr(self, f'_compile_{m.lastgroup}')(expr[m.end() - 1:])
+
+            def control_flow(local_vars, allow_recursion):
+                ret, should_abort = run_block(local_vars, allow_recursion)
+                if should_abort:
+                    return ret, True
+                ret, should_abort = self.interpret_statement(expr, local_vars, allow_recursion)
+                return ret, should_abort or should_return
+            return control_flow
+
+        # Comma separated statements
+        sub_expressions = self._separate(expr)
+        if len(sub_expressions) > 1:
+            def comma(local_vars, allow_recursion):
+                for sub_expr in sub_expressions:
+                    ret, should_abort = self.interpret_statement(sub_expr, local_vars, allow_recursion)
+                    if should_abort:
+                        return ret, True
+                return ret, False
+            return comma
+
+        increments = list(_INCREMENT_RE.finditer(expr))
+        if increments:
+            parts, end = [], 0
+            for m in increments:
+                parts.extend((expr[end:m.start()], None))
+                end = m.end()
+            parts.append(expr[end:])
+            run_rest = self._compile_with_values(parts, stmt, should_return)
+            increments = [(
+                m.group('var1') or m.group('var2'), 1 if (m.group('pre_sign') or m.group('post_sign'))[0] == '+' else -1,
+                bool(m.group('pre_sign'))) for m in increments]
+
+            def increment(local_vars, allow_recursion):
+                values = []
+                for var, step, is_pre in increments:
+                    ret = local_vars[var]
+                    local_vars[var] += step
+                    values.append(local_vars[var] if is_pre else ret)
+                return run_rest(values, local_vars, allow_recursion)
+            return increment
+
+        m = _EXPRESSION_RE.match(expr)
+        if m and m.group('assign'):
+            return self._compile_assignment(m, expr, should_return)
+
+        elif expr.isdigit():
+            return self._compile_value(int(expr), should_return)
+
+        elif expr == 'break':
+            def js_break(local_vars, allow_recursion):
+                raise JS_Break
+            return js_break
+        elif expr == 'continue':
+            def js_continue(local_vars, allow_recursion):
+                raise JS_Continue
+            return js_continue
+        elif expr == 'undefined':
+            return self._compile_value(JS_Undefined, should_return)
+        elif expr == 'NaN':
+            return self._compile_value(float('NaN'), should_return)
+
+        elif m and m.group('return'):
+            name = m.group('name')
+            return lambda local_vars, allow_recursion: (local_vars.get(name, JS_Undefined), should_return)
+
+        with contextlib.suppress(ValueError):
+            json_expr = js_to_json(expr, strict=True)
+            value = json.loads(json_expr)
+            if isinstance(value, (list, dict)):
+                # Each run must get a new object
+                return lambda local_vars, allow_recursion: (json.loads(json_expr), should_return)
+            return self._compile_value(value, should_return)
+
+        if m and m.group('indexing'):
+            var, idx_expr = m.group('in', 'idx')
+
+            def indexing(local_vars, allow_recursion):
+                val = local_vars[var]
+                idx = self.interpret_expression(idx_expr, local_vars, allow_recursion)
+                return self._index(val, idx), should_return
+            return indexing
+
+        for op in _OPERATORS:
+            separated = list(self._separate(expr, op))
+            right_expr = separated.pop()
+            while True:
+                if op in '?<>*-' and len(separated) > 1 and not separated[-1].strip():
+                    separated.pop()
+                elif not (separated and op == '?' and right_expr.startswith('.')):
+                    break
+                right_expr = f'{op}{right_expr}'
+                if op != '-':
+                    right_expr = f'{separated.pop()}{op}{right_expr}'
+            if separated:
+                return self._compile_operator(op, op.join(separated), right_expr, expr, should_return)
+
+        if m and m.group('attribute'):
+            return self._compile_member(m, expr, should_return)
+
+        elif m and m.group('function'):
+            fname = m.group('fname')
+            args = self._separate(m.group('args'))
+
+            def call(local_vars, allow_recursion):
+                argvals = [self.interpret_expression(v, local_vars, allow_recursion) for v in args]
+                if fname in local_vars:
+                    return local_vars[fname](argvals, allow_recursion=allow_recursion), should_return
+                elif fname not in self._functions:
+                    self._functions[fname] = self.extract_function(fname)
+                return self._functions[fname](argvals, allow_recursion=allow_recursion), should_return
+            return call
+
+        raise self.Exception(
+            f'Unsupported JS expression {truncate_string(expr, 20, 20) if expr != stmt else ""}', stmt)
+
+    def _compile_group(self, inner, outer, stmt, should_return):
+        run_outer = outer and self._compile_with_values((None, outer), stmt, should_return)
+
+        def group(local_vars, allow_recursion):
+            ret, should_abort = self.interpret_statement(inner, local_vars, allow_recursion)
+            if not outer or should_abort:
+                return ret, should_abort or should_return
+            return run_outer((ret,), local_vars, allow_recursion)
+        return group
+
+    def _compile_if(self, expr):
+        cndn, expr = self._separate_at_paren(expr)
+        if_expr, expr = self._separate_at_paren(expr.lstrip())
+        # TODO: "else if" is not handled
+        else_expr = None
+        m = re.match(r'else\s*{', expr)
+        if m:
+            else_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
+
+        def run_if(local_vars, allow_recursion):
+            cndn_val = _js_ternary(self.interpret_expression(cndn, local_vars, allow_recursion))
+            return self.interpret_statement(if_expr if cndn_val else else_expr, local_vars, allow_recursion)
+        return run_if, expr
 
-        if md.get('try'):
-            try_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
+    def _compile_try(self, expr):
+        try_expr, expr = self._separate_at_paren(expr)
+        catch_expr = catch_var = finally_expr = None
+        m = re.match(fr'catch\s*(?P<err>\(\s*{_NAME_RE}\s*\))?\{{', expr)
+        if m:
+            catch_var = m.group('err')
+            catch_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
+        m = re.match(r'finally\s*\{', expr)
+        if m:
+            finally_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
+
+        def run_try(local_vars, allow_recursion):
             err = None
             try:
                 ret, should_abort = self.interpret_statement(try_expr, local_vars, allow_recursion)
@@ -445,20 +715,15 @@ def dict_item(key, val):
                 err = e
 
             pending = (None, False)
-            m = re.match(fr'catch\s*(?P<err>\(\s*{_NAME_RE}\s*\))?\{{', expr)
-            if m:
-                sub_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
-                if err:
-                    catch_vars = {}
-                    if m.group('err'):
-                        catch_vars[m.group('err')] = err.error if isinstance(err, JS_Throw) else err
-                    catch_vars = local_vars.new_child(catch_vars)
-                    err, pending = None, self.interpret_statement(sub_expr, catch_vars, allow_recursion)
-
-            m = re.match(r'finally\s*\{', expr)
-            if m:
-                sub_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
-                ret, should_abort = self.interpret_statement(sub_expr, local_vars, allow_recursion)
+            if catch_expr is not None and err:
+                catch_vars = {}
+                if catch_var:
+                    catch_vars[catch_var] = err.error if isinstance(err, JS_Throw) else err
+                catch_vars = local_vars.new_child(catch_vars)
+                err, pending = None, self.interpret_statement(catch_expr, catch_vars, allow_recursion)
+
+            if finally_expr is not None:
+                ret, should_abort = self.interpret_statement(finally_expr, local_vars, allow_recursion)
                 if should_abort:
                     return ret, True
 
@@ -468,20 +733,24 @@ def dict_item(key, val):
 
             if err:
                 raise err
-
-        elif md.get('for'):
-            constructor, remaining = self._separate_at_paren(expr[m.end() - 1:])
-            if remaining.startswith('{'):
-                body, expr = self._separate_at_paren(remaining)
+            return None, False
+        return run_try, expr
+
+    def _compile_for(self, expr):
+        constructor, remaining = self._separate_at_paren(expr)
+        if remaining.startswith('{'):
+            body, expr = self._separate_at_paren(remaining)
+        else:
+            switch_m = re.match(r'switch\s*\(', remaining)  # FIXME: ?
+            if switch_m:
+                switch_val, remaining = self._separate_at_paren(remaining[switch_m.end() - 1:])
+                body, expr = self._separate_at_paren(remaining, '}')
+                body = 'switch(%s){%s}' % (switch_val, body)
             else:
-                switch_m = re.match(r'switch\s*\(', remaining)  # FIXME: ?
-                if switch_m:
-                    switch_val, remaining = self._separate_at_paren(remaining[switch_m.end() - 1:])
-                    body, expr = self._separate_at_paren(remaining, '}')
-                    body = 'switch(%s){%s}' % (switch_val, body)
-                else:
-                    body, expr = remaining, ''
-            start, cndn, increment = self._separate(constructor, ';')
+                body, expr = remaining, ''
+        start, cndn, increment = self._separate(constructor, ';')
+
+        def run_for(local_vars, allow_recursion):
             self.interpret_expression(start, local_vars, allow_recursion)
             while True:
                 if not _js_ternary(self.interpret_expression(cndn, local_vars, allow_recursion)):
@@ -495,296 +764,221 @@ def dict_item(key, val):
                 except JS_Continue:
                     pass
                 self.interpret_expression(increment, local_vars, allow_recursion)
-
-        elif md.get('switch'):
-            switch_val, remaining = self._separate_at_paren(expr[m.end() - 1:])
-            switch_val = self.interpret_expression(switch_val, local_vars, allow_recursion)
-            body, expr = self._separate_at_paren(remaining, '}')
-            items = body.replace('default:', 'case default:').split('case ')[1:]
+            return None, False
+        return run_for, expr
+
+    def _compile_switch(self, expr):
+        switch_val, remaining = self._separate_at_paren(expr)
+        body, expr = self._separate_at_paren(remaining, '}')
+        items = [
+            tuple(i.strip() for i in self._separate(item, ':', 1))
+            for item in body.replace('default:', 'case default:').split('case ')[1:]]
+
+        def run_switch(local_vars, allow_recursion):
+            value = self.interpret_expression(switch_val, local_vars, allow_recursion)
             for default in (False, True):
                 matched = False
-                for item in items:
-                    case, stmt = (i.strip() for i in self._separate(item, ':', 1))
+                for case, stmt in items:
                     if default:
                         matched = matched or case == 'default'
                     elif not matched:
                         matched = (case != 'default'
-                                   and switch_val == self.interpret_expression(case, local_vars, allow_recursion))
+                                   and value == self.interpret_expression(case, local_vars, allow_recursion))
                     if not matched:
                         continue
                     try:
                         ret, should_abort = self.interpret_statement(stmt, local_vars, allow_recursion)
                         if should_abort:
-                            return ret
+                            return ret, True
                     except JS_Break:
                         break
                 if matched:
                     break
+            return None, False
+        return run_switch, expr
 
-        if md:
-            ret, should_abort = self.interpret_statement(expr, local_vars, allow_recursion)
-            return ret, should_abort or should_return
-
-        # Comma separated statements
-        sub_expressions = list(self._separate(expr))
-        if len(sub_expressions) > 1:
-            for sub_expr in sub_expressions:
-                ret, should_abort = self.interpret_statement(sub_expr, local_vars, allow_recursion)
-                if should_abort:
-                    return ret, True
-            return ret, False
-
-        for m in re.finditer(rf'''(?x)
-                (?P<pre_sign>\+\+|--)(?P<var1>{_NAME_RE})|
-                (?P<var2>{_NAME_RE})(?P<post_sign>\+\+|--)''', expr):
-            var = m.group('var1') or m.group('var2')
-            start, end = m.span()
-            sign = m.group('pre_sign') or m.group('post_sign')
-            ret = local_vars[var]
-            local_vars[var] += 1 if sign[0] == '+' else -1
-            if m.group('pre_sign'):
-                ret = local_vars[var]
-            expr = expr[:start] + self._dump(ret, local_vars) + expr[end:]
+    def _compile_assignment(self, m, expr, should_return):
+        out, index, op, right_expr = m.group('out', 'index', 'op', 'expr')
 
-        if not expr:
-            return None, should_return
-
-        m = re.match(fr'''(?x)
-            (?P<assign>
-                (?P<out>{_NAME_RE})(?:\[(?P<index>[^\]]+?)\])?\s*
-                (?P<op>{"|".join(map(re.escape, set(_OPERATORS) - _COMP_OPERATORS))})?
-                =(?!=)(?P<expr>.*)$
-            )|(?P<return>
-                (?!if|return|true|false|null|undefined|NaN)(?P<name>{_NAME_RE})$
-            )|(?P<indexing>
-                (?P<in>{_NAME_RE})\[(?P<idx>.+)\]$
-            )|(?P<attribute>
-                (?P<var>{_NAME_RE})(?:(?P<nullish>\?)?\.(?P<member>[^(]+)|\[(?P<member2>[^\]]+)\])\s*
-            )|(?P<function>
-                (?P<fname>{_NAME_RE})\((?P<args>.*)\)$
-            )''', expr)
-        if m and m.group('assign'):
-            left_val = local_vars.get(m.group('out'))
+        if not index:
+            def assign(local_vars, allow_recursion):
+                local_vars[out] = self._operator(
+                    op, local_vars.get(out), right_expr, expr, local_vars, allow_recursion)
+                return local_vars[out], should_return
+            return assign
 
-            if not m.group('index'):
-                local_vars[m.group('out')] = self._operator(
-                    m.group('op'), left_val, m.group('expr'), expr, local_vars, allow_recursion)
-                return local_vars[m.group('out')], should_return
-            elif left_val in (None, JS_Undefined):
-                raise self.Exception(f'Cannot index undefined variable {m.group("out")}', expr)
+        def assign_index(local_vars, allow_recursion):
+            left_val = local_vars.get(out)
+            if left_val in (None, JS_Undefined):
+                raise self.Exception(f'Cannot index undefined variable {out}', expr)
 
-            idx = self.interpret_expression(m.group('index'), local_vars, allow_recursion)
+            idx = self.interpret_expression(index, local_vars, allow_recursion)
             if not isinstance(idx, (int, float)):
                 raise self.Exception(f'List index {idx} must be integer', expr)
             idx = int(idx)
             left_val[idx] = self._operator(
-                m.group('op'), self._index(left_val, idx), m.group('expr'), expr, local_vars, allow_recursion)
+                op, self._index(left_val, idx), right_expr, expr, local_vars, allow_recursion)
             return left_val[idx], should_return
+        return assign_index
 
-        elif expr.isdigit():
-            return int(expr), should_return
-
-        elif expr == 'break':
-            raise JS_Break
-        elif expr == 'continue':
-            raise JS_Continue
-        elif expr == 'undefined':
-            return JS_Undefined, should_return
-        elif expr == 'NaN':
-            return float('NaN'), should_return
-
-        elif m and m.group('return'):
-            return local_vars.get(m.group('name'), JS_Undefined), should_return
-
-        with contextlib.suppress(ValueError):
-            return json.loads(js_to_json(expr, strict=True)), should_return
-
-        if m and m.group('indexing'):
-            val = local_vars[m.group('in')]
-            idx = self.interpret_expression(m.group('idx'), local_vars, allow_recursion)
-            return self._index(val, idx), should_return
-
-        for op in _OPERATORS:
-            separated = list(self._separate(expr, op))
-            right_expr = separated.pop()
-            while True:
-                if op in '?<>*-' and len(separated) > 1 and not separated[-1].strip():
-                    separated.pop()
-                elif not (separated and op == '?' and right_expr.startswith('.')):
-                    break
-                right_expr = f'{op}{right_expr}'
-                if op != '-':
-                    right_expr = f'{separated.pop()}{op}{right_expr}'
-            if not separated:
-                continue
-            left_val = self.interpret_expression(op.join(separated), local_vars, allow_recursion)
+    def _compile_operator(self, op, left_expr, right_expr, expr, should_return):
+        def operation(local_vars, allow_recursion):
+            left_val = self.interpret_expression(left_expr, local_vars, allow_recursion)
             return self._operator(op, left_val, right_expr, expr, local_vars, allow_recursion), should_return
-
-        if m and m.group('attribute'):
-            variable, member, nullish = m.group('var', 'member', 'nullish')
-            if not member:
-                member = self.interpret_expression(m.group('member2'), local_vars, allow_recursion)
-            arg_str = expr[m.end():]
-            if arg_str.startswith('('):
-                arg_str, remaining = self._separate_at_paren(arg_str)
-            else:
-                arg_str, remaining = None, arg_str
+        return operation
+
+    def _compile_member(self, m, expr, should_return):
+        variable, member_name, nullish = m.group('var', 'member', 'nullish')
+        arg_str = expr[m.end():]
+        if arg_str.startswith('('):
+            arg_str, remaining = self._separate_at_paren(arg_str)
+            args = self._separate(arg_str)
+        else:
+            arg_str, remaining = None, arg_str
+        run_remaining = remaining and self._compile_with_values((None, remaining), expr, should_return)
+
+        types = {
+            'String': str,
+            'Math': float,
+            'Array': list,
+        }
+
+        def eval_method(local_vars, allow_recursion):
+            member = member_name or self.interpret_expression(m.group('member2'), local_vars, allow_recursion)
 
             def assertion(cndn, msg):
                 """ assert, but without risk of getting optimized out """
                 if not cndn:
                     raise self.Exception(f'{member} {msg}', expr)
 
-            def eval_method():
-                nonlocal member
-
-                if (variable, member) == ('console', 'debug'):
-                    if Debugger.ENABLED:
-                        Debugger.write(self.interpret_expression(f'[{arg_str}]', local_vars, allow_recursion))
-                    return
+            if (variable, member) == ('console', 'debug'):
+                if Debugger.ENABLED:
+                    Debugger.write(self.interpret_expression(f'[{arg_str}]', local_vars, allow_recursion))
+                return
 
-                types = {
-                    'String': str,
-                    'Math': float,
-                    'Array': list,
-                }
-                obj = local_vars.get(variable, types.get(variable, NO_DEFAULT))
-                if obj is NO_DEFAULT:
-                    if variable not in self._objects:
-                        try:
-                            self._objects[variable] = self.extract_object(variable)
-                        except self.Exception:
-                            if not nullish:
-                                raise
-                    obj = self._objects.get(variable, JS_Undefined)
-
-                if nullish and obj is JS_Undefined:
-                    return JS_Undefined
-
-                # Member access
-                if arg_str is None:
-                    return self._index(obj, member, nullish)
-
-                # Function call
-                argvals = [
-                    self.interpret_expression(v, local_vars, allow_recursion)
-                    for v in self._separate(arg_str)]
-
-                # Fixup prototype call
-                if isinstance(obj, type) and member.startswith('prototype.'):
-                    new_member, _, func_prototype = member.partition('.')[2].partition('.')
-                    assertion(argvals, 'takes one or more arguments')
-                    assertion(isinstance(argvals[0], obj), f'needs binding to type {obj}')
-                    if func_prototype == 'call':
-                        obj, *argvals = argvals
-                    elif func_prototype == 'apply':
-                        assertion(len(argvals) == 2, 'takes two arguments')
-                        obj, argvals = argvals
-                        assertion(isinstance(argvals, list), 'second argument needs to be a list')
-                    else:
-                        raise self.Exception(f'Unsupported Function method {func_prototype}', expr)
-                    member = new_member
-
-                if obj is str:
-                    if member == 'fromCharCode':
-                        assertion(argvals, 'takes one or more arguments')
-                        return ''.join(map(chr, argvals))
-                    raise self.Exception(f'Unsupported String method {member}', expr)
-                elif obj is float:
-                    if member == 'pow':
-                        assertion(len(argvals) == 2, 'takes two arguments')
-                        return argvals[0] ** argvals[1]
-                    raise self.Exception(f'Unsupported Math method {member}', expr)
-
-                if member == 'split':
-                    assertion(argvals, 'takes one or more arguments')
-                    assertion(len(argvals) == 1, 'with limit argument is not implemented')
-                    return obj.split(argvals[0]) if argvals[0] else list(obj)
-                elif member == 'join':
-                    assertion(isinstance(obj, list), 'must be applied on a list')
-                    assertion(len(argvals) == 1, 'takes exactly one argument')
-                    return argvals[0].join(obj)
-                elif member == 'reverse':
-                    assertion(not argvals, 'does not take any arguments')
-                    obj.reverse()
-                    return obj
-                elif member == 'slice':
-                    assertion(isinstance(obj, (list, str)), 'must be applied on a list or string')
-                    assertion(len(argvals) <= 2, 'takes between 0 and 2 arguments')
-                    return obj[slice(*argvals, None)]
-                elif member == 'splice':
-                    assertion(isinstance(obj, list), 'must be applied on a list')
-                    assertion(argvals, 'takes one or more arguments')
-                    index, how_many = map(int, ([*argvals, len(obj)])[:2])
-                    if index < 0:
-                        index += len(obj)
-                    add_items = argvals[2:]
-                    res = []
-                    for _ in range(index, min(index + how_many, len(obj))):
-                        res.append(obj.pop(index))
-                    for i, item in enumerate(add_items):
-                        obj.insert(index + i, item)
-                    return res
-                elif member == 'unshift':
-                    assertion(isinstance(obj, list), 'must be applied on a list')
-                    assertion(argvals, 'takes one or more arguments')
-                    for item in reversed(argvals):
-                        obj.insert(0, item)
-                    return obj
-                elif member == 'pop':
-                    assertion(isinstance(obj, list), 'must be applied on a list')
-                    assertion(not argvals, 'does not take any arguments')
-                    if not obj:
-                        return
-                    return obj.pop()
-                elif member == 'push':
-                    assertion(argvals, 'takes one or more arguments')
-                    obj.extend(argvals)
-                    return obj
-                elif member == 'forEach':
-                    assertion(argvals, 'takes one or more arguments')
-                    assertion(len(argvals) <= 2, 'takes at-most 2 arguments')
-                    f, this = ([*argvals, ''])[:2]
-                    return [f((item, idx, obj), {'this': this}, allow_recursion) for idx, item in enumerate(obj)]
-                elif member == 'indexOf':
-                    assertion(argvals, 'takes one or more arguments')
-                    assertion(len(argvals) <= 2, 'takes at-most 2 arguments')
-                    idx, start = ([*argvals, 0])[:2]
+            obj = local_vars.get(variable, types.get(variable, NO_DEFAULT))
+            if obj is NO_DEFAULT:
+                if variable not in self._objects:
                     try:
-                        return obj.index(idx, start)
-                    except ValueError:
-                        return -1
-                elif member == 'charCodeAt':
-                    assertion(isinstance(obj, str), 'must be applied on a string')
-                    assertion(len(argvals) == 1, 'takes exactly one argument')
-                    idx = argvals[0] if isinstance(argvals[0], int) else 0
-                    if idx >= len(obj):
-                        return None
-                    return ord(obj[idx])
-
-                idx = int(member) if isinstance(obj, list) else member
-                return obj[idx](argvals, allow_recursion=allow_recursion)
-
-            if remaining:
-                ret, should_abort = self.interpret_statement(
-                    self._named_object(local_vars, eval_method()) + remaining,
-                    local_vars, allow_recursion)
-                return ret, should_return or should_abort
-            else:
-                return eval_method(), should_return
+                        self._objects[variable] = self.extract_object(variable)
+                    except self.Exception:
+                        if not nullish:
+                            raise
+                obj = self._objects.get(variable, JS_Undefined)
 
-        elif m and m.group('function'):
-            fname = m.group('fname')
-            argvals = [self.interpret_expression(v, local_vars, allow_recursion)
-                       for v in self._separate(m.group('args'))]
-            if fname in local_vars:
-                return local_vars[fname](argvals, allow_recursion=allow_recursion), should_return
-            elif fname not in self._functions:
-                self._functions[fname] = self.extract_function(fname)
-            return self._functions[fname](argvals, allow_recursion=allow_recursion), should_return
+            if nullish and obj is JS_Undefined:
+                return JS_Undefined
 
-        raise self.Exception(
-            f'Unsupported JS expression {truncate_string(expr, 20, 20) if expr != stmt else ""}', stmt)
+            # Member access
+            if arg_str is None:
+                return self._index(obj, member, nullish)
+
+            # Function call
+            argvals = [
+                self.interpret_expression(v, local_vars, allow_recursion)
+                for v in args]
+
+            # Fixup prototype call
+            if isinstance(obj, type) and member.startswith('prototype.'):
+                new_member, _, func_prototype = member.partition('.')[2].partition('.')
+                assertion(argvals, 'takes one or more arguments')
+                assertion(isinstance(argvals[0], obj), f'needs binding to type {obj}')
+                if func_prototype == 'call':
+                    obj, *argvals = argvals
+                elif func_prototype == 'apply':
+                    assertion(len(argvals) == 2, 'takes two arguments')
+                    obj, argvals = argvals
+                    assertion(isinstance(argvals, list), 'second argument needs to be a list')
+                else:
+                    raise self.Exception(f'Unsupported Function method {func_prototype}', expr)
+                member = new_member
+
+            if obj is str:
+                if member == 'fromCharCode':
+                    assertion(argvals, 'takes one or more arguments')
+                    return ''.join(map(chr, argvals))
+                raise self.Exception(f'Unsupported String method {member}', expr)
+            elif obj is float:
+                if member == 'pow':
+                    assertion(len(argvals) == 2, 'takes two arguments')
+                    return argvals[0] ** argvals[1]
+                raise self.Exception(f'Unsupported Math method {member}', expr)
+
+            if member == 'split':
+                assertion(argvals, 'takes one or more arguments')
+                assertion(len(argvals) == 1, 'with limit argument is not implemented')
+                return obj.split(argvals[0]) if argvals[0] else list(obj)
+            elif member == 'join':
+                assertion(isinstance(obj, list), 'must be applied on a list')
+                assertion(len(argvals) == 1, 'takes exactly one argument')
+                return argvals[0].join(obj)
+            elif member == 'reverse':
+                assertion(not argvals, 'does not take any arguments')
+                obj.reverse()
+                return obj
+            elif member == 'slice':
+                assertion(isinstance(obj, (list, str)), 'must be applied on a list or string')
+                assertion(len(argvals) <= 2, 'takes between 0 and 2 arguments')
+                return obj[slice(*argvals, None)]
+            elif member == 'splice':
+                assertion(isinstance(obj, list), 'must be applied on a list')
+                assertion(argvals, 'takes one or more arguments')
+                index, how_many = map(int, ([*argvals, len(obj)])[:2])
+                if index < 0:
+                    index += len(obj)
+                add_items = argvals[2:]
+                res = []
+                for _ in range(index, min(index + how_many, len(obj))):
+                    res.append(obj.pop(index))
+                for i, item in enumerate(add_items):
+                    obj.insert(index + i, item)
+                return res
+            elif member == 'unshift':
+                assertion(isinstance(obj, list), 'must be applied on a list')
+                assertion(argvals, 'takes one or more arguments')
+                for item in reversed(argvals):
+                    obj.insert(0, item)
+                return obj
+            elif member == 'pop':
+                assertion(isinstance(obj, list), 'must be applied on a list')
+                assertion(not argvals, 'does not take any arguments')
+                if not obj:
+                    return
+                return obj.pop()
+            elif member == 'push':
+                assertion(argvals, 'takes one or more arguments')
+                obj.extend(argvals)
+                return obj
+            elif member == 'forEach':
+                assertion(argvals, 'takes one or more arguments')
+                assertion(len(argvals) <= 2, 'takes at-most 2 arguments')
+                f, this = ([*argvals, ''])[:2]
+                return [f((item, idx, obj), {'this': this}, allow_recursion) for idx, item in enumerate(obj)]
+            elif member == 'indexOf':
+                assertion(argvals, 'takes one or more arguments')
+                assertion(len(argvals) <= 2, 'takes at-most 2 arguments')
+                idx, start = ([*argvals, 0])[:2]
+                try:
+                    return obj.index(idx, start)
+                except ValueError:
+                    return -1
+            elif member == 'charCodeAt':
+                assertion(isinstance(obj, str), 'must be applied on a string')
+                assertion(len(argvals) == 1, 'takes exactly one argument')
+                idx = argvals[0] if isinstance(argvals[0], int) else 0
+                if idx >= len(obj):
+                    return None
+                return ord(obj[idx])
+
+            idx = int(member) if isinstance(obj, list) else member
+            return obj[idx](argvals, allow_recursion=allow_recursion)
+
+        def member_access(local_vars, allow_recursion):
+            ret = eval_method(local_vars, allow_recursion)
+            if not remaining:
+                return ret, should_return
+            return run_remaining((ret,), local_vars, allow_recursion)
+        return member_access
 
     def interpret_expression(self, expr, local_vars, allow_recursion):
         ret, should_return = self.interpret_statement(expr, local_vars, allow_recursion)
@@ -860,12 +1054,13 @@ def call_function(self, funcname, *args):
     def build_function(self, argnames, code, *global_stack):
         global_stack = list(global_stack) or [{}]
         argnames = tuple(argnames)
+        code = code.replace('\n', ' ')
 
         def resf(args, kwargs={}, allow_recursion=100):
             global_stack[0].update(itertools.zip_longest(argnames, args, fillvalue=None))
             global_stack[0].update(kwargs)
             var_stack = LocalNameSpace(*global_stack)
-            ret, should_abort = self.interpret_statement(code.replace('\n', ' '), var_stack, allow_recursion - 1)
+            ret, should_abort = self.interpret_statement(code, var_stack, allow_recursion - 1)
             if should_abort:
                 return ret
         return resf
@@ -0,0 +1,265 @@
+"""
+A parser for m3u8 playlists, used by both the extractors and the HLS downloader
+
+The playlist is parsed in a single pass. The segments of a media playlist are
+kept in arrays rather than as a dict each, and their URLs are only resolved
+when they are needed, so that large VOD playlists are cheap to parse.
+
+References:
+    - RFC 8216: https://datatracker.ietf.org/doc/html/rfc8216
+"""
+
+import array
+import bisect
+import collections
+import functools
+import re
+import urllib.parse
+
+from .utils import float_or_none, int_or_none, parse_m3u8_attributes, urljoin
+
+Segment = collections.namedtuple('Segment', (
+    'uri',             # The URI of the segment as it is in the playlist
+    'is_init',         # Whether this is the initialization section of an EXT-X-MAP tag
+    'media_sequence',  # The media sequence number of the segment
+    'discontinuity',   # The number of EXT-X-DISCONTINUITY tags before the segment
+    'duration',        # The duration from the EXTINF tag, or None
+    'key',             # The attributes of the EXT-X-KEY tag that applies to the segment, or None
+    'byte_range',      # (start, end) of the EXT-X-BYTERANGE sub-range, or None
+    'is_ad',           # Whether the segment is marked as an advertisement
+))
+
+_NO_DURATION = float('nan')
+
+# Relative paths that can be resolved by appending them to the directory of the playlist URL
+_SIMPLE_PATH_RE = re.compile(r'[^/.?#:;\x00-\x20][^?#:;\x00-\x20]*(?:\?[^#\x00-\x20]+)?(?:#[^\x00-\x20]+)?')
+
+
+def _is_ad_start(line):
+    return (line.startswith('#ANVATO-SEGMENT-INFO') and 'type=ad' in line
+            or line.startswith('#UPLYNK-SEGMENT') and line.endswith(',ad'))
+
+
+def _is_ad_end(line):
+    return (line.startswith('#ANVATO-SEGMENT-INFO') and 'type=master' in line
+            or line.startswith('#UPLYNK-SEGMENT') and line.endswith(',segment'))
+
+
+class M3U8Playlist:
+    """
+    A parsed m3u8 playlist
+
+    Master playlists have the attributes of their EXT-X-MEDIA tags in `media`,
+    and each variant stream as an (attributes of EXT-X-STREAM-INF, URI) pair in
+    `variants`. The segments of media playlists, including the initialization
+    sections of EXT-X-MAP tags, are accessed by index or by iterating over the
+    playlist, and their URLs are resolved against `url` with `resolve_url`
+
+    A reload of a live media playlist is parsed with the previously loaded
+    playlist as `previous`. Only the segments after those of `previous` are
+    parsed then, and the tags that applied to its last segment carry over
+    """
+
+    def __init__(self, doc, url=None, previous=None):
+        self.url = url
+        self.is_media = self.is_media_playlist(doc)
+        self.media = []
+        self.variants = []
+        self.target_duration = None
+        self.media_sequence = 0
+        # The number of segments that are left out of a playlist delta update (EXT-X-SKIP)
+        self.skipped_segments = 0
+        self.server_control = {}
+        self.endlist = False
+        self.ad_segment_count = 0
+        # The attributes of the EXT-X-KEY tags, with None for no key
+        self.keys = [None]
+
+        self._uris = []
+        self._durations = array.array('d')
+        self._byte_ranges = {}
+        # Most tags apply to all the segments that follow them, so only the
+        # indices of the segments at which they take effect are kept
+        self._init_indices = []
+        self._key_starts = []
+        self._discontinuity_starts = []
+        self._ad_toggles = []
+        # The state before the first segment, which is carried over from `previous`
+        self._first_sequence = None
+        self._discontinuity_base = 0
+        self._ad_base = False
+        self._range_end = 0
+
+        if previous is not None and previous.is_media and self.is_media:
+            self.keys[0] = previous.keys[-1]
+            self._discontinuity_base = previous.discontinuity_count
+            self._ad_base = previous._ad_base != (len(previous._ad_toggles) % 2 == 1)
+            self._range_end = previous._range_end
+            doc = self._find_tail(doc, previous.next_sequence)
+        self._parse(doc)
+        if self._first_sequence is None:
+            self._first_sequence = self.media_sequence + self.skipped_segments
+
+    def _find_tail(self, doc, next_sequence):
+        """The part of the document from the segment with the media sequence number `next_sequence`"""
+        header_end = doc.find('#EXTINF:')
+        self._parse(doc if header_end == -1 else doc[:header_end], header=True)
+        self.endlist = '#EXT-X-ENDLIST' in doc
+        first_sequence = self.media_sequence + self.skipped_segments
+        # As of RFC 8216 §4.3.2.1, every media segment has an EXTINF tag
+        count = doc.count('#EXTINF:')
+        if not count:
+            return doc
+        new_count = min(count, first_sequence + count - next_sequence)
+        if new_count <= 0:
+            self._first_sequence = next_sequence
+            return ''
+        self._first_sequence = first_sequence + count - new_count
+
+        start = len(doc)
+        for _ in range(new_count):
+            start = doc.rfind('#EXTINF:', 0, start)
+        # Also take the tags between the URI of the last old segment and the EXTINF tag
+        while start > 0:
+            line_start = doc.rfind('\n', 0, start - 1) + 1
+            line = doc[line_start:start].strip()
+            if line and line[0] != '#':
+                break
+            start = line_start
+        if doc.count('#EXTINF:', start) != new_count:
+            # The EXTINF tags are not where the segments are; parse it all
+            self._first_sequence = None
+            return doc
+        return doc[start:]
+
+    def _parse(self, doc, header=False):
+        uris, durations, byte_ranges = self._uris, self._durations, self._byte_ranges
+        append_uri, append_duration = uris.append, durations.append
+        duration, byte_range, stream_inf = _NO_DURATION, None, None
+        is_ad = self._ad_base
+
+        def parse_byte_range(value):
+            length, _, offset = value.partition('@')
+            start = int(offset) if offset else self._range_end
+            self._range_end = start + int(length)
+            return start, self._range_end
+
+        for line in doc.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if line[0] != '#':
+                if header:
+                    break
+                if byte_range:
+                    byte_ranges[len(uris)], byte_range = byte_range, None
+                append_uri(line)
+                append_duration(duration)
+                duration = _NO_DURATION
+                if is_ad:
+                    self.ad_segment_count += 1
+                if not self.is_media:
+                    self.variants.append((stream_inf or {}, line))
+                    stream_inf = None
+                continue
+
+            if line.startswith('#EXTINF:'):  # The most common tag
+                try:
+                    duration = float(line[8:].partition(',')[0])
+                except ValueError:
+                    duration = _NO_DURATION
+                continue
+
+            tag, _, value = line.partition(':')
+            if tag == '#EXT-X-MEDIA-SEQUENCE':
+                self.media_sequence = int_or_none(value, default=0)
+            elif tag == '#EXT-X-TARGETDURATION':
+                self.target_duration = float_or_none(value)
+            elif tag == '#EXT-X-SERVER-CONTROL':
+                self.server_control = parse_m3u8_attributes(value)
+            elif tag == '#EXT-X-SKIP':
+                self.skipped_segments = int_or_none(
+                    parse_m3u8_attributes(value).get('SKIPPED-SEGMENTS'), default=0)
+            elif header:
+                continue
+            elif tag == '#EXT-X-BYTERANGE':
+                byte_range = parse_byte_range(value)
+            elif tag == '#EXT-X-KEY':
+                self.keys.append(parse_m3u8_attributes(value))
+                self._key_starts.append(len(uris))
+            elif tag == '#EXT-X-MAP':
+                attributes = parse_m3u8_attributes(value)
+                if attributes.get('BYTERANGE'):
+                    byte_ranges[len(uris)] = parse_byte_range(attributes['BYTERANGE'])
+                self._init_indices.append(len(uris))
+                append_uri(attributes.get('URI'))
+                append_duration(_NO_DURATION)
+            elif tag == '#EXT-X-DISCONTINUITY':
+                self._discontinuity_starts.append(len(uris))
+            elif tag == '#EXT-X-ENDLIST':
+                self.endlist = True
+            elif tag == '#EXT-X-STREAM-INF':
+                stream_inf = parse_m3u8_attributes(value)
+            elif tag == '#EXT-X-MEDIA':
+                self.media.append(parse_m3u8_attributes(value))
+            elif is_ad != (_is_ad_start(line) or (is_ad and not _is_ad_end(line))):
+                is_ad = not is_ad
+                self._ad_toggles.append(len(uris))
+
+    @staticmethod
+    def is_media_playlist(doc):
+        """Whether the m3u8 document is a media playlist rather than a master playlist"""
+        # As of RFC 8216 §4.3.3.1, EXT-X-TARGETDURATION is REQUIRED in every media playlist
+        # and MUST NOT appear in a master playlist
+        return '#EXT-X-TARGETDURATION' in doc
+
+    @property
+    def segment_count(self):
+        """The number of media segments, without the initialization sections"""
+        return len(self._uris) - len(self._init_indices)
+
+    @property
+    def discontinuity_count(self):
+        return self._discontinuity_base + len(self._discontinuity_starts)
+
+    @property
+    def next_sequence(self):
+        """The media sequence number of the segment that will follow the last one"""
+        return self._first_sequence + self.segment_count
+
+    def __len__(self):
+        return len(self._uris)
+
+    def __getitem__(self, index):
+        uri = self._uris[index]
+        if index < 0:
+            index += len(self._uris)
+        inits = bisect.bisect_left(self._init_indices, index)
+        duration = self._durations[index]
+        return Segment(
+            uri, index in self._init_indices[inits:inits + 1], self._first_sequence + index - inits,
+            self._discontinuity_base + bisect.bisect_right(self._discontinuity_starts, index),
+            None if duration != duration else duration, self.keys[bisect.bisect_right(self._key_starts, index)],
+            self._byte_ranges.get(index), (bisect.bisect_right(self._ad_toggles, index) % 2 == 1) != self._ad_base)
+
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+
+    @property
+    def duration(self):
+        """The sum of the durations of the segments"""
+        return sum(duration for duration in self._durations if duration == duration)
+
+    @functools.cached_property
+    def _url_prefix(self):
+        if not isinstance(self.url, str) or not re.match(r'^(?:https?:)?//', self.url):
+            return None
+        return urllib.parse.urljoin(self.url, 'x')[:-1]
+
+    def resolve_url(self, uri):
+        """Resolve a URI of the playlist, as utils.urljoin does"""
+        prefix = self._url_prefix
+        if (prefix and isinstance(uri, str) and _SIMPLE_PATH_RE.fullmatch(uri)
+                and '/.' not in uri and '//' not in uri):
+            return prefix + uri
+        return urljoin(self.url, uri)
@@ -1,4 +1,5 @@
 # flake8: noqa: F401
+import functools
 import warnings
 
 from .common import (
@@ -15,23 +16,31 @@
 from . import _urllib
 from ..utils import bug_reports_message
 
-try:
-    from . import _requests
-except ImportError:
-    pass
-except Exception as e:
-    warnings.warn(f'Failed to import "requests" request handler: {e}' + bug_reports_message())
 
-try:
-    from . import _websockets
-except ImportError:
-    pass
-except Exception as e:
-    warnings.warn(f'Failed to import "websockets" request handler: {e}' + bug_reports_message())
+@functools.cache
+def _load_request_handlers():
+    """
+    Import the request handlers that use optional dependencies.
+    This is deferred until the first RequestDirector is built,
+    since importing their dependencies is slow and not every run makes requests
+    """
+    try:
+        from . import _requests
+    except ImportError:
+        pass
+    except Exception as e:
+        warnings.warn(f'Failed to import "requests" request handler: {e}' + bug_reports_message())
 
-try:
-    from . import _curlcffi
-except ImportError:
-    pass
-except Exception as e:
-    warnings.warn(f'Failed to import "curl_cffi" request handler: {e}' + bug_reports_message())
+    try:
+        from . import _websockets
+    except ImportError:
+        pass
+    except Exception as e:
+        warnings.warn(f'Failed to import "websockets" request handler: {e}' + bug_reports_message())
+
+    try:
+        from . import _curlcffi
+    except ImportError:
+        pass
+    except Exception as e:
+        warnings.warn(f'Failed to import "curl_cffi" request handler: {e}' + bug_reports_message())
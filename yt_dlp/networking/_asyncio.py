@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import http.client
+import io
+import ssl
+import types
+import urllib.parse
+import urllib.request
+
+from ._helper import _SessionCachingSSLObject
+from .common import Response
+from .exceptions import (
+    CertificateVerifyError,
+    HTTPError,
+    IncompleteRead,
+    RequestError,
+    TransportError,
+)
+from ..utils.networking import HTTPHeaderDict, normalize_url
+
+
+class AsyncHTTPClient:
+    """
+    A minimal HTTP/1.1 client for asyncio
+
+    It exists so that the fragment downloaders can keep many requests in flight
+    from a single event loop, and only supports what that needs: http(s) GET
+    requests without proxies, with keep-alive and redirects.
+
+    @param cookiejar: Cookiejar to read the Cookie header from, and to store cookies in.
+    @param timeout: Timeout for connecting and for each read, in seconds.
+    @param source_address: Client-side IP address to bind to.
+    @param ssl_context: SSLContext for https URLs. A context from a TLSSessionCache
+                        resumes TLS sessions and counts the handshakes in its stats.
+    @param max_idle_per_host: Number of idle connections to keep for each host.
+    """
+
+    MAX_REDIRECTS = 10
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, *, cookiejar=None, timeout=20, source_address=None,
+                 ssl_context=None, max_idle_per_host=10):
+        self.cookiejar = cookiejar
+        self.timeout = timeout
+        self.source_address = source_address
+        self.ssl_context = ssl_context
+        self.max_idle_per_host = max_idle_per_host
+        self._idle = collections.defaultdict(list)
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        while self._idle[key]:
+            reader, writer = self._idle[key].pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        try:
+            return await asyncio.wait_for(asyncio.open_connection(
+                host, port, limit=2 ** 20,
+                ssl=self.ssl_context if scheme == 'https' else None,
+                server_hostname=host if scheme == 'https' else None,
+                local_addr=(self.source_address, 0) if self.source_address else None,
+            ), self.timeout)
+        except ssl.SSLCertVerificationError as e:
+            raise CertificateVerifyError(cause=e) from e
+        except (OSError, asyncio.TimeoutError) as e:
+            raise TransportError(cause=e) from e
+
+    def _release(self, key, reader, writer, reusable):
+        ssl_object = writer.get_extra_info('ssl_object')
+        if isinstance(ssl_object, _SessionCachingSSLObject):
+            # In TLS 1.3, the session ticket arrives after the handshake
+            ssl_object.context.session_cache.update_session(ssl_object)
+        if reusable and len(self._idle[key]) < self.max_idle_per_host:
+            self._idle[key].append((reader, writer))
+        else:
+            writer.close()
+
+    async def _read(self, coro):
+        try:
+            return await asyncio.wait_for(coro, self.timeout)
+        except asyncio.TimeoutError as e:
+            raise TransportError(cause=TimeoutError('Read timed out')) from e
+
+    async def _read_body(self, reader, headers, progress):
+        if 'chunked' in headers.get('Transfer-Encoding', '').lower():
+            body = bytearray()
+            while True:
+                size = int((await self._read(reader.readline())).split(b';')[0].strip() or b'0', 16)
+                if not size:
+                    # Discard trailers
+                    while (await self._read(reader.readline())) not in (b'\r\n', b'\n', b''):
+                        pass
+                    return bytes(body), True
+                body += await self._read(reader.readexactly(size))
+                await self._read(reader.readexactly(2))
+                progress(len(body), None)
+
+        length = headers.get('Content-Length')
+        length = int(length) if length and length.isdecimal() else None
+        body = bytearray()
+        while length is None or len(body) < length:
+            chunk = await self._read(reader.read(
+                self.CHUNK_SIZE if length is None else min(self.CHUNK_SIZE, length - len(body))))
+            if not chunk:
+                if length is not None:
+                    raise asyncio.IncompleteReadError(bytes(body), length)
+                break
+            body += chunk
+            progress(len(body), length)
+        return bytes(body), length is not None
+
+    async def _request_once(self, url, headers, progress):
+        parsed = urllib.parse.urlparse(url)
+        scheme = parsed.scheme.lower()
+        key = (scheme, parsed.hostname, parsed.port or (443 if scheme == 'https' else 80))
+        selector = urllib.parse.urlunparse(('', '', parsed.path or '/', parsed.params, parsed.query, ''))
+
+        headers = HTTPHeaderDict(headers)
+        headers['Host'] = parsed.netloc.rpartition('@')[2]
+        headers['Connection'] = 'keep-alive'
+        # Fragments are media; skip content decoding altogether
+        headers['Accept-Encoding'] = 'identity'
+        if self.cookiejar is not None and 'Cookie' not in headers:
+            cookie_header = self.cookiejar.get_cookie_header(url)
+            if cookie_header:
+                headers['Cookie'] = cookie_header
+
+        # The request is written out as is, so check what http.client would
+        if http.client._contains_disallowed_url_pchar_re.search(selector):
+            raise RequestError(f'URL can\'t contain control characters: {selector!r}')
+        for name, value in headers.items():
+            if not http.client._is_legal_header_name(name.encode('latin-1', 'replace')):
+                raise RequestError(f'Invalid header name {name!r}')
+            if http.client._is_illegal_header_value(str(value).encode('latin-1', 'replace')):
+                raise RequestError(f'Invalid header value {value!r}')
+
+        request = ''.join([f'GET {selector} HTTP/1.1\r\n', *(f'{k}: {v}\r\n' for k, v in headers.items()), '\r\n'])
+        reader, writer = await self._connect(key)
+        reusable = False
+        try:
+            writer.write(request.encode('latin-1'))
+            await self._read(writer.drain())
+            status_line, _, raw_headers = (await self._read(reader.readuntil(b'\r\n\r\n'))).partition(b'\r\n')
+            version, status, reason = [*status_line.decode('latin-1').split(None, 2), ''][:3]
+            if not version.startswith('HTTP/'):
+                raise TransportError(f'Invalid status line: {status_line!r}')
+            status = int(status)
+            response_headers = http.client.parse_headers(io.BytesIO(raw_headers))
+            if self.cookiejar is not None:
+                self.cookiejar.extract_cookies(
+                    types.SimpleNamespace(info=lambda: response_headers), urllib.request.Request(url))
+            if status in (204, 304) or 100 <= status < 200:
+                body, reusable = b'', True
+            else:
+                body, reusable = await self._read_body(reader, response_headers, progress)
+            reusable = reusable and version != 'HTTP/1.0' and (
+                response_headers.get('Connection', '').lower() != 'close')
+            return status, reason.strip(), response_headers, body
+        except asyncio.IncompleteReadError as e:
+            raise IncompleteRead(partial=len(e.partial), expected=e.expected, cause=e) from e
+        except ssl.SSLError as e:
+            raise TransportError(cause=e) from e
+        except (OSError, asyncio.LimitOverrunError, ValueError) as e:
+            raise TransportError(cause=e) from e
+        finally:
+            self._release(key, reader, writer, reusable)
+
+    async def get(self, url, headers=None, progress=lambda downloaded, total: None):
+        """
+        Fetch a URL, following redirects
+        @returns (final url, headers, body)
+        @raises HTTPError for non-2xx responses, or another RequestError
+        """
+        url = normalize_url(url)
+        for _ in range(self.MAX_REDIRECTS + 1):
+            status, reason, response_headers, body = await self._request_once(url, headers, progress)
+            location = response_headers.get('Location')
+            if status in (301, 302, 303, 307, 308) and location:
+                new_url = normalize_url(urllib.parse.urljoin(url, location.encode('latin-1').decode()))
+                # As in the request handlers, the Cookie header is made anew from the cookiejar
+                # and credentials are not sent to another host
+                remove_headers = {'Cookie'}
+                if urllib.parse.urlparse(new_url).hostname != urllib.parse.urlparse(url).hostname:
+                    remove_headers.add('Authorization')
+                headers = {k: v for k, v in HTTPHeaderDict(headers).items() if k not in remove_headers}
+                url = new_url
+                continue
+            if not 200 <= status < 300:
+                raise HTTPError(Response(io.BytesIO(body), url, response_headers, status, reason))
+            return url, response_headers, body
+        raise HTTPError(Response(io.BytesIO(body), url, response_headers, status, reason), redirect_loop=True)
+
+    def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
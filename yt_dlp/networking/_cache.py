@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+
+from .common import Response
+from .exceptions import HTTPError
+from ..utils import int_or_none
+
+
+class _PrefixedReader(io.RawIOBase):
+    """Reads the bytes already taken from a response, then the rest of it"""
+
+    def __init__(self, prefix, fp):
+        self._prefix, self._fp = io.BytesIO(prefix), fp
+
+    def readable(self):
+        return True
+
+    def read(self, amt=None):
+        if amt is None or amt < 0:
+            return self._prefix.read() + self._fp.read()
+        return self._prefix.read(amt) or self._fp.read(amt)
+
+    def close(self):
+        self._fp.close()
+        super().close()
+
+
+class HTTPCache:
+    """
+    On-disk cache of the responses to the requests that have an `http_cache` extension
+
+    The extension is a dict with the `ttl`: for how many seconds a stored response is
+    used without contacting the server. After that, responses to GET requests with an
+    ETag or a Last-Modified header are revalidated with a conditional request, and the
+    stored body is used if the server responds with 304 Not Modified. Responses that
+    can be neither reused nor revalidated are not stored.
+
+    The least recently used responses are removed to keep the cache under `max_size` bytes.
+    """
+
+    CACHEABLE_METHODS = ('GET', 'POST')
+    CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since', 'If-Match', 'If-Unmodified-Since', 'If-Range', 'Range')
+    DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+
+    def __init__(self, path, max_size=None, cookiejar=None):
+        self.path = path
+        self.max_size = max_size or self.DEFAULT_MAX_SIZE
+        self.cookiejar = cookiejar
+        self._lock = threading.Lock()
+        self._index = None  # {key: [size, last used]}
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
+
+    def cacheable(self, request):
+        return (
+            request.extensions.get('http_cache') is not None
+            and request.method in self.CACHEABLE_METHODS
+            and isinstance(request.data, (bytes, type(None)))
+            and not any(header in request.headers for header in self.CONDITIONAL_HEADERS))
+
+    def _key(self, request):
+        cookiejar = request.extensions.get('cookiejar') or self.cookiejar
+        return hashlib.sha256(json.dumps([
+            request.method, request.url, sorted(request.headers.items()),
+            request.data and hashlib.sha256(request.data).hexdigest(),
+            cookiejar.get_cookie_header(request.url) if cookiejar is not None else None,
+        ]).encode()).hexdigest()
+
+    def _filename(self, key, ext):
+        return os.path.join(self.path, f'{key}.{ext}')
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+        self._index = {}
+        with contextlib.suppress(FileNotFoundError):
+            for entry in os.scandir(self.path):
+                key, ext = os.path.splitext(entry.name)
+                if ext == '.data':
+                    stat = entry.stat()
+                    self._index[key] = [stat.st_size, stat.st_mtime]
+        return self._index
+
+    def _remove(self, key):
+        self._load_index().pop(key, None)
+        for ext in ('json', 'data'):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._filename(key, ext))
+
+    def _load(self, key):
+        with contextlib.suppress(OSError, ValueError), open(self._filename(key, 'json'), encoding='utf-8') as f:
+            return json.load(f)
+        return None
+
+    @staticmethod
+    def _write(filename, data):
+        part = f'{filename}.part'
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(part)
+        # The responses can hold private data, so only the user may read them
+        fd = os.open(part, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o600)
+        with open(fd, 'wb') as f:
+            f.write(data)
+        os.replace(part, filename)
+
+    def _store(self, key, entry, body=None):
+        with self._lock:
+            index = self._load_index()
+            try:
+                os.makedirs(self.path, exist_ok=True)
+                if body is not None:
+                    self._write(self._filename(key, 'data'), body)
+                    index[key] = [len(body), time.time()]
+                self._write(self._filename(key, 'json'), json.dumps(entry).encode())
+            except OSError:
+                self._remove(key)
+                return
+            total = sum(size for size, _ in index.values())
+            for old_key, (size, _) in sorted(index.items(), key=lambda x: x[1][1]):
+                if total <= self.max_size:
+                    break
+                self._remove(old_key)
+                total -= size
+
+    def _response(self, key, entry):
+        try:
+            with open(self._filename(key, 'data'), 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            now = time.time()
+            self._load_index()[key] = [len(body), now]
+            with contextlib.suppress(OSError):
+                os.utime(self._filename(key, 'data'), (now, now))
+        return Response(
+            fp=io.BytesIO(body), url=entry['url'], status=entry['status'],
+            headers={**entry['headers'], 'Content-Length': str(len(body))})
+
+    @staticmethod
+    def _validators(request, headers):
+        """The headers that make a conditional request for the stored response"""
+        if request.method != 'GET':
+            return {}
+        headers = {name.lower(): value for name, value in headers.items()}
+        return {
+            header: headers[name] for header, name in (
+                ('If-None-Match', 'etag'), ('If-Modified-Since', 'last-modified'))
+            if headers.get(name)}
+
+    def _storable(self, request, response):
+        if response.status != 200 or response.get_header('Set-Cookie'):
+            return False
+        if not request.extensions['http_cache'].get('ttl') and not self._validators(request, response.headers):
+            return False
+        cache_control = (response.get_header('Cache-Control') or '').lower()
+        if 'no-store' in cache_control:
+            return False
+        length = int_or_none(response.get_header('Content-Length'))
+        return length is None or length <= self.max_size // 4
+
+    def send(self, request, send):
+        """Send the request with send(request), unless a stored response to it can be used"""
+        key = self._key(request)
+        entry = self._load(key)
+        validators = {}
+        if entry:
+            ttl = request.extensions['http_cache'].get('ttl') or 0
+            if time.time() - entry['time'] < ttl:
+                response = self._response(key, entry)
+                if response:
+                    with self._lock:
+                        self.hits += 1
+                    return response
+            validators = self._validators(request, entry['headers'])
+
+        try:
+            response = send(self._conditional_request(request, validators) if validators else request)
+        except HTTPError as e:
+            if e.status != 304 or not validators:
+                raise
+            e.close()
+            entry['time'] = time.time()
+            response = self._response(key, entry)
+            if response is None:
+                raise
+            self._store(key, entry)
+            with self._lock:
+                self.revalidated += 1
+            return response
+
+        with self._lock:
+            self.misses += 1
+        if not self._storable(request, response):
+            return response
+
+        limit = self.max_size // 4
+        body = bytearray()
+        while len(body) <= limit:
+            data = response.read(limit + 1 - len(body))
+            if not data:
+                break
+            body += data
+        body = bytes(body)
+        if len(body) > limit:
+            return Response(
+                fp=_PrefixedReader(body, response), url=response.url, headers=response.headers,
+                status=response.status, reason=response.reason, extensions=response.extensions)
+        response.close()
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in ('content-length', 'content-encoding', 'transfer-encoding')}
+        self._store(key, {'url': response.url, 'status': response.status, 'headers': headers, 'time': time.time()}, body)
+        return Response(
+            fp=io.BytesIO(body), url=response.url, headers={**headers, 'Content-Length': str(len(body))},
+            status=response.status, reason=response.reason, extensions=response.extensions)
+
+    @staticmethod
+    def _conditional_request(request, validators):
+        request = request.copy()
+        request.headers.update(validators)
+        return request
@@ -6,14 +6,17 @@
 import socket
 import ssl
 import sys
+import threading
+import time
 import typing
 import urllib.parse
 import urllib.request
+import weakref
 
 from .exceptions import RequestError, UnsupportedRequest
 from ..dependencies import certifi
 from ..socks import ProxyType, sockssocket
-from ..utils import format_field, traverse_obj
+from ..utils import format_field, traverse_obj, unified_timestamp
 
 if typing.TYPE_CHECKING:
     from collections.abc import Iterable
@@ -118,8 +121,9 @@ def make_ssl_context(
     client_certificate_password=None,
     legacy_support=False,
     use_certifi=True,
+    context_class=ssl.SSLContext,
 ):
-    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context = context_class(ssl.PROTOCOL_TLS_CLIENT)
     context.check_hostname = verify
     context.verify_mode = ssl.CERT_REQUIRED if verify else ssl.CERT_NONE
     # OpenSSL 1.1.1+ Python 3.8+ keylog file
@@ -168,6 +172,224 @@ def make_ssl_context(
     return context
 
 
+class _SessionCachingSSLSocket(ssl.SSLSocket):
+    _handshake_done = False
+
+    def do_handshake(self, *args, **kwargs):
+        start = time.perf_counter()
+        super().do_handshake(*args, **kwargs)
+        self._handshake_done = True
+        self.context.session_cache.add_handshake(self, time.perf_counter() - start)
+
+    def _real_close(self):
+        # The session can no longer be read once the socket is closed
+        if self._handshake_done:
+            self.context.session_cache.update_session(self)
+        super()._real_close()
+
+
+class _SessionCachingSSLObject(ssl.SSLObject):
+    # Used by asyncio, which calls do_handshake until it stops raising SSLWantReadError
+    _handshake_start = None
+
+    def do_handshake(self):
+        if self._handshake_start is None:
+            self._handshake_start = time.perf_counter()
+        super().do_handshake()
+        self.context.session_cache.add_handshake(self, time.perf_counter() - self._handshake_start)
+
+
+class _SessionCachingSSLContext(ssl.SSLContext):
+    sslsocket_class = _SessionCachingSSLSocket
+    sslobject_class = _SessionCachingSSLObject
+    session_cache = None
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        if session is None and server_hostname and not kwargs.get('server_side'):
+            session = self.session_cache.get_session(self, server_hostname)
+        return super().wrap_socket(sock, *args, server_hostname=server_hostname, session=session, **kwargs)
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        if session is None and server_hostname and not server_side:
+            session = self.session_cache.get_session(self, server_hostname)
+        return super().wrap_bio(
+            incoming, outgoing, server_side=server_side, server_hostname=server_hostname, session=session)
+
+
+class TLSSessionCache:
+    """
+    Shares SSL contexts, and the TLS sessions negotiated with them, between request handlers
+    and the asyncio fragment engine
+
+    Connections to a host that was already connected to offer the last session seen
+    for it, so that the server can resume it with an abbreviated handshake
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contexts = {}
+        self._sessions = {}
+        self.handshakes = 0
+        self.resumed_handshakes = 0
+        self.handshake_time = 0.0
+
+    def make_ssl_context(self, **kwargs):
+        key = tuple(sorted(kwargs.items()))
+        with self._lock:
+            context = self._contexts.get(key)
+            if context is None:
+                context = self._contexts[key] = make_ssl_context(
+                    **kwargs, context_class=_SessionCachingSSLContext)
+                context.session_cache = self
+            return context
+
+    def get_session(self, context, hostname):
+        with self._lock:
+            sock_ref, session = self._sessions.get((context, hostname), (None, None))
+        sock = sock_ref and sock_ref()
+        if sock is not None:
+            # In TLS 1.3, the session ticket arrives after the handshake
+            session = sock.session or session
+        if session is None or session.time + session.timeout < time.time():
+            return None
+        return session
+
+    def update_session(self, sock):
+        if not sock.server_hostname:
+            return
+        session = sock.session
+        if session is None:
+            return
+        with self._lock:
+            self._sessions[(sock.context, sock.server_hostname)] = (weakref.ref(sock), session)
+
+    def add_handshake(self, sock, elapsed):
+        with self._lock:
+            self.handshakes += 1
+            self.resumed_handshakes += bool(sock.session_reused)
+            self.handshake_time += elapsed
+        self.update_session(sock)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'handshakes': self.handshakes,
+                'resumed_handshakes': self.resumed_handshakes,
+                'handshake_time': self.handshake_time,
+            }
+
+
+class _TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate, self.burst = rate, burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0
+        self.failures = 0
+
+    def is_idle(self, now):
+        """Whether the bucket is back to the state of a new one"""
+        return not self.failures and self.blocked_until <= now and (
+            not self.rate or self.tokens + (now - self.updated) * self.rate >= self.burst)
+
+    def reserve(self, now):
+        """Take a token and return how long to wait before using it"""
+        delay = max(self.blocked_until - now, 0)
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens < 0:
+                delay = max(delay, -self.tokens / self.rate)
+        return delay
+
+
+class RequestScheduler:
+    """
+    Spaces out the requests that have a `rate_limit` extension
+
+    The extension is a dict with a `key` (usually the extractor key), the `rate`
+    in requests per second and the `burst` of requests allowed at once.
+    Requests are rate limited by that key and the host of their URL, with a token bucket.
+    Responses with status 429 or 503 block further requests to the same key and host,
+    for as long as the Retry-After header asks, or else for an exponentially increasing time.
+    """
+
+    BACKOFF_STATUSES = (429, 503)
+    MAX_BACKOFF = 60
+    # When there are more buckets than this, the idle ones, or else the least recently used one, are dropped
+    MAX_BUCKETS = 256
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    @staticmethod
+    def _bucket_key(request):
+        options = request.extensions.get('rate_limit')
+        if not options:
+            return None, None
+        return (options.get('key'), urllib.parse.urlparse(request.url).hostname), options
+
+    def _get_bucket(self, key, options):
+        rate, burst = options.get('rate') or None, max(options.get('burst') or 1, 1)
+        # Moved to the end, so that the buckets are kept in the order they were last used
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_BUCKETS:
+                self._evict(time.monotonic())
+            bucket = _TokenBucket(rate, burst)
+        elif (bucket.rate, bucket.burst) != (rate, burst):
+            bucket.rate, bucket.burst = rate, burst
+            bucket.tokens = min(bucket.tokens, burst)
+        self._buckets[key] = bucket
+        return bucket
+
+    def _evict(self, now):
+        idle = [key for key, bucket in self._buckets.items() if bucket.is_idle(now)]
+        for key in idle or [next(iter(self._buckets))]:
+            del self._buckets[key]
+
+    def reserve(self, request):
+        """Return how long to wait before sending the request"""
+        key, options = self._bucket_key(request)
+        if key is None:
+            return 0
+        with self._lock:
+            return self._get_bucket(key, options).reserve(time.monotonic())
+
+    @staticmethod
+    def _parse_retry_after(value):
+        if not value:
+            return None
+        with contextlib.suppress(ValueError):
+            return max(float(value), 0)
+        timestamp = unified_timestamp(value)
+        return None if timestamp is None else max(timestamp - time.time(), 0)
+
+    def report(self, request, status, headers=None):
+        """
+        Record the status of the response to a request
+
+        Returns how long the requests to the same key and host are blocked for, if any
+        """
+        key, options = self._bucket_key(request)
+        if key is None:
+            return None
+        with self._lock:
+            bucket = self._get_bucket(key, options)
+            if status not in self.BACKOFF_STATUSES:
+                bucket.failures = 0
+                return None
+            bucket.failures += 1
+            delay = self._parse_retry_after(headers and headers.get('Retry-After'))
+            if delay is None:
+                delay = 2 ** (bucket.failures - 1)
+            delay = min(delay, self.MAX_BACKOFF)
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + delay)
+            return delay
+
+
 class InstanceStoreMixin:
     def __init__(self, **kwargs):
         self.__instances = []
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import collections
 import functools
 import http.client
 import io
+import select
 import ssl
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -51,6 +55,74 @@
     CONTENT_DECODE_ERRORS.append(brotli.error)
 
 
+class _PooledHTTPResponse(http.client.HTTPResponse):
+    _release = None
+
+    def _close_conn(self):
+        super()._close_conn()
+        release, self._release = self._release, None
+        if release:
+            release(not self.will_close)
+
+    def close(self):
+        if self.fp:
+            # The rest of the body is still on the wire; the connection cannot be reused
+            self.will_close = True
+        super().close()
+
+
+class HTTPConnectionPool:
+    """Keeps idle keep-alive connections for reuse, at most max_per_host for each key"""
+
+    # Errors that mean the server dropped an idle connection before we sent the request
+    STALE_CONNECTION_ERRORS = (BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+    # The server may have acted on a request even if the connection was dropped before the response,
+    # so only requests that are safe to repeat are retried (RFC 9110 §9.2.2)
+    IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'TRACE', 'PUT', 'DELETE'))
+
+    def __init__(self, max_per_host=10, idle_timeout=30):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle = collections.defaultdict(collections.deque)
+        self._closed = False
+
+    @staticmethod
+    def _is_dropped(conn):
+        if conn.sock is None:
+            return True
+        try:
+            # An idle connection should have nothing to read; EOF or stray data means it is unusable
+            return bool(select.select([conn.sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    def get(self, key):
+        while True:
+            with self._lock:
+                if not self._idle.get(key):
+                    return None
+                conn, last_used = self._idle[key].pop()
+            if time.monotonic() - last_used <= self.idle_timeout and not self._is_dropped(conn):
+                return conn
+            conn.close()
+
+    def put(self, key, conn, reusable=True):
+        with self._lock:
+            if reusable and not self._closed and len(self._idle[key]) < self.max_per_host:
+                self._idle[key].append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle = [conn for conns in self._idle.values() for conn, _ in conns]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+
 def _create_http_connection(http_class, source_address, *args, **kwargs):
     hc = http_class(*args, **kwargs)
 
@@ -78,10 +150,11 @@ class HTTPHandler(urllib.request.AbstractHTTPHandler):
     public domain.
     """
 
-    def __init__(self, context=None, source_address=None, *args, **kwargs):
+    def __init__(self, context=None, source_address=None, *args, pool=None, **kwargs):
         super().__init__(*args, **kwargs)
         self._source_address = source_address
         self._context = context
+        self._pool = pool
 
     @staticmethod
     def _make_conn_class(base, req):
@@ -89,19 +162,85 @@ def _make_conn_class(base, req):
         socks_proxy = req.headers.pop('Ytdl-socks-proxy', None)
         if socks_proxy:
             conn_class = make_socks_conn_class(conn_class, socks_proxy)
-        return conn_class
+        return conn_class, socks_proxy
 
     def http_open(self, req):
-        conn_class = self._make_conn_class(http.client.HTTPConnection, req)
-        return self.do_open(functools.partial(
-            _create_http_connection, conn_class, self._source_address), req)
+        conn_class, socks_proxy = self._make_conn_class(http.client.HTTPConnection, req)
+        return self._open(functools.partial(
+            _create_http_connection, conn_class, self._source_address), req, socks_proxy)
 
     def https_open(self, req):
-        conn_class = self._make_conn_class(http.client.HTTPSConnection, req)
-        return self.do_open(
+        conn_class, socks_proxy = self._make_conn_class(http.client.HTTPSConnection, req)
+        return self._open(
             functools.partial(
                 _create_http_connection, conn_class, self._source_address),
-            req, context=self._context)
+            req, socks_proxy, context=self._context)
+
+    def _open(self, http_class, req, socks_proxy, **http_conn_args):
+        if self._pool is None:
+            return self.do_open(http_class, req, **http_conn_args)
+        # Proxy, source address and SSL context are fixed for the lifetime of this handler
+        return self._do_open_pooled(
+            http_class, req, (req.type, req.host, req._tunnel_host, socks_proxy), **http_conn_args)
+
+    def _do_open_pooled(self, http_class, req, pool_key, **http_conn_args):
+        """Like do_open, but leaves the connection open and returns it to the pool once the response is read"""
+        host = req.host
+        if not host:
+            raise urllib.error.URLError('no host given')
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers['Connection'] = 'keep-alive'
+        headers = {name.title(): val for name, val in headers.items()}
+
+        tunnel_headers = {}
+        if req._tunnel_host and 'Proxy-Authorization' in headers:
+            # Proxy-Authorization should not be sent to origin server
+            tunnel_headers['Proxy-Authorization'] = headers.pop('Proxy-Authorization')
+
+        while True:
+            h = self._pool.get(pool_key)
+            reused = h is not None
+            if reused:
+                h.timeout = req.timeout
+                h.sock.settimeout(req.timeout)
+            else:
+                h = http_class(host, timeout=req.timeout, **http_conn_args)
+                h.set_debuglevel(self._debuglevel)
+                h.response_class = _PooledHTTPResponse
+                if req._tunnel_host:
+                    h.set_tunnel(req._tunnel_host, headers=tunnel_headers)
+
+            try:
+                try:
+                    h.request(req.get_method(), req.selector, req.data, headers,
+                              encode_chunked=req.has_header('Transfer-encoding'))
+                except OSError as err:
+                    raise urllib.error.URLError(err)
+                r = h.getresponse()
+            except Exception as e:
+                h.close()
+                # The server may close an idle connection just as we reuse it; retry those on a new one
+                if (reused and not hasattr(req.data, 'read')
+                        and req.get_method() in HTTPConnectionPool.IDEMPOTENT_METHODS
+                        and isinstance(getattr(e, 'reason', e), HTTPConnectionPool.STALE_CONNECTION_ERRORS)):
+                    continue
+                raise
+            break
+
+        if r.will_close:
+            h.close()
+        else:
+            r._release = functools.partial(self._pool.put, pool_key, h)
+
+        r.url = req.get_full_url()
+        r.msg = r.reason
+        return r
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
 
     @staticmethod
     def deflate(data):
@@ -338,11 +477,21 @@ class UrllibRH(RequestHandler, InstanceStoreMixin):
     _SUPPORTED_FEATURES = (Features.NO_PROXY, Features.ALL_PROXY)
     RH_NAME = 'urllib'
 
-    def __init__(self, *, enable_file_urls: bool = False, **kwargs):
+    def __init__(
+        self, *,
+        enable_file_urls: bool = False,
+        keep_alive: bool = True,
+        max_connections_per_host: int = 10,
+        keep_alive_timeout: float = 30,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self.enable_file_urls = enable_file_urls
         if self.enable_file_urls:
             self._SUPPORTED_URL_SCHEMES = (*self._SUPPORTED_URL_SCHEMES, 'file')
+        self.keep_alive = keep_alive
+        self.max_connections_per_host = max_connections_per_host
+        self.keep_alive_timeout = keep_alive_timeout
 
     def _check_extensions(self, extensions):
         super()._check_extensions(extensions)
@@ -357,7 +506,9 @@ def _create_instance(self, proxies, cookiejar, legacy_ssl_support=None):
             HTTPHandler(
                 debuglevel=int(bool(self.verbose)),
                 context=self._make_sslcontext(legacy_ssl_support=legacy_ssl_support),
-                source_address=self.source_address),
+                source_address=self.source_address,
+                pool=HTTPConnectionPool(
+                    self.max_connections_per_host, self.keep_alive_timeout) if self.keep_alive else None),
             HTTPCookieProcessor(cookiejar),
             DataHandler(),
             UnknownHandler(),
@@ -379,6 +530,13 @@ def _create_instance(self, proxies, cookiejar, legacy_ssl_support=None):
         opener.addheaders = []
         return opener
 
+    def _close_instance(self, opener):
+        for handler in opener.handlers:
+            handler.close()
+
+    def close(self):
+        self._clear_instances()
+
     def _send(self, request):
         headers = self._merge_headers(request.headers)
         add_accept_encoding_header(headers, SUPPORTED_ENCODINGS)
@@ -5,6 +5,7 @@
 import enum
 import functools
 import io
+import time
 import typing
 import urllib.parse
 import urllib.request
@@ -13,8 +14,9 @@
 from email.message import Message
 from http import HTTPStatus
 
-from ._helper import make_ssl_context, wrap_request_errors
+from ._helper import RequestScheduler, TLSSessionCache, wrap_request_errors
 from .exceptions import (
+    HTTPError,
     NoSupportingHandlers,
     RequestError,
     TransportError,
@@ -57,6 +59,15 @@ class RequestDirector:
     can be registered into the `preferences` set. These are used to sort handlers
     in order of preference.
 
+    Handlers that are given `tls_session_cache` share SSL contexts and TLS sessions,
+    and the handshakes they do are counted in `tls_stats()`.
+
+    Requests with a `rate_limit` extension are spaced out, and backed off
+    on HTTP 429 and 503 errors, by the `scheduler` (see RequestScheduler).
+
+    If `http_cache` is set, the responses to requests with an `http_cache`
+    extension are stored and reused by it (see HTTPCache).
+
     @param logger: Logger instance.
     @param verbose: Print debug request information to stdout.
     """
@@ -66,6 +77,13 @@ def __init__(self, logger, verbose=False):
         self.preferences: set[Preference] = set()
         self.logger = logger  # TODO(Grub4k): default logger
         self.verbose = verbose
+        self.tls_session_cache = TLSSessionCache()
+        self.scheduler = RequestScheduler()
+        self.http_cache = None
+
+    def tls_stats(self):
+        """Number of TLS handshakes done, how many of them resumed a session, and their total duration"""
+        return self.tls_session_cache.stats()
 
     def close(self):
         for handler in self.handlers.values():
@@ -91,6 +109,13 @@ def _print_verbose(self, msg):
         if self.verbose:
             self.logger.stdout(f'director: {msg}')
 
+    def _report_status(self, request, status, headers):
+        delay = self.scheduler.report(request, status, headers)
+        if delay is not None:
+            self.logger.info(
+                f'[{request.extensions["rate_limit"].get("key") or "director"}] HTTP Error {status} from '
+                f'{urllib.parse.urlparse(request.url).hostname}; waiting {delay:.0f} seconds before the next request')
+
     def send(self, request: Request) -> Response:
         """
         Passes a request onto a suitable RequestHandler
@@ -100,6 +125,16 @@ def send(self, request: Request) -> Response:
 
         assert isinstance(request, Request)
 
+        if self.http_cache and self.http_cache.cacheable(request):
+            return self.http_cache.send(request, self._send)
+        return self._send(request)
+
+    def _send(self, request: Request) -> Response:
+        delay = self.scheduler.reserve(request)
+        if delay > 0:
+            self._print_verbose(f'Waiting {delay:.2f} seconds to respect the rate limit')
+            time.sleep(delay)
+
         unexpected_errors = []
         unsupported_errors = []
         for handler in self._get_handlers(request):
@@ -115,6 +150,9 @@ def send(self, request: Request) -> Response:
             self._print_verbose(f'Sending request via "{handler.RH_NAME}"')
             try:
                 response = handler.send(request)
+            except HTTPError as e:
+                self._report_status(request, e.status, e.response.headers)
+                raise
             except RequestError:
                 raise
             except Exception as e:
@@ -125,6 +163,7 @@ def send(self, request: Request) -> Response:
                 continue
 
             assert isinstance(response, Response)
+            self._report_status(request, response.status, response.headers)
             return response
 
         raise NoSupportingHandlers(unsupported_errors, unexpected_errors)
@@ -191,6 +230,7 @@ class RequestHandler(abc.ABC):
             dict with {client_certificate, client_certificate_key, client_certificate_password}
     @param verify: Verify SSL certificates
     @param legacy_ssl_support: Enable legacy SSL options such as legacy server connect and older cipher support.
+    @param tls_session_cache: TLSSessionCache to share SSL contexts and TLS sessions with other handlers.
 
     Some configuration options may be available for individual Requests too. In this case,
     either the Request configuration option takes precedence or they are merged.
@@ -206,6 +246,9 @@ class RequestHandler(abc.ABC):
     - `cookiejar`: Cookiejar to use for this request.
     - `timeout`: socket timeout to use for this request.
     - `legacy_ssl`: Enable legacy SSL options for this request. See legacy_ssl_support.
+    - `rate_limit`: Rate limit options for this request. These are applied by the RequestDirector,
+      so every RequestHandler accepts them. See RequestScheduler.
+    - `http_cache`: HTTP cache options for this request, applied by the RequestDirector. See HTTPCache.
     To enable these, add extensions.pop('<extension>', None) to _check_extensions
 
     Apart from the url protocol, proxies dict may contain the following keys:
@@ -232,6 +275,7 @@ def __init__(
         client_cert: dict[str, str | None] | None = None,
         verify: bool = True,
         legacy_ssl_support: bool = False,
+        tls_session_cache: TLSSessionCache | None = None,
         **_,
     ):
 
@@ -246,10 +290,11 @@ def __init__(
         self._client_cert = client_cert or {}
         self.verify = verify
         self.legacy_ssl_support = legacy_ssl_support
+        self._tls_session_cache = tls_session_cache or TLSSessionCache()
         super().__init__()
 
     def _make_sslcontext(self, legacy_ssl_support=None):
-        return make_ssl_context(
+        return self._tls_session_cache.make_ssl_context(
             verify=self.verify,
             legacy_support=legacy_ssl_support if legacy_ssl_support is not None else self.legacy_ssl_support,
             use_certifi=not self.prefer_system_certs,
@@ -317,6 +362,10 @@ def _check_extensions(self, extensions):
         assert isinstance(extensions.get('cookiejar'), (YoutubeDLCookieJar, NoneType))
         assert isinstance(extensions.get('timeout'), (float, int, NoneType))
         assert isinstance(extensions.get('legacy_ssl'), (bool, NoneType))
+        assert isinstance(extensions.get('rate_limit'), (dict, NoneType))
+        assert isinstance(extensions.get('http_cache'), (dict, NoneType))
+        extensions.pop('rate_limit', None)
+        extensions.pop('http_cache', None)
 
     def _validate(self, request):
         self._check_url_scheme(request)
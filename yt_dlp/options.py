@@ -442,6 +442,15 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--no-mark-watched',
         action='store_false', dest='mark_watched',
         help='Do not mark videos watched (default)')
+    general.add_option(
+        '--serve',
+        metavar='SOCKET', dest='serve', default=None,
+        help=(
+            'Keep running and process jobs read as JSON lines from a UNIX socket at this path, '
+            'or from stdin if "-" is used. The same YoutubeDL instance, with its connections and caches, '
+            'is used for every job. Each job has the "url" or "urls" to extract and optionally '
+            'the YoutubeDL "params" to change for the job and whether to "download". '
+            'The info of each URL is sent back as JSON lines (Experimental)'))
     general.add_option(
         '--no-colors', '--no-colours',
         action='store_const', dest='color', const={
@@ -680,11 +689,18 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
     selection.add_option(
         '--download-archive', metavar='FILE',
         dest='download_archive',
-        help='Download only videos not listed in the archive file. Record the IDs of all downloaded videos in it')
+        help=(
+            'Download only videos not listed in the archive file. Record the IDs of all downloaded videos in it. '
+            'The archive is stored as an SQLite database if FILE ends in .sqlite, .sqlite3 or .db, '
+            'unless it is an existing text archive'))
     selection.add_option(
         '--no-download-archive',
         dest='download_archive', action='store_const', const=None,
         help='Do not use archive file (default)')
+    selection.add_option(
+        '--import-download-archive', metavar='FILE',
+        dest='download_archive_import',
+        help='Add the IDs listed in the text archive FILE to the SQLite --download-archive before starting')
     selection.add_option(
         '--max-downloads',
         dest='max_downloads', metavar='NUMBER', type=int, default=None,
@@ -963,6 +979,20 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--no-keep-fragments',
         action='store_false', dest='keep_fragments',
         help='Delete downloaded fragments after downloading is finished (default)')
+    downloader.add_option(
+        '--fragment-memory-limit',
+        dest='fragment_memory_limit', metavar='SIZE', default=None,
+        help=(
+            'Keep downloaded fragments of a dash/hlsnative video in memory instead of writing them to temporary files, '
+            'using at most SIZE bytes, e.g. 50M (default is disabled). Fragments that do not fit are written to disk'))
+    downloader.add_option(
+        '--fragment-engine',
+        metavar='ENGINE', dest='fragment_engine', default='threads',
+        choices=('threads', 'asyncio'),
+        help=(
+            'How the fragments of a dash/hlsnative video are downloaded concurrently. One of "threads" (default) '
+            'or "asyncio", which keeps all the requests of -N in a single event loop and so scales to hundreds '
+            'of concurrent fragments. Fragments that need a proxy are still downloaded in threads'))
     downloader.add_option(
         '--buffer-size',
         dest='buffersize', metavar='SIZE', default='1024',
@@ -1005,6 +1035,18 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--no-lazy-playlist',
         action='store_false', dest='lazy_playlist',
         help='Process videos in the playlist only after the entire playlist is parsed (default)')
+    downloader.add_option(
+        '--concurrent-entries',
+        dest='concurrent_entries', metavar='N', default=1, type=int,
+        help=(
+            'Number of playlist entries to extract concurrently (default is %default). '
+            'Entries are still downloaded one at a time and in playlist order (Experimental)'))
+    downloader.add_option(
+        '--concurrent-urls',
+        dest='concurrent_urls', metavar='N', default=1, type=int,
+        help=(
+            'Number of URLs, given on the command line or with --batch-file, to extract concurrently '
+            '(default is %default). They are still downloaded one at a time and in order (Experimental)'))
     downloader.add_option(
         '--xattr-set-filesize',
         dest='xattr_set_filesize', action='store_true',
@@ -1220,6 +1262,16 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         help=(
             'Quiet, but print JSON information for each url or infojson passed. Simulate unless --no-simulate is used. '
             'If the URL refers to a playlist, the whole playlist information is dumped in a single line'))
+    verbosity.add_option(
+        '--stream-json',
+        metavar='FORMAT', dest='stream_json', default=None,
+        choices=('json', 'jsonl'),
+        help=(
+            'Like --dump-single-json, but print the entries of playlists as soon as they are processed '
+            'instead of holding them in memory. One of "json", which prints a single JSON object per URL '
+            'with the entries first, or "jsonl", which prints each entry on its own line, '
+            'followed by a line with the playlist without its entries. '
+            'Use with --lazy-playlist to keep the memory use flat'))
     verbosity.add_option(
         '--print-json',
         action='store_true', dest='print_json', default=False,
@@ -1288,6 +1340,16 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--print-traffic', '--dump-headers',
         dest='debug_printtraffic', action='store_true', default=False,
         help='Display sent and read HTTP traffic')
+    verbosity.add_option(
+        '--profile-startup',
+        action='store_true', dest='profile_startup', default=False,
+        help=(
+            'Print the time taken by each stage of the startup and by the slowest imports when the program exits. '
+            'Imports are only timed when this is given on the command line'))
+    verbosity.add_option(
+        '--profile-startup-json',
+        metavar='FILE', dest='profile_startup_json', default=None,
+        help='Write the startup profile to FILE as JSON instead. Implies --profile-startup')
     verbosity.add_option(
         '-C', '--call-home',
         dest='call_home', action='store_true', default=False,
@@ -1487,6 +1549,16 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--no-cookies-from-browser',
         action='store_const', const=None, dest='cookiesfrombrowser',
         help='Do not load cookies from browser (default)')
+    filesystem.add_option(
+        '--cache-browser-cookies',
+        action='store_true', dest='cache_browser_cookies', default=False,
+        help=(
+            'Store the cookies loaded with --cookies-from-browser in the cache directory, and reuse them '
+            'until the cookie database of the browser changes. The cached cookies are not encrypted'))
+    filesystem.add_option(
+        '--no-cache-browser-cookies',
+        action='store_false', dest='cache_browser_cookies',
+        help='Decrypt the cookies from the browser on every run (default)')
     filesystem.add_option(
         '--cache-dir', dest='cachedir', default=None, metavar='DIR',
         help=(
@@ -1499,6 +1571,21 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--rm-cache-dir',
         action='store_true', dest='rm_cachedir',
         help='Delete all filesystem cache files')
+    filesystem.add_option(
+        '--http-cache',
+        action='store_true', dest='http_cache', default=False,
+        help=(
+            'Store the responses to the requests made by the extractors in the cache directory, '
+            'and revalidate them with the server when they are requested again. '
+            'See "EXTRACTOR ARGUMENTS" for how long each extractor may reuse them without revalidating'))
+    filesystem.add_option(
+        '--no-http-cache',
+        action='store_false', dest='http_cache',
+        help='Do not cache HTTP responses (default)')
+    filesystem.add_option(
+        '--http-cache-size',
+        metavar='SIZE', dest='http_cache_size', default=None,
+        help='Maximum size of the HTTP cache, e.g. 50M (default is 100M)')
 
     thumbnail = optparse.OptionGroup(parser, 'Thumbnail Options')
     thumbnail.add_option(
@@ -12,6 +12,7 @@
 from pathlib import Path
 from zipfile import ZipFile
 
+from ._startup_profile import startup_phase
 from .compat import functools  # isort: split
 from .utils import (
     get_executable_path,
@@ -135,6 +136,7 @@ def load_module(module, module_name, suffix):
         and obj.__name__ in getattr(module, '__all__', [obj.__name__])))
 
 
+@startup_phase
 def load_plugins(name, suffix):
     classes = {}
 
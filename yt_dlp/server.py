@@ -0,0 +1,185 @@
+"""
+Server mode, enabled with --serve
+
+A single YoutubeDL instance is kept alive and runs jobs read as JSON lines, so that
+the extractors, the download archive, the cache, the connection pools and the
+player code cached by the extractors are reused from one job to the next.
+
+Each job is a JSON object on one line:
+    url/urls    The URL or list of URLs to process
+    id          Any value; it is copied into every response to the job
+    params      YoutubeDL parameters (see YoutubeDL.py) to override for this job only
+    download    Whether to download the videos too (default: false)
+
+The responses are JSON objects on one line each, with the "id" of the job and a "type":
+    info        "info" is the sanitized info dict of one of the URLs
+    error       "error" is why one of the URLs, or the whole job, failed
+    done        The job is finished; "retcode" is its exit code
+"""
+
+import contextlib
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import traceback
+
+from .utils import (
+    DownloadCancelled,
+    DownloadError,
+    error_to_str,
+    expand_path,
+    variadic,
+)
+
+# These parameters are only read when the YoutubeDL instance is created
+INIT_ONLY_PARAMS = frozenset((
+    'cachedir', 'client_certificate', 'client_certificate_key', 'client_certificate_password',
+    'color', 'compat_opts', 'consoletitle', 'cookiefile', 'cookiesfrombrowser', 'download_archive',
+    'enable_file_urls', 'http_headers', 'impersonate', 'legacyserverconnect', 'logger', 'logtostderr',
+    'nocheckcertificate', 'postprocessor_hooks', 'postprocessors', 'post_hooks', 'progress_hooks',
+    'proxy', 'socket_timeout', 'source_address'))
+
+
+class JobServer:
+    """Runs the jobs sent to --serve with a YoutubeDL instance that is reused for every job"""
+
+    def __init__(self, ydl):
+        self.ydl = ydl
+
+    @staticmethod
+    def _parse_job(job):
+        if isinstance(job, json.JSONDecodeError):
+            raise ValueError(f'The job is not valid JSON: {job}')
+        elif not isinstance(job, dict):
+            raise ValueError('The job must be a JSON object')
+        urls = variadic(job.get('urls', job.get('url')) or [])
+        if not urls or not all(isinstance(url, str) for url in urls):
+            raise ValueError('The job has no URLs')
+        params = job.get('params') or {}
+        if not isinstance(params, dict):
+            raise ValueError('"params" must be a JSON object')
+        init_only = sorted(INIT_ONLY_PARAMS.intersection(params))
+        if init_only:
+            raise ValueError(f'These parameters cannot be changed for a single job: {", ".join(init_only)}')
+        return urls, params
+
+    @contextlib.contextmanager
+    def _override_params(self, params):
+        ydl = self.ydl
+        saved = {key: ydl.params[key] for key in params if key in ydl.params}
+        saved_format_selector = ydl.format_selector
+        try:
+            ydl.params.update(params)
+            if 'outtmpl' in params:
+                ydl._parse_outtmpl()
+            if 'format' in params:
+                ydl.format_selector = (
+                    ydl.params['format'] if ydl.params['format'] in (None, '-') or callable(ydl.params['format'])
+                    else ydl.build_format_selector(ydl.params['format']))
+            yield
+        finally:
+            for key in params:
+                ydl.params.pop(key, None)
+            ydl.params.update(saved)
+            ydl.format_selector = saved_format_selector
+
+    def _run_urls(self, job_id, urls, download):
+        ydl = self.ydl
+        for url in urls:
+            try:
+                info = ydl.extract_info(
+                    url, download=download, force_generic_extractor=ydl.params.get('force_generic_extractor', False))
+            except DownloadCancelled as e:
+                ydl._download_retcode = 101
+                yield {'id': job_id, 'type': 'error', 'url': url, 'error': error_to_str(e)}
+                break
+            except Exception as e:
+                # A failed job must not stop the server
+                if not isinstance(e, DownloadError):
+                    ydl.write_debug(traceback.format_exc())
+                ydl._download_retcode = 1
+                yield {'id': job_id, 'type': 'error', 'url': url, 'error': error_to_str(e)}
+                continue
+            if info is None:
+                # The error has already been reported, and ignored because of --ignore-errors
+                yield {'id': job_id, 'type': 'error', 'url': url, 'error': None}
+            else:
+                info = ydl.sanitize_info(info, ydl.params.get('clean_infojson', True))
+                yield {'id': job_id, 'type': 'info', 'url': url, 'info': info}
+
+    def run_job(self, job):
+        """Run a job, yielding the responses"""
+        job_id = job.get('id') if isinstance(job, dict) else None
+        # --max-downloads and %(autonumber)s count the downloads of each job separately
+        self.ydl._download_retcode = self.ydl._num_downloads = 0
+        with contextlib.ExitStack() as stack:
+            try:
+                urls, params = self._parse_job(job)
+                stack.enter_context(self._override_params(params))
+            except Exception as e:
+                yield {'id': job_id, 'type': 'error', 'error': f'Invalid job: {e}'}
+                yield {'id': job_id, 'type': 'done', 'retcode': 2}
+                return
+            yield from self._run_urls(job_id, urls, bool(job.get('download')))
+        yield {'id': job_id, 'type': 'done', 'retcode': self.ydl._download_retcode}
+
+    def handle(self, infile, write):
+        """Run the jobs read from a text stream, passing each response line to write()"""
+        for line in infile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                job = e
+            for response in self.run_job(job):
+                write(json.dumps(response) + '\n')
+
+    def serve_stdio(self):
+        def write(line):
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+        self.handle(sys.stdin, write)
+
+    def serve_unix_socket(self, path):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise OSError('UNIX sockets are not supported on this platform; use "--serve -" instead')
+        job_server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                def write(line):
+                    self.wfile.write(line.encode())
+                    self.wfile.flush()
+
+                with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+                    job_server.handle((line.decode('utf-8', 'replace') for line in self.rfile), write)
+
+        try:
+            if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                raise FileExistsError(f'{path} exists and is not a socket')
+            # Left behind by a server that did not exit cleanly
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        # Connections are handled one at a time since the YoutubeDL instance is not thread-safe
+        with socketserver.UnixStreamServer(path, Handler) as server:
+            self.ydl.to_screen(f'[server] Listening for jobs on {path}')
+            try:
+                server.serve_forever()
+            finally:
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+
+    def serve(self, address):
+        """Serve jobs from stdin if address is "-", or else from the UNIX socket at that path"""
+        if address == '-':
+            self.serve_stdio()
+        else:
+            self.serve_unix_socket(expand_path(address))
+        return 0
@@ -186,8 +186,13 @@ def preferredencoding():
     return pref
 
 
-def write_json_file(obj, fn):
-    """ Encode obj as JSON and write it to fn, atomically if possible """
+def write_json_file(obj, fn, mode=None):
+    """
+    Encode obj as JSON and write it to fn, atomically if possible
+
+    The file gets the permissions in mode, or else those of a new file under the umask.
+    It has them before it is moved to fn.
+    """
 
     tf = tempfile.NamedTemporaryFile(
         prefix=f'{os.path.basename(fn)}.', dir=os.path.dirname(fn),
@@ -202,9 +207,11 @@ def write_json_file(obj, fn):
             with contextlib.suppress(OSError):
                 os.unlink(fn)
         with contextlib.suppress(OSError):
-            mask = os.umask(0)
-            os.umask(mask)
-            os.chmod(tf.name, 0o666 & ~mask)
+            if mode is None:
+                mask = os.umask(0)
+                os.umask(mask)
+                mode = 0o666 & ~mask
+            os.chmod(tf.name, mode)
         os.rename(tf.name, fn)
     except Exception:
         with contextlib.suppress(OSError):
@@ -2357,12 +2364,82 @@ def _getslice(self, start, end):
             yield from page_results
 
 
+class _FlatEntryLayout:
+    __slots__ = ('keys', 'shared', 'positions', 'last_values')
+
+    def __init__(self, keys, shared):
+        self.keys, self.shared = keys, shared
+        self.positions = {key: i for i, key in enumerate(key for key in keys if key not in shared)}
+        self.last_values = ()
+
+
+class FlatEntry(collections.abc.Mapping):
+    """
+    Read-only, memory-compact form of a flat playlist entry (an unprocessed url result)
+
+    The entries of a playlist with the same keys share a layout, which holds the values
+    of SHARED_KEYS and the None and boolean values; each entry only stores a tuple of
+    its other values. Strings that are equal to those of the previous entry with the
+    same layout (e.g. the channel of the playlist) are shared too.
+    Use dict(entry) to get a modifiable copy
+    """
+    __slots__ = ('_layout', '_values')
+
+    SHARED_KEYS = ('_type', 'ie_key', 'extractor', 'extractor_key', '__x_forwarded_for_ip')
+
+    def __init__(self, layout, values):
+        self._layout, self._values = layout, values
+
+    @classmethod
+    def compact(cls, entry, layouts):
+        """Return the compact form of the entry, sharing the layouts (a dict) with the other entries"""
+        if type(entry) is not dict or entry.get('_type') not in ('url', 'url_transparent'):
+            return entry
+        keys = tuple(entry)
+        shared = tuple(
+            (key, value) for key, value in entry.items()
+            if value is None or value is True or value is False or key in cls.SHARED_KEYS)
+        try:
+            layout = layouts.get((keys, shared))
+        except TypeError:  # Unhashable shared value
+            return entry
+        if layout is None:
+            layout = layouts[(keys, shared)] = _FlatEntryLayout(keys, dict(shared))
+        values = tuple(entry[key] for key in layout.positions)
+        if layout.last_values:
+            values = tuple(
+                last if type(value) is str and value == last else value
+                for value, last in zip(values, layout.last_values))
+        layout.last_values = values
+        return cls(layout, values)
+
+    def __getitem__(self, key):
+        position = self._layout.positions.get(key)
+        if position is not None:
+            return self._values[position]
+        return self._layout.shared[key]
+
+    def __iter__(self):
+        return iter(self._layout.keys)
+
+    def __len__(self):
+        return len(self._layout.keys)
+
+    def __repr__(self):
+        # Same as dict, since the entries can be printed with output templates
+        return repr(dict(self))
+
+    def copy(self):
+        return dict(self)
+
+
 class PlaylistEntries:
     MissingEntry = object()
     is_exhausted = False
 
     def __init__(self, ydl, info_dict):
         self.ydl = ydl
+        self._layouts = {}
 
         # _entries must be assigned now since infodict can change during iteration
         entries = info_dict.get('entries')
@@ -2377,11 +2454,22 @@ def __init__(self, ydl, info_dict):
             assert self.is_exhausted
             self._entries = [self.MissingEntry] * max(requested_entries or [0])
             for i, entry in zip(requested_entries, entries):
-                self._entries[i - 1] = entry
+                self._entries[i - 1] = self.compact(entry)
+        elif isinstance(entries, list) and self.is_compact:
+            self._entries = list(map(self.compact, entries))
         elif isinstance(entries, (list, PagedList, LazyList)):
             self._entries = entries
         else:
-            self._entries = LazyList(entries)
+            self._entries = LazyList(map(self.compact, entries) if self.is_compact else entries)
+
+    @functools.cached_property
+    def is_compact(self):
+        """Whether the flat entries are kept as FlatEntry; see the compact_flat_entries parameter"""
+        params = self.ydl.params
+        return bool(params.get('compact_flat_entries')) and params.get('extract_flat') in ('in_playlist', True)
+
+    def compact(self, entry):
+        return FlatEntry.compact(entry, self._layouts) if self.is_compact else entry
 
     PLAYLIST_ITEMS_RE = re.compile(r'''(?x)
         (?P<start>[+-]?\d+)?
@@ -5206,8 +5294,8 @@ def __iter__(self):
                 self.error_callback(self.error, self.attempt, self.retries)
 
     @staticmethod
-    def report_retry(e, count, retries, *, sleep_func, info, warn, error=None, suffix=None):
-        """Utility function for reporting retries"""
+    def report_retry(e, count, retries, *, sleep_func, info, warn, error=None, suffix=None, sleep=time.sleep):
+        """Utility function for reporting retries. The delay is waited for by calling `sleep`"""
         if count > retries:
             if error:
                 return error(f'{e}. Giving up after {count - 1} retries') if count > 1 else error(str(e))
@@ -5222,7 +5310,7 @@ def report_retry(e, count, retries, *, sleep_func, info, warn, error=None, suffi
         delay = float_or_none(sleep_func(n=count - 1)) if callable(sleep_func) else sleep_func
         if delay:
             info(f'Sleeping {delay:.2f} seconds ...')
-            time.sleep(delay)
+            sleep(delay)
 
 
 def make_archive_id(ie, video_id):
@@ -43,20 +43,23 @@ def total(self, value: int | None):
 
             self._total = value
 
-    def thread_reset(self):
-        current_thread = threading.get_ident()
+    def thread_reset(self, key=None):
+        """Start a new download in the current thread, or in the download identified by key"""
+        if key is None:
+            key = threading.get_ident()
         with self._lock:
-            self._thread_sizes[current_thread] = 0
+            self._thread_sizes[key] = 0
 
-    def update(self, size: int | None):
+    def update(self, size: int | None, key=None):
         if not size:
             return
 
-        current_thread = threading.get_ident()
+        if key is None:
+            key = threading.get_ident()
 
         with self._lock:
-            last_size = self._thread_sizes.get(current_thread, 0)
-            self._thread_sizes[current_thread] = size
+            last_size = self._thread_sizes.get(key, 0)
+            self._thread_sizes[key] = size
             self._update(size - last_size)
 
     def _update(self, size: int):